@@ -16,6 +16,8 @@ from app.db.base import Base
 from app.models.user import User  # noqa
 from app.models.event import Event  # noqa
 from app.models.task import Task  # noqa
+from app.models.task_count import EventTaskCount  # noqa
+from app.models.event_exception import EventException  # noqa
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
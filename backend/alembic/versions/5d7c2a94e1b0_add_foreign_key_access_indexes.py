@@ -0,0 +1,32 @@
+"""add foreign key access indexes
+
+Revision ID: 5d7c2a94e1b0
+Revises: b3e1f0c7a912
+Create Date: 2026-10-17 11:03:41.207915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d7c2a94e1b0'
+down_revision: Union[str, None] = 'b3e1f0c7a912'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_events_organizer_id_start_time', 'events', ['organizer_id', 'start_time'], unique=False)
+    op.create_index('ix_tasks_event_id_status', 'tasks', ['event_id', 'status'], unique=False)
+    op.create_index('ix_tasks_assigned_to_id_status_due_date', 'tasks', ['assigned_to_id', 'status', 'due_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_assigned_to_id_status_due_date', table_name='tasks')
+    op.drop_index('ix_tasks_event_id_status', table_name='tasks')
+    op.drop_index('ix_events_organizer_id_start_time', table_name='events')
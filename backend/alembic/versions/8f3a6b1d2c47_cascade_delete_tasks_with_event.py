@@ -0,0 +1,30 @@
+"""cascade delete tasks with event
+
+Revision ID: 8f3a6b1d2c47
+Revises: 5d7c2a94e1b0
+Create Date: 2026-10-17 12:21:09.734102
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f3a6b1d2c47'
+down_revision: Union[str, None] = '5d7c2a94e1b0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_constraint('tasks_event_id_fkey', 'tasks', type_='foreignkey')
+    op.create_foreign_key('tasks_event_id_fkey', 'tasks', 'events', ['event_id'], ['id'], ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('tasks_event_id_fkey', 'tasks', type_='foreignkey')
+    op.create_foreign_key('tasks_event_id_fkey', 'tasks', 'events', ['event_id'], ['id'])
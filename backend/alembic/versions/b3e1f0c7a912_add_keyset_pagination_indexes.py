@@ -0,0 +1,32 @@
+"""add keyset pagination indexes
+
+Revision ID: b3e1f0c7a912
+Revises: 4aa72ead9077
+Create Date: 2026-10-17 10:12:04.518233
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e1f0c7a912'
+down_revision: Union[str, None] = '4aa72ead9077'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_events_start_time_id', 'events', ['start_time', 'id'], unique=False)
+    op.create_index('ix_tasks_event_id_created_at_id', 'tasks', ['event_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_tasks_assigned_to_id_created_at_id', 'tasks', ['assigned_to_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_assigned_to_id_created_at_id', table_name='tasks')
+    op.drop_index('ix_tasks_event_id_created_at_id', table_name='tasks')
+    op.drop_index('ix_events_start_time_id', table_name='events')
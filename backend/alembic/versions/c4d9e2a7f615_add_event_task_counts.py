@@ -0,0 +1,40 @@
+"""add event task counts
+
+Revision ID: c4d9e2a7f615
+Revises: 8f3a6b1d2c47
+Create Date: 2026-10-17 15:02:44.318265
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d9e2a7f615'
+down_revision: Union[str, None] = '8f3a6b1d2c47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('event_task_counts',
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('status', postgresql.ENUM('TODO', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED', name='taskstatus', create_type=False), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('event_id', 'status')
+    )
+    # Backfill from the existing tasks
+    op.execute(
+        "INSERT INTO event_task_counts (event_id, status, count) "
+        "SELECT event_id, status, count(*) FROM tasks GROUP BY event_id, status"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('event_task_counts')
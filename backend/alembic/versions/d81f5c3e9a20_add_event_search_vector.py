@@ -0,0 +1,42 @@
+"""add event search vector
+
+Revision ID: d81f5c3e9a20
+Revises: c4d9e2a7f615
+Create Date: 2026-10-17 16:10:27.905113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81f5c3e9a20'
+down_revision: Union[str, None] = 'c4d9e2a7f615'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Generated column: PostgreSQL fills it for existing rows and keeps it current
+    op.add_column('events', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(location, '')), 'C')",
+            persisted=True
+        ),
+        nullable=True
+    ))
+    op.create_index('ix_events_search_vector', 'events', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_events_search_vector', table_name='events', postgresql_using='gin')
+    op.drop_column('events', 'search_vector')
@@ -0,0 +1,34 @@
+"""add event time range index
+
+Revision ID: e5a7c1f03b68
+Revises: d81f5c3e9a20
+Create Date: 2026-10-17 17:04:51.220937
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7c1f03b68'
+down_revision: Union[str, None] = 'd81f5c3e9a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_events_time_range',
+        'events',
+        [sa.text('tstzrange(start_time, end_time)')],
+        unique=False,
+        postgresql_using='gist'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_events_time_range', table_name='events', postgresql_using='gist')
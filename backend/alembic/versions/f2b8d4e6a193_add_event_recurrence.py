@@ -0,0 +1,53 @@
+"""add event recurrence
+
+Revision ID: f2b8d4e6a193
+Revises: e5a7c1f03b68
+Create Date: 2026-10-17 18:21:37.504118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8d4e6a193'
+down_revision: Union[str, None] = 'e5a7c1f03b68'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('events', sa.Column('recurrence_rule', sa.String(length=500), nullable=True))
+    op.add_column('events', sa.Column('recurrence_end', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(
+        'ix_events_series_start_time',
+        'events',
+        ['start_time'],
+        unique=False,
+        postgresql_where=sa.text('recurrence_rule IS NOT NULL')
+    )
+    op.create_table('event_exceptions',
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('occurrence_start', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('cancelled', sa.Boolean(), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('location', sa.String(length=300), nullable=True),
+    sa.Column('start_time', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('end_time', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('status', postgresql.ENUM('PLANNING', 'SCHEDULED', 'ONGOING', 'COMPLETED', 'CANCELLED', name='eventstatus', create_type=False), nullable=True),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('event_id', 'occurrence_start')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('event_exceptions')
+    op.drop_index('ix_events_series_start_time', table_name='events', postgresql_where=sa.text('recurrence_rule IS NOT NULL'))
+    op.drop_column('events', 'recurrence_end')
+    op.drop_column('events', 'recurrence_rule')
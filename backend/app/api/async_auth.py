@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_async_db, get_current_user_async
+from app.schemas.user import UserCreate, UserResponse
+from app.schemas.token import Token, LoginRequest
+from app.services.auth_service import async_auth_service
+from app.models.user import User
+
+
+router = APIRouter()
+
+
+@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+async def register(user_in: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    """Register new user"""
+    return await async_auth_service.register_user(db, user_in)
+
+
+@router.post("/login", response_model=Token)
+async def login(login_data: LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    """Login and get access token"""
+    return await async_auth_service.login_user(db, login_data.email, login_data.password)
+
+
+@router.get("/me", response_model=UserResponse)
+async def get_me(current_user: User = Depends(get_current_user_async)):
+    """Get current user info"""
+    return current_user
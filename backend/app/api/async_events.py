@@ -0,0 +1,146 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import Optional
+
+from app.api.deps import get_async_db, get_current_auth_user_async
+from app.core.serialization import JSON_MEDIA_TYPE
+from app.api.conditional import (
+    collection_etag,
+    entity_etag,
+    is_not_modified,
+    not_modified,
+    set_validators,
+)
+from app.models.event import EventStatus
+from app.schemas.event import EventCreate, EventOccurrence, EventSearchHit, EventUpdate, EventResponse
+from app.schemas.pagination import Page
+from app.schemas.task import TaskAutoAssign, TaskAutoAssignResponse
+from app.services.event_service import async_event_service, event_service
+from app.services.task_service import async_task_service
+from app.schemas.user import UserAuth
+
+
+# GET /export stays on the sync router (served in async mode too, see main):
+# the stream outlives the request, so it reads on its own session through a
+# server-side cursor (yield_per), which the sync driver provides. POST /import
+# too: it COPYs into its staging table through the psycopg2 raw connection.
+router = APIRouter()
+
+
+@router.post("/", response_model=EventResponse, status_code=status.HTTP_201_CREATED)
+async def create_event(
+    event_in: EventCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserAuth = Depends(get_current_auth_user_async)
+):
+    """Create a new event"""
+    return await async_event_service.create_event(db, event_in, current_user.id)
+
+
+@router.get("/", response_model=Page[EventOccurrence])
+async def get_events(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    organizer_id: Optional[int] = None,
+    event_status: Optional[EventStatus] = Query(None, alias="status"),
+    overlap_from: Optional[datetime] = Query(None, alias="from"),
+    overlap_to: Optional[datetime] = Query(None, alias="to"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get a page of events (optionally filtered, overlapping [from, to)) ordered
+    by start time. With both from and to, recurring events are listed as
+    their occurrences in that window.
+    """
+    filters = {
+        "organizer_id": organizer_id,
+        "status": event_status,
+        "overlap_from": overlap_from,
+        "overlap_to": overlap_to,
+    }
+    # Weak ETag from count + latest change: a 304 never loads the rows
+    count, last_changed = await async_event_service.get_events_version(db)
+    etag = collection_etag("events", count, last_changed, cursor, limit, *filters.values())
+    if is_not_modified(request, etag, last_changed):
+        return not_modified(etag, last_changed)
+    
+    # Pre-serialized page, returned as is (no response_model revalidation)
+    body = await async_event_service.get_all_events_json(db, cursor=cursor, limit=limit, **filters)
+    response = Response(body, media_type=JSON_MEDIA_TYPE)
+    set_validators(response, etag, last_changed)
+    return response
+
+
+@router.get("/search", response_model=Page[EventSearchHit])
+async def search_events(
+    q: str = Query(..., min_length=1, max_length=200),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Search events by title, description and location, best match first"""
+    body = await async_event_service.search_events_json(db, q, cursor=cursor, limit=limit)
+    return Response(body, media_type=JSON_MEDIA_TYPE)
+
+
+@router.get("/{event_id}", response_model=EventResponse)
+async def get_event(
+    event_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get event by ID"""
+    event = await async_event_service.get_event(db, event_id)
+    last_modified = event.updated_at or event.created_at
+    etag = entity_etag("event", event.id, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+    
+    set_validators(response, etag, last_modified)
+    return event
+
+
+@router.put("/{event_id}", response_model=EventResponse)
+async def update_event(
+    event_id: int,
+    event_in: EventUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserAuth = Depends(get_current_auth_user_async)
+):
+    """Update an event"""
+    return await async_event_service.update_event(db, event_id, event_in, current_user.id)
+
+
+@router.post("/{event_id}/auto-assign", response_model=TaskAutoAssignResponse)
+async def auto_assign_tasks(
+    event_id: int,
+    assign_in: TaskAutoAssign,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserAuth = Depends(get_current_auth_user_async)
+):
+    """Assign the event's open, unassigned tasks across the given users, balancing their workload"""
+    return await async_task_service.auto_assign_tasks(db, event_id, assign_in, current_user.id)
+
+@router.delete("/{event_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_event(
+    event_id: int,
+    background_tasks: BackgroundTasks,
+    chunked: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserAuth = Depends(get_current_auth_user_async)
+):
+    """
+    Delete an event.
+    
+    With ?chunked=true the tasks are deleted in small transactions in the
+    background (EventService.purge_event, on its own sync session) and 202
+    is returned right away.
+    """
+    if chunked:
+        await async_event_service.get_event_for_delete(db, event_id, current_user.id)
+        background_tasks.add_task(event_service.purge_event, event_id)
+        return Response(status_code=status.HTTP_202_ACCEPTED)
+    await async_event_service.delete_event(db, event_id, current_user.id)
@@ -0,0 +1,132 @@
+from fastapi import APIRouter, Body, Depends, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+
+from app.api.deps import get_async_db, get_current_auth_user_async
+from app.api.conditional import (
+    collection_etag,
+    entity_etag,
+    is_not_modified,
+    not_modified,
+    set_validators,
+)
+from app.schemas.task import TaskCreate, TaskUpdate, TaskBulkUpdate, TaskBulkUpdateResponse, TaskResponse
+from app.schemas.pagination import Page
+from app.services.task_service import async_task_service
+from app.schemas.user import UserAuth
+
+
+# GET /export stays on the sync router (served in async mode too, see main):
+# the stream outlives the request, so it reads on its own session through a
+# server-side cursor (yield_per), which the sync driver provides. POST /import
+# too: it COPYs into its staging table through the psycopg2 raw connection.
+router = APIRouter()
+
+
+@router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
+async def create_task(
+    task_in: TaskCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserAuth = Depends(get_current_auth_user_async)
+):
+    """Create a new task"""
+    return await async_task_service.create_task(db, task_in, current_user.id)
+
+
+@router.post("/bulk", response_model=List[TaskResponse], status_code=status.HTTP_201_CREATED)
+async def create_tasks(
+    tasks_in: List[TaskCreate] = Body(..., min_length=1, max_length=1000),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserAuth = Depends(get_current_auth_user_async)
+):
+    """Create many tasks in one transaction"""
+    return await async_task_service.create_tasks(db, tasks_in, current_user.id)
+
+
+@router.patch("/bulk", response_model=TaskBulkUpdateResponse)
+async def update_tasks(
+    bulk_in: TaskBulkUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserAuth = Depends(get_current_auth_user_async)
+):
+    """Apply one partial update to many tasks"""
+    return await async_task_service.update_tasks(db, bulk_in, current_user.id)
+
+
+@router.get("/event/{event_id}", response_model=Page[TaskResponse])
+async def get_event_tasks(
+    event_id: int,
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get a page of tasks for an event"""
+    count, last_changed = await async_task_service.get_event_tasks_version(db, event_id)
+    etag = collection_etag("event-tasks", count, last_changed, event_id, cursor, limit)
+    if is_not_modified(request, etag, last_changed):
+        return not_modified(etag, last_changed)
+    
+    items, next_cursor = await async_task_service.get_event_tasks(db, event_id, cursor=cursor, limit=limit)
+    set_validators(response, etag, last_changed)
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.get("/my-tasks", response_model=Page[TaskResponse])
+async def get_my_tasks(
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserAuth = Depends(get_current_auth_user_async)
+):
+    """Get a page of tasks assigned to current user"""
+    count, last_changed = await async_task_service.get_user_tasks_version(db, current_user.id)
+    etag = collection_etag("user-tasks", count, last_changed, current_user.id, cursor, limit)
+    if is_not_modified(request, etag, last_changed):
+        return not_modified(etag, last_changed)
+    
+    items, next_cursor = await async_task_service.get_user_tasks(db, current_user.id, cursor=cursor, limit=limit)
+    set_validators(response, etag, last_changed)
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.get("/{task_id}", response_model=TaskResponse)
+async def get_task(
+    task_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get task by ID"""
+    task = await async_task_service.get_task(db, task_id)
+    last_modified = task.updated_at or task.created_at
+    etag = entity_etag("task", task.id, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+    
+    set_validators(response, etag, last_modified)
+    return task
+
+
+@router.put("/{task_id}", response_model=TaskResponse)
+async def update_task(
+    task_id: int,
+    task_in: TaskUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserAuth = Depends(get_current_auth_user_async)
+):
+    """Update a task"""
+    return await async_task_service.update_task(db, task_id, task_in, current_user.id)
+
+
+@router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_task(
+    task_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserAuth = Depends(get_current_auth_user_async)
+):
+    """Delete a task"""
+    await async_task_service.delete_task(db, task_id, current_user.id)
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, get_current_auth_user
+from app.schemas.availability import AvailabilityRequest, AvailabilityResponse
+from app.services.availability_service import availability_service
+
+
+router = APIRouter()
+
+
+@router.post("", response_model=AvailabilityResponse, dependencies=[Depends(get_current_auth_user)])
+def find_availability(
+    request: AvailabilityRequest,
+    db: Session = Depends(get_db)
+):
+    """Find slots of at least min_duration_minutes in [start, end) when all the users are free"""
+    return availability_service.find_free_slots(db, request)
@@ -0,0 +1,62 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+
+def _digest(*parts: Any) -> str:
+    """Short stable digest of the given parts"""
+    return hashlib.md5("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+
+def _utc(value: datetime) -> datetime:
+    """Treat naive timestamps as UTC"""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def entity_etag(kind: str, id: int, version: datetime) -> str:
+    """Strong ETag of a single row, from its id and last change time"""
+    return f'"{_digest(kind, id, _utc(version).isoformat())}"'
+
+
+def collection_etag(kind: str, count: int, last_changed: Optional[datetime], *params: Any) -> str:
+    """Weak ETag of a listing, from its row count, latest change time and query params"""
+    last = _utc(last_changed).isoformat() if last_changed else ""
+    return f'W/"{_digest(kind, count, last, *params)}"'
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """Evaluate If-None-Match (or, without it, If-Modified-Since) for a GET"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # Weak comparison, as required for GET
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag.removeprefix("W/") in tags
+    
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return _utc(last_modified).replace(microsecond=0) <= _utc(since)
+    return False
+
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime] = None) -> None:
+    """Attach ETag/Last-Modified and require revalidation on reuse"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    if last_modified:
+        response.headers["Last-Modified"] = format_datetime(_utc(last_modified), usegmt=True)
+
+
+def not_modified(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    """Empty 304 response carrying the validators"""
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_validators(response, etag, last_modified)
+    return response
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, get_current_user
+from app.core.serialization import JSON_MEDIA_TYPE
+from app.models.user import User
+from app.schemas.dashboard import DashboardResponse
+from app.services.dashboard_service import dashboard_service
+
+
+router = APIRouter()
+
+
+@router.get("", response_model=DashboardResponse)
+def get_dashboard(
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get the current user, their events with task counts and their assigned tasks"""
+    body = dashboard_service.get_dashboard_json(db, current_user, limit=limit)
+    return Response(body, media_type=JSON_MEDIA_TYPE)
@@ -1,11 +1,15 @@
 from typing import Generator
 from fastapi import Depends, HTTPException, status, Header
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.session import SessionLocal
+from app.db.session import SessionLocal, AsyncSessionLocal, get_async_db
 from app.core.security import decode_token
-from app.crud.user import crud_user
+from app.core.cache import user_cache
+from app.crud.user import crud_user, async_crud_user
 from app.models.user import User
+from app.schemas.user import UserAuth
 
 
 def get_db() -> Generator:
@@ -17,11 +21,8 @@ def get_db() -> Generator:
         db.close()
 
 
-def get_current_user(
-    db: Session = Depends(get_db),
-    authorization: str = Header(None)
-) -> User:
-    """Get current authenticated user"""
+def _get_user_id(authorization: str) -> int:
+    """Extract user_id from the Bearer authorization header"""
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -32,15 +33,17 @@ def get_current_user(
     token = authorization.replace("Bearer ", "")
     
     try:
-        user_id = decode_token(token)
+        return decode_token(token)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=str(e),
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    user = crud_user.get(db, id=user_id)
+
+
+def _check_user(user: User) -> User:
+    """Ensure the user exists and is active"""
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -54,3 +57,77 @@ def get_current_user(
         )
     
     return user
+
+
+def _auth_state(user: User) -> UserAuth:
+    """Cache and return the auth-relevant state of a user"""
+    state = UserAuth(
+        id=user.id,
+        is_active=bool(user.is_active),
+        is_superuser=bool(user.is_superuser)
+    )
+    user_cache.set(user.id, state)
+    return state
+
+
+def _check_auth_state(state: UserAuth) -> UserAuth:
+    """Ensure the cached user is active"""
+    if not state.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Inactive user"
+        )
+    return state
+
+
+def get_current_user(
+    db: Session = Depends(get_db),
+    authorization: str = Header(None)
+) -> User:
+    """Get current authenticated user"""
+    user_id = _get_user_id(authorization)
+    return _check_user(crud_user.get(db, id=user_id))
+
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db),
+    authorization: str = Header(None)
+) -> User:
+    """Get current authenticated user (async stack)"""
+    user_id = _get_user_id(authorization)
+    return _check_user(await async_crud_user.get(db, id=user_id))
+
+
+def _load_auth_state(user_id: int) -> UserAuth:
+    """Load and cache a user's auth state with a short-lived session of its own"""
+    db = SessionLocal()
+    try:
+        return _auth_state(_check_user(crud_user.get(db, id=user_id)))
+    finally:
+        db.close()
+
+
+async def get_current_auth_user(authorization: str = Header(None)) -> UserAuth:
+    """
+    Get auth state of the current user (id, is_active, is_superuser).
+    
+    Served from user_cache on the event loop: a hit needs no session and no
+    threadpool hop. A miss loads the user in the threadpool with its own
+    session, closed at once, so no pooled connection is held for the life
+    of long responses (streams) either.
+    """
+    user_id = _get_user_id(authorization)
+    state = user_cache.get(user_id)
+    if state is None:
+        state = await run_in_threadpool(_load_auth_state, user_id)
+    return _check_auth_state(state)
+
+
+async def get_current_auth_user_async(authorization: str = Header(None)) -> UserAuth:
+    """Get auth state of the current user (async stack); a session is opened only on a cache miss"""
+    user_id = _get_user_id(authorization)
+    state = user_cache.get(user_id)
+    if state is None:
+        async with AsyncSessionLocal() as db:
+            state = _auth_state(_check_user(await async_crud_user.get(db, id=user_id)))
+    return _check_auth_state(state)
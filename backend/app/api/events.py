@@ -1,11 +1,37 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from datetime import datetime
+from typing import Optional
 
-from app.api.deps import get_db, get_current_user
-from app.schemas.event import EventCreate, EventUpdate, EventResponse
+from app.api.deps import get_db, get_current_auth_user
+from app.api.uploads import spool_body
+from app.core.serialization import EXPORT_MEDIA_TYPES, JSON_MEDIA_TYPE, ExportFormat
+from app.api.conditional import (
+    collection_etag,
+    entity_etag,
+    is_not_modified,
+    not_modified,
+    set_validators,
+)
+from app.models.event import EventStatus
+from app.schemas.event import (
+    EventCreate,
+    EventExceptionResponse,
+    EventOccurrence,
+    EventResponse,
+    EventSearchHit,
+    EventUpdate,
+    OccurrenceUpdate,
+)
+from app.schemas.imports import ImportReport
+from app.schemas.pagination import Page
+from app.schemas.task import TaskAutoAssign, TaskAutoAssignResponse
 from app.services.event_service import event_service
-from app.models.user import User
+from app.services.import_service import UnreadableInputError, import_service
+from app.services.task_service import task_service
+from app.schemas.user import UserAuth
 
 
 router = APIRouter()
@@ -15,26 +41,117 @@ router = APIRouter()
 def create_event(
     event_in: EventCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserAuth = Depends(get_current_auth_user)
 ):
     """Create a new event"""
     return event_service.create_event(db, event_in, current_user.id)
 
 
-@router.get("/", response_model=List[EventResponse])
+@router.get("/", response_model=Page[EventOccurrence])
 def get_events(
-    skip: int = 0,
-    limit: int = 100,
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    organizer_id: Optional[int] = None,
+    event_status: Optional[EventStatus] = Query(None, alias="status"),
+    overlap_from: Optional[datetime] = Query(None, alias="from"),
+    overlap_to: Optional[datetime] = Query(None, alias="to"),
     db: Session = Depends(get_db)
 ):
-    """Get all events"""
-    return event_service.get_all_events(db, skip=skip, limit=limit)
+    """
+    Get a page of events (optionally filtered, overlapping [from, to)) ordered
+    by start time. With both from and to, recurring events are listed as
+    their occurrences in that window.
+    """
+    filters = {
+        "organizer_id": organizer_id,
+        "status": event_status,
+        "overlap_from": overlap_from,
+        "overlap_to": overlap_to,
+    }
+    # Weak ETag from count + latest change: a 304 never loads the rows
+    count, last_changed = event_service.get_events_version(db)
+    etag = collection_etag("events", count, last_changed, cursor, limit, *filters.values())
+    if is_not_modified(request, etag, last_changed):
+        return not_modified(etag, last_changed)
+    
+    # Pre-serialized page, returned as is (no response_model revalidation)
+    body = event_service.get_all_events_json(db, cursor=cursor, limit=limit, **filters)
+    response = Response(body, media_type=JSON_MEDIA_TYPE)
+    set_validators(response, etag, last_changed)
+    return response
+
+
+@router.post("/import", response_model=ImportReport)
+async def import_events(
+    request: Request,
+    fmt: ExportFormat = Query("ndjson", alias="format"),
+    db: Session = Depends(get_db),
+    current_user: UserAuth = Depends(get_current_auth_user)
+):
+    """Bulk import events from a CSV or NDJSON request body (same columns as export)"""
+    source = await spool_body(request)
+    try:
+        return await run_in_threadpool(import_service.import_events, db, source, fmt, current_user.id)
+    except UnreadableInputError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+    finally:
+        source.close()
+
+
+@router.get("/export", dependencies=[Depends(get_current_auth_user)])
+def export_events(
+    fmt: ExportFormat = Query("ndjson", alias="format"),
+    organizer_id: Optional[int] = None,
+    event_status: Optional[EventStatus] = Query(None, alias="status"),
+    start_from: Optional[datetime] = Query(None, alias="from"),
+    start_to: Optional[datetime] = Query(None, alias="to")
+):
+    """Stream all events (optionally filtered, start time in [from, to)) as NDJSON or CSV"""
+    return StreamingResponse(
+        event_service.export_events(
+            fmt,
+            organizer_id=organizer_id,
+            status=event_status,
+            start_from=start_from,
+            start_to=start_to
+        ),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="events.{fmt}"'}
+    )
+
+
+@router.get("/search", response_model=Page[EventSearchHit])
+def search_events(
+    q: str = Query(..., min_length=1, max_length=200),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Search events by title, description and location, best match first"""
+    body = event_service.search_events_json(db, q, cursor=cursor, limit=limit)
+    return Response(body, media_type=JSON_MEDIA_TYPE)
 
 
 @router.get("/{event_id}", response_model=EventResponse)
-def get_event(event_id: int, db: Session = Depends(get_db)):
+def get_event(
+    event_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db)
+):
     """Get event by ID"""
-    return event_service.get_event(db, event_id)
+    event = event_service.get_event(db, event_id)
+    last_modified = event.updated_at or event.created_at
+    etag = entity_etag("event", event.id, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+    
+    set_validators(response, etag, last_modified)
+    return event
 
 
 @router.put("/{event_id}", response_model=EventResponse)
@@ -42,17 +159,62 @@ def update_event(
     event_id: int,
     event_in: EventUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserAuth = Depends(get_current_auth_user)
 ):
     """Update an event"""
     return event_service.update_event(db, event_id, event_in, current_user.id)
 
 
+@router.put("/{event_id}/occurrences/{occurrence_start}", response_model=EventExceptionResponse)
+def override_occurrence(
+    event_id: int,
+    occurrence_start: datetime,
+    occurrence_in: OccurrenceUpdate,
+    db: Session = Depends(get_db),
+    current_user: UserAuth = Depends(get_current_auth_user)
+):
+    """Override one occurrence of a recurring event (by its original start)"""
+    return event_service.override_occurrence(db, event_id, occurrence_start, occurrence_in, current_user.id)
+
+
+@router.delete("/{event_id}/occurrences/{occurrence_start}", status_code=status.HTTP_204_NO_CONTENT)
+def cancel_occurrence(
+    event_id: int,
+    occurrence_start: datetime,
+    db: Session = Depends(get_db),
+    current_user: UserAuth = Depends(get_current_auth_user)
+):
+    """Cancel one occurrence of a recurring event (by its original start)"""
+    event_service.cancel_occurrence(db, event_id, occurrence_start, current_user.id)
+
+
+@router.post("/{event_id}/auto-assign", response_model=TaskAutoAssignResponse)
+def auto_assign_tasks(
+    event_id: int,
+    assign_in: TaskAutoAssign,
+    db: Session = Depends(get_db),
+    current_user: UserAuth = Depends(get_current_auth_user)
+):
+    """Assign the event's open, unassigned tasks across the given users, balancing their workload"""
+    return task_service.auto_assign_tasks(db, event_id, assign_in, current_user.id)
+
+
 @router.delete("/{event_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_event(
     event_id: int,
+    background_tasks: BackgroundTasks,
+    chunked: bool = False,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserAuth = Depends(get_current_auth_user)
 ):
-    """Delete an event"""
+    """
+    Delete an event.
+    
+    With ?chunked=true the tasks are deleted in small transactions in the
+    background and 202 is returned right away.
+    """
+    if chunked:
+        event_service.get_event_for_delete(db, event_id, current_user.id)
+        background_tasks.add_task(event_service.purge_event, event_id)
+        return Response(status_code=status.HTTP_202_ACCEPTED)
     event_service.delete_event(db, event_id, current_user.id)
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Response
+
+from app.core.metrics import metrics
+
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """All metrics in the Prometheus text format"""
+    body, media_type = metrics.render()
+    return Response(content=body, media_type=media_type)
@@ -0,0 +1,114 @@
+import asyncio
+from typing import AsyncIterator, Iterable
+
+import orjson
+from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import get_current_auth_user
+from app.core.broker import change_broker
+from app.core.config import settings
+from app.crud.event import crud_event
+from app.crud.task import crud_task
+from app.db.session import SessionLocal
+from app.schemas.user import UserAuth
+
+
+router = APIRouter()
+
+
+class Audience:
+    """
+    Which changes one subscriber receives.
+    
+    Every user can read all events, so all event changes are sent. Task
+    changes are sent when they concern the user: a task assigned to them
+    (before or after the change) or in an event they organize. Changes that
+    name no event (bulk writes, imports, task deletes) can't be matched and
+    are always sent. The ids are loaded when the stream opens and kept
+    current from the stream itself.
+    """
+    
+    def __init__(self, user_id: int, organized: Iterable[int], assigned: Iterable[int]):
+        self.user_id = user_id
+        self.organized = set(organized)
+        self.assigned = set(assigned)
+    
+    def admits(self, change: dict) -> bool:
+        """Whether to send a change, updating the tracked ids from it"""
+        entity, action, id = change["entity"], change["action"], change["id"]
+        if entity == "event":
+            if action == "created" and change["user_id"] == self.user_id:
+                self.organized.add(id)
+            elif action == "deleted":
+                self.organized.discard(id)
+            return True
+        
+        if change["event_id"] is None:
+            return True
+        mine = change["user_id"] == self.user_id
+        was_mine = id in self.assigned
+        # A single-task change names its assignee; null means unassigned
+        if id is not None:
+            if mine:
+                self.assigned.add(id)
+            else:
+                self.assigned.discard(id)
+        return mine or was_mine or change["event_id"] in self.organized
+
+
+def _load_audience(user_id: int) -> Audience:
+    """A user's organized events and assigned tasks, with a short-lived session of its own"""
+    db = SessionLocal()
+    try:
+        return Audience(
+            user_id,
+            organized=crud_event.get_ids_organized_by(db, user_id=user_id),
+            assigned=crud_task.get_ids_assigned_to(db, user_id=user_id)
+        )
+    finally:
+        db.close()
+
+
+async def _sse(queue: asyncio.Queue, audience: Audience) -> AsyncIterator[bytes]:
+    """Server-sent events of the audience's changes from a broker queue, with keep-alive comments"""
+    yield b"retry: 3000\n\n"
+    while True:
+        try:
+            message = await asyncio.wait_for(queue.get(), settings.STREAM_HEARTBEAT_SECONDS)
+        except asyncio.TimeoutError:
+            yield b": keep-alive\n\n"
+            continue
+        if message is None:
+            # Fell behind or shutting down: the client reconnects and reloads
+            return
+        change = orjson.loads(message)
+        if change["entity"] == "event" and change["action"] == "imported":
+            # The imported events' ids aren't named: reload what the user organizes
+            audience.organized = (await run_in_threadpool(_load_audience, audience.user_id)).organized
+        if audience.admits(change):
+            yield b"data: " + message + b"\n\n"
+
+
+@router.get("")
+async def stream_changes(current_user: UserAuth = Depends(get_current_auth_user)):
+    """
+    Server-sent events announcing event and task creates, updates and deletes
+    that concern the current user (see Audience).
+    
+    Each `data:` line is JSON {entity, action, id, event_id, user_id}; id is
+    null when several rows changed at once (bulk writes, imports).
+    """
+    async def events() -> AsyncIterator[bytes]:
+        async with change_broker.subscribe() as queue:
+            # Subscribed first, so no change is missed while the ids load
+            audience = await run_in_threadpool(_load_audience, current_user.id)
+            async for chunk in _sse(queue, audience):
+                yield chunk
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,11 +1,33 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
-from app.api.deps import get_db, get_current_user
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse
+from app.api.deps import get_db, get_current_auth_user
+from app.api.uploads import spool_body
+from app.core.serialization import EXPORT_MEDIA_TYPES, JSON_MEDIA_TYPE, ExportFormat
+from app.api.conditional import (
+    collection_etag,
+    entity_etag,
+    is_not_modified,
+    not_modified,
+    set_validators,
+)
+from app.models.task import TaskStatus
+from app.schemas.task import (
+    TaskCreate,
+    TaskUpdate,
+    TaskResponse,
+    TaskBulkUpdate,
+    TaskBulkUpdateResponse,
+)
+from app.schemas.imports import ImportReport
+from app.schemas.pagination import Page
 from app.services.task_service import task_service
-from app.models.user import User
+from app.services.import_service import UnreadableInputError, import_service
+from app.schemas.user import UserAuth
 
 
 router = APIRouter()
@@ -15,31 +37,135 @@ router = APIRouter()
 def create_task(
     task_in: TaskCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserAuth = Depends(get_current_auth_user)
 ):
     """Create a new task"""
     return task_service.create_task(db, task_in, current_user.id)
 
 
-@router.get("/event/{event_id}", response_model=List[TaskResponse])
-def get_event_tasks(event_id: int, db: Session = Depends(get_db)):
-    """Get all tasks for an event"""
-    return task_service.get_event_tasks(db, event_id)
+@router.post("/bulk", response_model=List[TaskResponse], status_code=status.HTTP_201_CREATED)
+def create_tasks(
+    tasks_in: List[TaskCreate] = Body(..., min_length=1, max_length=1000),
+    db: Session = Depends(get_db),
+    current_user: UserAuth = Depends(get_current_auth_user)
+):
+    """Create many tasks in one transaction"""
+    return task_service.create_tasks(db, tasks_in, current_user.id)
+
+
+@router.patch("/bulk", response_model=TaskBulkUpdateResponse)
+def update_tasks(
+    bulk_in: TaskBulkUpdate,
+    db: Session = Depends(get_db),
+    current_user: UserAuth = Depends(get_current_auth_user)
+):
+    """Apply one partial update to many tasks"""
+    return task_service.update_tasks(db, bulk_in, current_user.id)
+
+
+@router.get("/event/{event_id}", response_model=Page[TaskResponse])
+def get_event_tasks(
+    event_id: int,
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    """Get a page of tasks for an event"""
+    count, last_changed = task_service.get_event_tasks_version(db, event_id)
+    etag = collection_etag("event-tasks", count, last_changed, event_id, cursor, limit)
+    if is_not_modified(request, etag, last_changed):
+        return not_modified(etag, last_changed)
+    
+    # Pre-serialized page, returned as is (no response_model revalidation)
+    body = task_service.get_event_tasks_json(db, event_id, cursor=cursor, limit=limit)
+    response = Response(body, media_type=JSON_MEDIA_TYPE)
+    set_validators(response, etag, last_changed)
+    return response
 
 
-@router.get("/my-tasks", response_model=List[TaskResponse])
+@router.get("/my-tasks", response_model=Page[TaskResponse])
 def get_my_tasks(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserAuth = Depends(get_current_auth_user)
 ):
-    """Get all tasks assigned to current user"""
-    return task_service.get_user_tasks(db, current_user.id)
+    """Get a page of tasks assigned to current user"""
+    count, last_changed = task_service.get_user_tasks_version(db, current_user.id)
+    etag = collection_etag("user-tasks", count, last_changed, current_user.id, cursor, limit)
+    if is_not_modified(request, etag, last_changed):
+        return not_modified(etag, last_changed)
+    
+    body = task_service.get_user_tasks_json(db, current_user.id, cursor=cursor, limit=limit)
+    response = Response(body, media_type=JSON_MEDIA_TYPE)
+    set_validators(response, etag, last_changed)
+    return response
+
+
+@router.post("/import", response_model=ImportReport)
+async def import_tasks(
+    request: Request,
+    fmt: ExportFormat = Query("ndjson", alias="format"),
+    db: Session = Depends(get_db),
+    current_user: UserAuth = Depends(get_current_auth_user)
+):
+    """Bulk import tasks from a CSV or NDJSON request body (same columns as export)"""
+    source = await spool_body(request)
+    try:
+        return await run_in_threadpool(import_service.import_tasks, db, source, fmt, current_user.id)
+    except UnreadableInputError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+    finally:
+        source.close()
+
+
+@router.get("/export", dependencies=[Depends(get_current_auth_user)])
+def export_tasks(
+    fmt: ExportFormat = Query("ndjson", alias="format"),
+    organizer_id: Optional[int] = None,
+    event_id: Optional[int] = None,
+    assigned_to_id: Optional[int] = None,
+    task_status: Optional[TaskStatus] = Query(None, alias="status"),
+    due_from: Optional[datetime] = None,
+    due_to: Optional[datetime] = None
+):
+    """Stream all tasks (optionally filtered, due date in [due_from, due_to)) as NDJSON or CSV"""
+    return StreamingResponse(
+        task_service.export_tasks(
+            fmt,
+            organizer_id=organizer_id,
+            event_id=event_id,
+            assigned_to_id=assigned_to_id,
+            status=task_status,
+            due_from=due_from,
+            due_to=due_to
+        ),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{fmt}"'}
+    )
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
-def get_task(task_id: int, db: Session = Depends(get_db)):
+def get_task(
+    task_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db)
+):
     """Get task by ID"""
-    return task_service.get_task(db, task_id)
+    task = task_service.get_task(db, task_id)
+    last_modified = task.updated_at or task.created_at
+    etag = entity_etag("task", task.id, last_modified)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+    
+    set_validators(response, etag, last_modified)
+    return task
 
 
 @router.put("/{task_id}", response_model=TaskResponse)
@@ -47,7 +173,7 @@ def update_task(
     task_id: int,
     task_in: TaskUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserAuth = Depends(get_current_auth_user)
 ):
     """Update a task"""
     return task_service.update_task(db, task_id, task_in, current_user.id)
@@ -57,7 +183,7 @@ def update_task(
 def delete_task(
     task_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: UserAuth = Depends(get_current_auth_user)
 ):
     """Delete a task"""
     task_service.delete_task(db, task_id, current_user.id)
@@ -0,0 +1,39 @@
+import tempfile
+
+from fastapi import HTTPException, Request, status
+
+from app.core.config import settings
+
+
+def body_too_large() -> HTTPException:
+    """413 for a request body over IMPORT_MAX_BYTES"""
+    return HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail=f"Request body exceeds {settings.IMPORT_MAX_BYTES} bytes"
+    )
+
+
+async def spool_body(request: Request) -> tempfile.SpooledTemporaryFile:
+    """
+    Copy the request body into a temporary file, chunk by chunk.
+    
+    Stays in memory up to UPLOAD_SPOOL_MAX_MEMORY bytes, then moves to disk,
+    so large uploads are never held in memory whole. Rewound for reading.
+    Bodies over IMPORT_MAX_BYTES are refused with 413: up front when
+    Content-Length announces it, otherwise as soon as the spooled size
+    passes the limit.
+    """
+    length = request.headers.get("content-length")
+    if length is not None and length.isdigit() and int(length) > settings.IMPORT_MAX_BYTES:
+        raise body_too_large()
+    
+    spool = tempfile.SpooledTemporaryFile(max_size=settings.UPLOAD_SPOOL_MAX_MEMORY)
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > settings.IMPORT_MAX_BYTES:
+            spool.close()
+            raise body_too_large()
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
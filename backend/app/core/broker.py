@@ -0,0 +1,205 @@
+import asyncio
+import logging
+import select
+import threading
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Literal, Optional, Set
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.serialization import dump_json
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+Entity = Literal["event", "task"]
+Action = Literal["created", "updated", "deleted", "imported"]
+
+
+class ChangeBroker:
+    """
+    Fan-out of change notifications to the /api/stream subscribers.
+    
+    Messages are small JSON objects naming what changed
+    ({"entity": "task", "action": "updated", "id": 7, "event_id": 3, "user_id": 2});
+    clients reload what they show. publish() is called after the write has
+    committed, from any thread. Each subscriber has a bounded queue: one that
+    falls behind is disconnected (its queue ends with None) rather than
+    buffering without limit, and its client reconnects and reloads.
+    
+    This base class delivers within the current process only.
+    """
+    
+    name = "memory"
+    
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    async def start(self) -> None:
+        """Bind to the running event loop (application startup)"""
+        self._loop = asyncio.get_running_loop()
+    
+    async def stop(self) -> None:
+        """Disconnect all subscribers (application shutdown)"""
+        for queue in list(self._subscribers):
+            self._close(queue)
+        self._loop = None
+    
+    def publish(
+        self,
+        entity: Entity,
+        action: Action,
+        *,
+        id: Optional[int] = None,
+        event_id: Optional[int] = None,
+        user_id: Optional[int] = None
+    ) -> None:
+        """
+        Notify subscribers of a committed change; id=None means several rows.
+        user_id is the user it concerns (the organizer of a new event, the
+        assignee of a task), if known.
+        """
+        self._send(dump_json({
+            "entity": entity, "action": action, "id": id, "event_id": event_id, "user_id": user_id
+        }))
+    
+    async def publish_async(
+        self,
+        entity: Entity,
+        action: Action,
+        *,
+        id: Optional[int] = None,
+        event_id: Optional[int] = None,
+        user_id: Optional[int] = None
+    ) -> None:
+        """publish() for async code"""
+        self.publish(entity, action, id=id, event_id=event_id, user_id=user_id)
+    
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[asyncio.Queue]:
+        """Queue of messages (bytes) for one stream; None means disconnect"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers.discard(queue)
+    
+    def _send(self, message: bytes) -> None:
+        self._deliver(message)
+    
+    def _deliver(self, message: bytes) -> None:
+        """Hand a message to this process' subscribers (thread-safe)"""
+        loop = self._loop
+        if loop is not None and self._subscribers:
+            loop.call_soon_threadsafe(self._fan_out, message)
+    
+    def _fan_out(self, message: bytes) -> None:
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self._close(queue)
+    
+    def _close(self, queue: asyncio.Queue) -> None:
+        """Replace pending messages with the disconnect marker"""
+        self._subscribers.discard(queue)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+
+class PostgresChangeBroker(ChangeBroker):
+    """
+    Fan-out across worker processes through PostgreSQL LISTEN/NOTIFY.
+    
+    publish() sends NOTIFY on STREAM_CHANNEL; every process (this one
+    included) LISTENs on one dedicated connection in a background thread and
+    delivers what arrives to its own subscribers.
+    """
+    
+    name = "postgres"
+    
+    def __init__(self, queue_size: int, channel: str):
+        super().__init__(queue_size)
+        self.channel = channel
+        self._stopping = threading.Event()
+        self._listener: Optional[threading.Thread] = None
+    
+    async def start(self) -> None:
+        await super().start()
+        self._stopping.clear()
+        self._listener = threading.Thread(target=self._listen, name="change-broker", daemon=True)
+        self._listener.start()
+    
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._listener is not None:
+            await run_in_threadpool(self._listener.join)
+            self._listener = None
+        await super().stop()
+    
+    async def publish_async(
+        self,
+        entity: Entity,
+        action: Action,
+        *,
+        id: Optional[int] = None,
+        event_id: Optional[int] = None,
+        user_id: Optional[int] = None
+    ) -> None:
+        # NOTIFY is a blocking round trip on the sync engine
+        await run_in_threadpool(self.publish, entity, action, id=id, event_id=event_id, user_id=user_id)
+    
+    def _send(self, message: bytes) -> None:
+        # The write is already committed; a lost notification must not fail it
+        try:
+            with engine.connect() as connection:
+                connection.execute(
+                    text("SELECT pg_notify(:channel, :payload)"),
+                    {"channel": self.channel, "payload": message.decode()}
+                )
+                connection.commit()
+        except SQLAlchemyError:
+            logger.exception("Change notification not sent")
+    
+    def _listen(self) -> None:
+        """LISTEN loop; reconnects after connection errors until stop()"""
+        while not self._stopping.is_set():
+            try:
+                # Detached from the pool: held for the life of the process
+                raw = engine.raw_connection()
+                raw.detach()
+                connection = raw.driver_connection
+                connection.autocommit = True
+                try:
+                    with connection.cursor() as cursor:
+                        cursor.execute(f'LISTEN "{self.channel}"')
+                    while not self._stopping.is_set():
+                        if select.select([connection], [], [], 1.0)[0]:
+                            connection.poll()
+                            while connection.notifies:
+                                self._deliver(connection.notifies.pop(0).payload.encode())
+                finally:
+                    raw.close()
+            except Exception:
+                logger.exception("Change broker connection lost, reconnecting")
+                self._stopping.wait(1.0)
+
+
+def create_change_broker(kind: str) -> ChangeBroker:
+    """Build the broker named by STREAM_BROKER"""
+    if kind == "memory":
+        return ChangeBroker(queue_size=settings.STREAM_QUEUE_SIZE)
+    if kind == "postgres":
+        return PostgresChangeBroker(queue_size=settings.STREAM_QUEUE_SIZE, channel=settings.STREAM_CHANNEL)
+    raise ValueError(f"Unknown STREAM_BROKER: {kind}")
+
+
+# Event and task change notifications (GET /api/stream)
+change_broker = create_change_broker(settings.STREAM_BROKER)
@@ -0,0 +1,68 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from app.core.config import settings
+
+
+class TTLCache:
+    """
+    Bounded in-process LRU cache whose entries expire after `ttl` seconds.
+    
+    Thread-safe, since sync endpoints run in Starlette's threadpool.
+    Keeps hit/miss counters for monitoring.
+    """
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or default if missing or expired"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entries when full"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry"""
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def clear(self) -> None:
+        """Drop all entries"""
+        with self._lock:
+            self._data.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size"""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
+
+
+# Auth-relevant user state (UserAuth) keyed by user id. Invalidation is
+# per process, so USER_CACHE_TTL_SECONDS bounds staleness across workers.
+user_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAXSIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS
+)
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pathlib import Path
+from typing import Optional
 
 # Get absolute path to .env file
 BASE_DIR = Path(__file__).resolve().parent.parent.parent.parent  # eventure/
@@ -14,11 +15,73 @@ class Settings(BaseSettings):
     
     DATABASE_URL: str
     
+    # Async stack (asyncpg + AsyncSession); sync stack is used when disabled
+    USE_ASYNC_DB: bool = False
+    ASYNC_DATABASE_URL: Optional[str] = None
+    
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
+    # Password hashing: bcrypt cost and a dedicated process pool.
+    # At most WORKERS + QUEUE_SIZE hashes are admitted at once; the rest get 503.
+    # PASSWORD_HASH_WORKERS = 0 hashes inline in the request thread.
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 16
+    
+    # In-process cache of authenticated users' auth state
+    USER_CACHE_MAXSIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: int = 60
+    
+    # Already-verified access tokens, each kept until its own exp
+    TOKEN_CACHE_MAXSIZE: int = 10000
+    
+    # Tasks deleted per transaction by chunked (background) event deletion
+    EVENT_DELETE_CHUNK_SIZE: int = 1000
+    
+    # Rows fetched per server-side cursor batch by streaming exports
+    EXPORT_CHUNK_SIZE: int = 1000
+    
+    # Bulk import: rows per COPY batch, rejected rows listed in the report,
+    # request body bytes kept in memory before spooling to disk, and the
+    # largest body accepted (413 beyond it)
+    IMPORT_BATCH_SIZE: int = 5000
+    IMPORT_MAX_REPORTED_ERRORS: int = 1000
+    UPLOAD_SPOOL_MAX_MEMORY: int = 1024 * 1024
+    IMPORT_MAX_BYTES: int = 100 * 1024 * 1024
+    
+    # Read-through cache of event reads: "memory" (per process), "redis"
+    # (shared, EVENT_CACHE_URL) or "none". The TTL bounds staleness that
+    # write-path invalidation cannot reach (other processes, concurrent loads).
+    EVENT_CACHE_BACKEND: str = "memory"
+    EVENT_CACHE_URL: str = "redis://localhost:6379/0"
+    EVENT_CACHE_MAXSIZE: int = 10000
+    EVENT_CACHE_TTL_SECONDS: int = 30
+    
+    # Change notifications for GET /api/stream: "memory" (single process) or
+    # "postgres" (LISTEN/NOTIFY on STREAM_CHANNEL, for several workers).
+    # A subscriber more than STREAM_QUEUE_SIZE messages behind is disconnected.
+    STREAM_BROKER: str = "memory"
+    STREAM_CHANNEL: str = "eventure_changes"
+    STREAM_QUEUE_SIZE: int = 100
+    STREAM_HEARTBEAT_SECONDS: int = 15
+    
+    # Occurrences a recurring event with COUNT/UNTIL may have
+    RECURRENCE_MAX_OCCURRENCES: int = 10000
+    
+    # POST /api/availability: users per request and window length
+    AVAILABILITY_MAX_USERS: int = 100
+    AVAILABILITY_MAX_DAYS: int = 366
+    
+    # POST /api/events/{id}/auto-assign: candidate users per request
+    AUTO_ASSIGN_MAX_USERS: int = 100
+    
+    # Prometheus metrics on GET /metrics (needs the 'metrics' extra). When
+    # disabled no middleware, engine hooks or route are installed at all.
+    METRICS_ENABLED: bool = False
+    
     BACKEND_CORS_ORIGINS: list[str] = [
         "http://localhost:8000",
         "http://0.0.0.0:8000",
@@ -31,6 +94,14 @@ class Settings(BaseSettings):
         case_sensitive=True,
         extra="ignore"
     )
+    
+    @property
+    def async_database_url(self) -> str:
+        """ASYNC_DATABASE_URL, or DATABASE_URL rewritten for asyncpg"""
+        if self.ASYNC_DATABASE_URL:
+            return self.ASYNC_DATABASE_URL
+        scheme, _, rest = self.DATABASE_URL.partition("://")
+        return f"postgresql+asyncpg://{rest}" if scheme.startswith("postgresql") else self.DATABASE_URL
 
 
 settings = Settings()
@@ -0,0 +1,92 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+from app.core.security import hash_password, verify_password
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing pool is saturated"""
+    pass
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a dedicated process pool with a bounded admission queue.
+    
+    Login/register storms then use at most `workers` CPUs and hold at most
+    `workers + queue_size` request threads; everything beyond that is
+    rejected immediately with PasswordHasherBusy instead of starving
+    cheap endpoints of the shared threadpool.
+    """
+    
+    def __init__(self, workers: int, queue_size: int):
+        self.workers = workers
+        self._slots = threading.BoundedSemaphore(max(workers, 1) + queue_size)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Start the pool on first use"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+    
+    def _submit(self, fn: Callable, *args: Any) -> Future:
+        """Admit a job or raise PasswordHasherBusy"""
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy()
+        try:
+            if self.workers > 0:
+                future = self._get_executor().submit(fn, *args)
+            else:
+                future = Future()
+                try:
+                    future.set_result(fn(*args))
+                except Exception as e:
+                    future.set_exception(e)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+    
+    def hash(self, password: str) -> str:
+        """Hash a password (blocks the calling thread, not the CPU)"""
+        return self._submit(hash_password, password, settings.BCRYPT_ROUNDS).result()
+    
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password (blocks the calling thread, not the CPU)"""
+        return self._submit(verify_password, plain_password, hashed_password).result()
+    
+    async def hash_async(self, password: str) -> str:
+        """Hash a password without blocking the event loop"""
+        return await asyncio.wrap_future(
+            self._submit(hash_password, password, settings.BCRYPT_ROUNDS)
+        )
+    
+    async def verify_async(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password without blocking the event loop"""
+        return await asyncio.wrap_future(
+            self._submit(verify_password, plain_password, hashed_password)
+        )
+    
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE
+)
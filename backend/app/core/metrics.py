@@ -0,0 +1,267 @@
+import time
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Iterator, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+# Route label of requests no route matched (404s, static files), so unknown
+# paths cannot grow the label set
+UNMATCHED_ROUTE = "<unmatched>"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+DB_TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# Counters of a cache's stats() exported per cache, with their help text
+CACHE_COUNTERS = {
+    "hits": "Reads served from the cache",
+    "misses": "Reads that had to load the value",
+    "coalesced": "Misses served by a concurrent load of the same key",
+    "errors": "Failed cache backend operations, served as misses",
+}
+
+
+def route_template(scope: Scope) -> str:
+    """Path template of the route that handled a request ("/api/events/{event_id}")"""
+    route = scope.get("route")
+    if route is None:
+        return UNMATCHED_ROUTE
+    # route.path may be relative to its include_router prefix; it matched as
+    # many trailing segments of the request path as it has
+    segments = route.path.count("/")
+    prefix = scope["path"].rsplit("/", segments)[0] if segments else scope["path"]
+    return prefix + route.path
+
+
+class RequestQueries:
+    """Statements run and seconds spent in the database while handling one request"""
+    
+    __slots__ = ("count", "seconds")
+    
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+# Set by MetricsMiddleware for the duration of a request. Sync endpoints run
+# in worker threads and async engine statements in greenlets; both see the
+# request's context, and add to the same object.
+request_queries: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+
+class Metrics:
+    """
+    Prometheus instruments of the app, in their own registry.
+    
+    Only built when METRICS_ENABLED is set, so the `prometheus-client`
+    package is needed only then. Values are per process: with several
+    workers, scrape each one.
+    """
+    
+    def __init__(self):
+        try:
+            import prometheus_client
+        except ImportError as exc:
+            raise RuntimeError(
+                "METRICS_ENABLED requires the 'prometheus-client' package"
+            ) from exc
+        from prometheus_client import Counter, Gauge, Histogram
+        from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+        
+        self._client = prometheus_client
+        self._counter_family = CounterMetricFamily
+        self._gauge_family = GaugeMetricFamily
+        self.registry = prometheus_client.CollectorRegistry()
+        prometheus_client.ProcessCollector(registry=self.registry)
+        prometheus_client.GCCollector(registry=self.registry)
+        self._pools = {}
+        self._caches = {}
+        self.registry.register(self)
+        
+        self.requests = Counter(
+            "eventure_http_requests", "HTTP requests handled",
+            ["method", "route", "status"], registry=self.registry
+        )
+        self.request_seconds = Histogram(
+            "eventure_http_request_duration_seconds", "Time to the end of the response",
+            ["method", "route"], buckets=LATENCY_BUCKETS, registry=self.registry
+        )
+        self.requests_in_progress = Gauge(
+            "eventure_http_requests_in_progress", "HTTP requests being handled",
+            registry=self.registry
+        )
+        self.request_queries = Histogram(
+            "eventure_http_request_db_queries", "SQL statements run per request",
+            ["method", "route"], buckets=QUERY_COUNT_BUCKETS, registry=self.registry
+        )
+        self.request_db_seconds = Histogram(
+            "eventure_http_request_db_seconds", "Time spent in SQL statements per request",
+            ["method", "route"], buckets=DB_TIME_BUCKETS, registry=self.registry
+        )
+        self.queries = Counter(
+            "eventure_db_queries", "SQL statements run, in and outside requests",
+            ["pool"], registry=self.registry
+        )
+        self.query_seconds = Counter(
+            "eventure_db_query_seconds", "Time spent in SQL statements",
+            ["pool"], registry=self.registry
+        )
+        self.checkout_seconds = Histogram(
+            "eventure_db_pool_checkout_seconds",
+            "Time to get a connection from the pool, waiting for a free one or connecting",
+            ["pool"], buckets=DB_TIME_BUCKETS, registry=self.registry
+        )
+    
+    def instrument_engine(self, engine: Engine, pool: str) -> None:
+        """
+        Count an engine's statements and their time, per request and in
+        total, and time its pool checkouts. `engine` is a sync Engine (for
+        an AsyncEngine, its sync_engine).
+        """
+        queries = self.queries.labels(pool)
+        query_seconds = self.query_seconds.labels(pool)
+        checkout_seconds = self.checkout_seconds.labels(pool)
+        
+        @event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("query_started", []).append(time.perf_counter())
+        
+        @event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - conn.info["query_started"].pop()
+            queries.inc()
+            query_seconds.inc(elapsed)
+            stats = request_queries.get()
+            if stats is not None:
+                stats.count += 1
+                stats.seconds += elapsed
+        
+        @event.listens_for(engine, "handle_error")
+        def handle_error(exception_context):
+            started = exception_context.connection and exception_context.connection.info.get("query_started")
+            if started:
+                started.pop()
+        
+        # Every connection (Session, engine.connect(), the broker) comes from
+        # raw_connection(), and the pool has no event before a checkout, so
+        # time the call itself. Kept on the engine, it survives dispose().
+        raw_connection = engine.raw_connection
+        
+        @wraps(raw_connection)
+        def timed_raw_connection():
+            started = time.perf_counter()
+            try:
+                return raw_connection()
+            finally:
+                checkout_seconds.observe(time.perf_counter() - started)
+        
+        engine.raw_connection = timed_raw_connection
+        self._pools[pool] = engine
+    
+    def watch_cache(self, cache: Any, name: str) -> None:
+        """
+        Export a cache's stats() labelled {cache=name}: the CACHE_COUNTERS
+        it reports, and its size if it has one.
+        """
+        self._caches[name] = cache
+    
+    def collect(self) -> Iterator:
+        """Pool gauges and cache counters, read at scrape time"""
+        size = self._gauge_family("eventure_db_pool_size", "Connections the pool keeps", labels=["pool"])
+        checked_out = self._gauge_family(
+            "eventure_db_pool_checked_out", "Connections in use", labels=["pool"]
+        )
+        overflow = self._gauge_family(
+            "eventure_db_pool_overflow", "Connections open beyond the pool size", labels=["pool"]
+        )
+        for name, engine in self._pools.items():
+            if isinstance(engine.pool, QueuePool):
+                size.add_metric([name], engine.pool.size())
+                checked_out.add_metric([name], engine.pool.checkedout())
+                overflow.add_metric([name], max(engine.pool.overflow(), 0))
+        yield size
+        yield checked_out
+        yield overflow
+        
+        counters = {
+            counter: self._counter_family(f"eventure_cache_{counter}", help_text, labels=["cache"])
+            for counter, help_text in CACHE_COUNTERS.items()
+        }
+        entries = self._gauge_family("eventure_cache_size", "Entries held by in-process caches", labels=["cache"])
+        for name, cache in self._caches.items():
+            stats = cache.stats()
+            for counter, family in counters.items():
+                if counter in stats:
+                    family.add_metric([name], stats[counter])
+            if "size" in stats:
+                entries.add_metric([name], stats["size"])
+        yield from counters.values()
+        yield entries
+    
+    def render(self) -> Tuple[bytes, str]:
+        """All metrics in the Prometheus text format, and its media type"""
+        return self._client.generate_latest(self.registry), self._client.CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """
+    Per-request latency, status and SQL statements, labelled by route
+    template ("/api/events/{event_id}").
+    
+    Pure ASGI rather than BaseHTTPMiddleware: responses, streaming ones
+    included, pass through untouched. A request is observed when its last
+    body chunk is sent, so background tasks run after the response do not
+    count towards its latency.
+    """
+    
+    def __init__(self, app: ASGIApp, metrics: Metrics):
+        self.app = app
+        self.metrics = metrics
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        stats = RequestQueries()
+        token = request_queries.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+        observed = False
+        
+        def observe() -> None:
+            nonlocal observed
+            observed = True
+            route = route_template(scope)
+            method = scope["method"]
+            self.metrics.requests.labels(method, route, str(status_code)).inc()
+            self.metrics.request_seconds.labels(method, route).observe(time.perf_counter() - started)
+            self.metrics.request_queries.labels(method, route).observe(stats.count)
+            self.metrics.request_db_seconds.labels(method, route).observe(stats.seconds)
+        
+        async def send_observed(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                observe()
+        
+        self.metrics.requests_in_progress.inc()
+        try:
+            await self.app(scope, receive, send_observed)
+        finally:
+            self.metrics.requests_in_progress.dec()
+            request_queries.reset(token)
+            if not observed:
+                observe()
+
+
+# Prometheus instruments on GET /metrics; None (nothing installed) when disabled
+metrics = Metrics() if settings.METRICS_ENABLED else None
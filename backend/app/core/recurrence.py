@@ -0,0 +1,172 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, Optional
+
+from dateutil.relativedelta import relativedelta
+from dateutil.rrule import rrule, rrulestr
+
+from app.core.config import settings
+
+# RRULE parts accepted on events (RFC 5545). Times of day come from the
+# series start, so occurrences are at most daily: a window of N days holds
+# at most N occurrences of a series.
+RULE_PARTS = frozenset({
+    "FREQ", "INTERVAL", "COUNT", "UNTIL", "WKST",
+    "BYDAY", "BYMONTHDAY", "BYYEARDAY", "BYWEEKNO", "BYMONTH", "BYSETPOS",
+})
+RULE_FREQUENCIES = frozenset({"DAILY", "WEEKLY", "MONTHLY", "YEARLY"})
+
+# Length of one period of each FREQ: (unit, count) the series start moves by
+FREQ_PERIODS = {
+    "DAILY": ("days", 1),
+    "WEEKLY": ("days", 7),
+    "MONTHLY": ("months", 1),
+    "YEARLY": ("months", 12)
+}
+
+# Parts that set the days of a rule; without them dateutil derives the days
+# from the start (its weekday, day of month, month)
+DAY_PARTS = frozenset({"BYWEEKNO", "BYYEARDAY", "BYMONTHDAY", "BYDAY"})
+
+
+def utc(value: datetime) -> datetime:
+    """Treat naive timestamps as UTC"""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def rule_parts(rule: str) -> Dict[str, str]:
+    """NAME=value parts of an RRULE; raises ValueError"""
+    parts = {}
+    for part in rule.split(";"):
+        name, sep, value = part.partition("=")
+        if not sep or not value:
+            raise ValueError(f"Invalid recurrence rule part: {part!r}")
+        parts[name] = value
+    return parts
+
+
+def normalize_rule(rule: str) -> str:
+    """
+    Validate an RRULE and return it in stored form (upper case, no "RRULE:"
+    prefix). Raises ValueError.
+    """
+    rule = rule.strip().upper().removeprefix("RRULE:")
+    parts = rule_parts(rule)
+    unknown = sorted(set(parts) - RULE_PARTS)
+    if unknown:
+        raise ValueError(f"Unsupported recurrence rule parts: {', '.join(unknown)}")
+    if parts.get("FREQ") not in RULE_FREQUENCIES:
+        raise ValueError(f"FREQ must be one of {', '.join(sorted(RULE_FREQUENCIES))}")
+    if "COUNT" in parts and "UNTIL" in parts:
+        raise ValueError("COUNT and UNTIL are mutually exclusive")
+    parse_rule(rule, datetime(2000, 1, 1, tzinfo=timezone.utc))
+    return rule
+
+
+def parse_rule(rule: str, start: datetime) -> rrule:
+    """Recurrence of a series whose first possible occurrence is `start`; raises ValueError"""
+    try:
+        return rrulestr(rule, dtstart=utc(start))
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Invalid recurrence rule: {exc}")
+
+
+def aligned_start(rule: str, start: datetime, since: datetime) -> datetime:
+    """
+    The latest instant at or before `since` that is `start` moved forward by
+    whole FREQ x INTERVAL periods, so the rule's periods (and the BYxxx
+    sets within them) line up as from `start`. `start` itself when `since`
+    is earlier or the rule has COUNT, whose occurrences are numbered from
+    the first (COUNT series are bounded by RECURRENCE_MAX_OCCURRENCES).
+    """
+    start, since = utc(start), utc(since)
+    parts = rule_parts(rule)
+    if since <= start or "COUNT" in parts:
+        return start
+    unit, length = FREQ_PERIODS[parts["FREQ"]]
+    step = length * int(parts.get("INTERVAL", "1"))
+    if unit == "days":
+        return start + timedelta(days=(since - start).days // step * step)
+    periods = ((since.year - start.year) * 12 + since.month - start.month) // step
+    moved = start + relativedelta(months=periods * step)
+    # Same month as `since` but a later day or time
+    return moved if moved <= since else start + relativedelta(months=(periods - 1) * step)
+
+
+def start_defaults(rule: str, start: datetime) -> Dict[str, Any]:
+    """The days dateutil derives from `start` for a rule without DAY_PARTS, to keep when the start moves"""
+    parts = rule_parts(rule)
+    if parts.keys() & DAY_PARTS:
+        return {}
+    if parts["FREQ"] == "YEARLY":
+        if "BYMONTH" in parts:
+            return {"bymonthday": start.day}
+        return {"bymonth": start.month, "bymonthday": start.day}
+    if parts["FREQ"] == "MONTHLY":
+        return {"bymonthday": start.day}
+    if parts["FREQ"] == "WEEKLY":
+        return {"byweekday": start.weekday()}
+    return {}
+
+
+def recurrence_since(rule: str, start: datetime, since: datetime) -> rrule:
+    """
+    Recurrence of a series with the same occurrences from `since` on,
+    restarted at aligned_start: dateutil walks every occurrence from its
+    start, so this keeps the cost of reaching `since` independent of the
+    age of the series. Raises ValueError.
+    """
+    start = utc(start)
+    recurrence = parse_rule(rule, start)
+    moved = aligned_start(rule, start, since)
+    if moved == start:
+        return recurrence
+    return recurrence.replace(dtstart=moved, **start_defaults(rule, start))
+
+
+def series_end(rule: str, start: datetime, end: datetime) -> Optional[datetime]:
+    """
+    End of the last occurrence of a series, None if it never ends.
+    
+    Raises ValueError if the rule has no occurrences, or more than
+    RECURRENCE_MAX_OCCURRENCES (a longer series must be open-ended).
+    """
+    recurrence = parse_rule(rule, start)
+    parts = rule_parts(rule)
+    if "COUNT" not in parts and "UNTIL" not in parts:
+        if recurrence.after(utc(start), inc=True) is None:
+            raise ValueError("Recurrence rule has no occurrences")
+        return None
+    last = None
+    for number, last in enumerate(recurrence, start=1):
+        if number > settings.RECURRENCE_MAX_OCCURRENCES:
+            raise ValueError(
+                f"A bounded series may have at most {settings.RECURRENCE_MAX_OCCURRENCES} occurrences"
+            )
+    if last is None:
+        raise ValueError("Recurrence rule has no occurrences")
+    return last + (end - start)
+
+
+def occurrences(
+    rule: str, start: datetime, end: datetime, window_from: datetime, window_to: datetime
+) -> Iterator[datetime]:
+    """
+    Start times of the occurrences of a series overlapping [window_from,
+    window_to), in order. Lazy: nothing past the window is computed, so a
+    caller may stop early.
+    """
+    start, end = utc(start), utc(end)
+    duration = end - start
+    # Occurrences starting at or before window_from - duration end before the window
+    since = utc(window_from) - duration
+    for occurrence in recurrence_since(rule, start, since).xafter(since, inc=False):
+        if occurrence >= window_to:
+            return
+        yield occurrence
+
+
+def is_occurrence(rule: str, start: datetime, occurrence_start: datetime) -> bool:
+    """Whether occurrence_start is the start of an occurrence of the series"""
+    occurrence_start = utc(occurrence_start)
+    recurrence = recurrence_since(rule, start, occurrence_start)
+    return recurrence.after(occurrence_start, inc=True) == occurrence_start
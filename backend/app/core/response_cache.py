@@ -0,0 +1,276 @@
+import asyncio
+import threading
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Union
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+
+class CacheBackendError(Exception):
+    """A cache backend operation failed (e.g. the network store is unreachable)"""
+
+
+class CacheBackend:
+    """Byte store used by ResponseCache"""
+    
+    name = "none"
+    
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the stored value, or None"""
+        return None
+    
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        """Store a value; ttl=None keeps it until evicted"""
+    
+    def add(self, key: str, value: bytes) -> bool:
+        """Store a value only if the key is absent; report whether it was stored"""
+        return True
+    
+    def delete(self, *keys: str) -> None:
+        """Drop the given keys"""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU backend; every worker process has its own copy"""
+    
+    name = "memory"
+    
+    def __init__(self, maxsize: int):
+        self._cache = TTLCache(maxsize=maxsize, ttl=float("inf"))
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[bytes]:
+        return self._cache.get(key)
+    
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        self._cache.set(key, value, ttl=ttl)
+    
+    def add(self, key: str, value: bytes) -> bool:
+        with self._lock:
+            if self._cache.get(key) is not None:
+                return False
+            self._cache.set(key, value)
+            return True
+    
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._cache.invalidate(key)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Network backend shared by all workers.
+    
+    Talks the Redis protocol, so any compatible server works (Redis, Valkey,
+    or an in-memory stand-in such as fakeredis passed in as `client`).
+    """
+    
+    name = "redis"
+    
+    def __init__(self, url: Optional[str] = None, client=None):
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError(
+                "EVENT_CACHE_BACKEND=redis requires the 'redis' package"
+            ) from exc
+        self._client = client or redis.Redis.from_url(url, socket_timeout=0.5)
+        self._error_types = (redis.RedisError, OSError)
+    
+    @contextmanager
+    def _errors(self) -> Iterator[None]:
+        try:
+            yield
+        except self._error_types as exc:
+            raise CacheBackendError(str(exc)) from exc
+    
+    def get(self, key: str) -> Optional[bytes]:
+        with self._errors():
+            return self._client.get(key)
+    
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        with self._errors():
+            self._client.set(key, value, px=int(ttl * 1000) if ttl else None)
+    
+    def add(self, key: str, value: bytes) -> bool:
+        with self._errors():
+            return bool(self._client.set(key, value, nx=True))
+    
+    def delete(self, *keys: str) -> None:
+        if keys:
+            with self._errors():
+                self._client.delete(*keys)
+
+
+class ResponseCache:
+    """
+    Read-through cache of serialized responses.
+    
+    Concurrent misses on one key are coalesced (single-flight): one caller
+    runs the loader, the others wait for it and read its result. Listings are
+    stored under a namespace generation token, so a write invalidates every
+    page of a namespace by replacing the token instead of enumerating keys.
+    Backend failures degrade to cache misses.
+    """
+    
+    def __init__(self, backend: CacheBackend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._flights: Dict[str, List] = {}
+        self._async_flights: Dict[str, List] = {}
+    
+    def get_or_load(self, key: str, loader: Callable[[], bytes]) -> bytes:
+        """Return the cached value of key, calling loader once on a miss"""
+        value = self._get(key)
+        if value is not None:
+            self._count("hits")
+            return value
+    
+        with self._single_flight(key):
+            # Filled by another caller while we waited
+            value = self._get(key)
+            if value is not None:
+                self._count("coalesced")
+                return value
+    
+            self._count("misses")
+            value = loader()
+            self._set(key, value, self.ttl)
+            return value
+    
+    async def get_or_load_async(self, key: str, loader: Callable[[], Awaitable[bytes]]) -> bytes:
+        """
+        get_or_load for a coroutine loader (async stack); concurrent misses
+        are coalesced per event loop. Backend calls are not awaited: the
+        memory backend never blocks and the redis one is bounded by its
+        socket timeout.
+        """
+        value = self._get(key)
+        if value is not None:
+            self._count("hits")
+            return value
+    
+        async with self._async_single_flight(key):
+            value = self._get(key)
+            if value is not None:
+                self._count("coalesced")
+                return value
+    
+            self._count("misses")
+            value = await loader()
+            self._set(key, value, self.ttl)
+            return value
+    
+    def generation(self, namespace: str) -> str:
+        """Current generation token of a namespace"""
+        key = f"{namespace}:generation"
+        token = self._get(key)
+        if token is None:
+            # Never restart from a known value: an evicted token must not
+            # bring back entries stored under an older generation
+            token = uuid.uuid4().hex.encode()
+            if not self._add(key, token):
+                token = self._get(key) or token
+        return token.decode()
+    
+    def bump(self, namespace: str) -> None:
+        """Invalidate every key stored under the namespace generation"""
+        self._set(f"{namespace}:generation", uuid.uuid4().hex.encode(), None)
+    
+    def invalidate(self, *keys: str) -> None:
+        """Drop the given keys"""
+        try:
+            self.backend.delete(*keys)
+        except CacheBackendError:
+            self._count("errors")
+    
+    def stats(self) -> Dict[str, Union[str, int, float]]:
+        """Hit/miss counters and hit rate"""
+        served = self.hits + self.coalesced
+        total = served + self.misses
+        return {
+            "backend": self.backend.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "hit_rate": served / total if total else 0.0,
+        }
+    
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+    
+    def _get(self, key: str) -> Optional[bytes]:
+        try:
+            return self.backend.get(key)
+        except CacheBackendError:
+            self._count("errors")
+            return None
+    
+    def _set(self, key: str, value: bytes, ttl: Optional[float]) -> None:
+        try:
+            self.backend.set(key, value, ttl=ttl)
+        except CacheBackendError:
+            self._count("errors")
+    
+    def _add(self, key: str, value: bytes) -> bool:
+        try:
+            return self.backend.add(key, value)
+        except CacheBackendError:
+            self._count("errors")
+            return True
+    
+    @contextmanager
+    def _single_flight(self, key: str) -> Iterator[None]:
+        """Serialize callers of the same key within this process"""
+        with self._lock:
+            flight = self._flights.setdefault(key, [threading.Lock(), 0])
+            flight[1] += 1
+        try:
+            with flight[0]:
+                yield
+        finally:
+            with self._lock:
+                flight[1] -= 1
+                if not flight[1]:
+                    del self._flights[key]
+
+    
+    @asynccontextmanager
+    async def _async_single_flight(self, key: str) -> AsyncIterator[None]:
+        """Serialize coroutines loading the same key"""
+        flight = self._async_flights.setdefault(key, [asyncio.Lock(), 0])
+        flight[1] += 1
+        try:
+            async with flight[0]:
+                yield
+        finally:
+            flight[1] -= 1
+            if not flight[1]:
+                del self._async_flights[key]
+
+
+def create_cache_backend(kind: str) -> CacheBackend:
+    """Build the backend named by EVENT_CACHE_BACKEND"""
+    if kind == "memory":
+        return MemoryCacheBackend(maxsize=settings.EVENT_CACHE_MAXSIZE)
+    if kind == "redis":
+        return RedisCacheBackend(url=settings.EVENT_CACHE_URL)
+    if kind == "none":
+        return CacheBackend()
+    raise ValueError(f"Unknown EVENT_CACHE_BACKEND: {kind}")
+
+
+# Serialized event reads (GET /api/events/ and /api/events/{id})
+event_cache = ResponseCache(
+    backend=create_cache_backend(settings.EVENT_CACHE_BACKEND),
+    ttl=settings.EVENT_CACHE_TTL_SECONDS
+)
@@ -1,12 +1,19 @@
 import bcrypt
+import hashlib
+import time
 from jose import jwt, JWTError
 from datetime import datetime, timedelta
+from typing import Optional
 from app.core.config import settings
+from app.core.cache import TTLCache
 
+# sha256(token) -> user_id of tokens whose signature was already verified
+token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_MAXSIZE, ttl=0)
 
-def hash_password(password: str) -> str:
+
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
     """Hash a plaintext password"""
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=rounds or settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
@@ -14,6 +21,14 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plaintext password against a hashed password"""
     return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
 
+def needs_rehash(hashed_password: str) -> bool:
+    """Check if a hash was made with a different cost than BCRYPT_ROUNDS"""
+    # bcrypt hashes look like $2b$<cost>$<salt+hash>
+    try:
+        return int(hashed_password.split('$')[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
 
 def create_access_token(user_id: int) -> str:
     """Create JWT access token"""
@@ -31,15 +46,25 @@ def create_refresh_token(user_id: int) -> str:
 
 def decode_token(token: str) -> int:
     """Decode JWT token and return user_id"""
+    key = hashlib.sha256(token.encode('utf-8')).digest()
+    cached_user_id = token_cache.get(key)
+    if cached_user_id is not None:
+        return cached_user_id
+    
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         user_id: str = payload.get("sub")
         if user_id is None:
             raise ValueError("Invalid token")
-        return int(user_id)
     except jwt.ExpiredSignatureError:
         raise ValueError("Token expired")
     except JWTError:
         raise ValueError("Invalid token")
+    
+    # Reuse the verification until the token's own expiry
+    exp = payload.get("exp")
+    if exp is not None:
+        token_cache.set(key, int(user_id), ttl=exp - time.time())
+    return int(user_id)
 
 
@@ -0,0 +1,68 @@
+import csv
+import io
+from datetime import datetime
+from enum import Enum
+from typing import Any, Literal, Optional, Sequence, Tuple, Type
+
+import orjson
+from pydantic import BaseModel
+
+JSON_MEDIA_TYPE = "application/json"
+
+ExportFormat = Literal["ndjson", "csv"]
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+def response_fields(schema: Type[BaseModel]) -> Tuple[str, ...]:
+    """Field names of a response schema, in output order"""
+    return tuple(schema.model_fields)
+
+
+def dump_json(content: Any) -> bytes:
+    """Serialize trusted data (dicts/lists of DB values) as JSON, like dump_page"""
+    return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+def dump_page(fields: Sequence[str], rows: Sequence[Sequence[Any]], next_cursor: Optional[str]) -> bytes:
+    """
+    Serialize DB rows as a Page[schema] JSON body.
+    
+    Rows are trusted DB output holding the schema `fields` in order, so they
+    are encoded directly instead of being validated into models one by one.
+    orjson writes enums by value and datetimes in ISO format with "Z" for
+    UTC, the same output as the Pydantic schema.
+    """
+    items = [dict(zip(fields, row)) for row in rows]
+    return orjson.dumps({"items": items, "next_cursor": next_cursor}, option=orjson.OPT_UTC_Z)
+
+
+def dump_ndjson(fields: Sequence[str], rows: Sequence[Sequence[Any]]) -> bytes:
+    """Serialize DB rows as newline-delimited JSON objects (one per row)"""
+    option = orjson.OPT_UTC_Z | orjson.OPT_APPEND_NEWLINE
+    return b"".join(orjson.dumps(dict(zip(fields, row)), option=option) for row in rows)
+
+
+def _csv_value(value: Any) -> Any:
+    """CSV cell of a DB value, formatted like its JSON counterpart"""
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return orjson.dumps(value, option=orjson.OPT_UTC_Z).decode().strip('"')
+    return value
+
+
+def dump_csv(fields: Sequence[str], rows: Sequence[Sequence[Any]], *, header: bool = False) -> bytes:
+    """Serialize DB rows as CSV lines, optionally preceded by the header line"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(fields)
+    writer.writerows([_csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def dump_rows(fmt: ExportFormat, fields: Sequence[str], rows: Sequence[Sequence[Any]]) -> bytes:
+    """Serialize DB rows in an export format"""
+    return dump_csv(fields, rows) if fmt == "csv" else dump_ndjson(fields, rows)
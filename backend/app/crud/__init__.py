@@ -1,5 +1,5 @@
 # CRUD operations exports
-from app.crud.base import CRUDBase
-from app.crud.user import crud_user
+from app.crud.base import CRUDBase, AsyncCRUDBase
+from app.crud.user import crud_user, async_crud_user
 
-__all__ = ["CRUDBase", "crud_user"]
+__all__ = ["CRUDBase", "AsyncCRUDBase", "crud_user", "async_crud_user"]
@@ -1,15 +1,26 @@
-from typing import Generic, TypeVar, Type, Optional, List, Any, Dict, Union
+from datetime import datetime
+from typing import Generic, TypeVar, Type, Optional, List, Any, Dict, Iterator, Sequence, Union, Tuple
 from pydantic import BaseModel
+from sqlalchemy import ColumnElement, Row, Select, and_, delete, exists, func, insert, inspect, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from fastapi.encoders import jsonable_encoder
 
 from app.db.base import Base
+from app.crud.pagination import keyset, split_page
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
+def column_data(
+    columns: frozenset, obj_in: Union[BaseModel, Dict[str, Any]], *, exclude_unset: bool = False
+) -> Dict[str, Any]:
+    """Данные схемы/словаря, отфильтрованные по колонкам модели"""
+    data = obj_in if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=exclude_unset)
+    return {key: value for key, value in data.items() if key in columns}
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """
     CRUD базовый класс с методами Create, Read, Update, Delete.
@@ -17,27 +28,80 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     Generic класс - работает с любой моделью!
     """
     
+    # Колонки keyset пагинации (последняя должна быть уникальной)
+    cursor_columns: Tuple[str, ...] = ("id",)
+    
     def __init__(self, model: Type[ModelType]):
         """Инициализация с SQLAlchemy моделью"""
         self.model = model
+        self.columns = frozenset(inspect(model).columns.keys())
     
     def get(self, db: Session, id: Any) -> Optional[ModelType]:
         """Получить одну запись по ID"""
         return db.query(self.model).filter(self.model.id == id).first()
     
     def get_multi(
-        self, db: Session, *, skip: int = 0, limit: int = 100
-    ) -> List[ModelType]:
-        """Получить список с пагинацией"""
-        return db.query(self.model).offset(skip).limit(limit).all()
-    
-    def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
-        """Создать новую запись"""
-        obj_in_data = jsonable_encoder(obj_in)
-        db_obj = self.model(**obj_in_data)
-        db.add(db_obj)
+        self, db: Session, *, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """Получить страницу записей и курсор следующей страницы"""
+        return self.get_page(db, select(self.model), cursor=cursor, limit=limit)
+    
+    def get_page(
+        self, db: Session, stmt: Select, *, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """Keyset пагинация произвольного запроса по cursor_columns"""
+        columns = [getattr(self.model, name) for name in self.cursor_columns]
+        rows = db.scalars(keyset(stmt, columns, cursor, limit)).all()
+        return split_page(rows, self.cursor_columns, limit)
+    
+    def get_rows(
+        self,
+        db: Session,
+        names: Sequence[str],
+        *where: ColumnElement[bool],
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Tuple[List[Row], Optional[str]]:
+        """
+        Страница строк (кортежей) выбранных колонок, без ORM объектов.
+    
+        Для быстрой сериализации списков: без identity map и загрузки объектов.
+        names должны включать cursor_columns.
+        """
+        stmt = select(*(getattr(self.model, name) for name in names)).where(*where)
+        columns = [getattr(self.model, name) for name in self.cursor_columns]
+        rows = db.execute(keyset(stmt, columns, cursor, limit)).all()
+        return split_page(rows, self.cursor_columns, limit)
+    
+    def stream_rows(
+        self,
+        db: Session,
+        names: Sequence[str],
+        *where: ColumnElement[bool],
+        chunk_size: int = 1000
+    ) -> Iterator[Sequence[Row]]:
+        """
+        Все подходящие строки выбранных колонок, частями по chunk_size.
+    
+        yield_per включает серверный курсор (stream_results): в памяти
+        одновременно только одна часть, сколько бы строк ни было.
+        """
+        order = [getattr(self.model, name) for name in self.cursor_columns]
+        stmt = select(*(getattr(self.model, name) for name in names)).where(*where).order_by(*order)
+        result = db.execute(stmt, execution_options={"yield_per": chunk_size})
+        yield from result.partitions()
+    
+    def create(
+        self, db: Session, *, obj_in: Union[CreateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        """
+        Создать новую запись одним INSERT ... RETURNING.
+    
+        Объект отсоединяется от сессии до commit, чтобы он не устарел
+        (expire_on_commit) и не перечитывался отдельным SELECT.
+        """
+        db_obj = self._insert(db, column_data(self.columns, obj_in))
         db.commit()
-        db.refresh(db_obj)
         return db_obj
     
     def update(
@@ -47,19 +111,11 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db_obj: ModelType,
         obj_in: Union[UpdateSchemaType, Dict[str, Any]]
     ) -> ModelType:
-        """Обновить существующую запись"""
-        obj_data = jsonable_encoder(db_obj)
-        if isinstance(obj_in, dict):
-            update_data = obj_in
-        else:
-            update_data = obj_in.dict(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+        """Обновить существующую запись одним UPDATE ... RETURNING"""
+        data = column_data(self.columns, obj_in, exclude_unset=True)
+        if not data:
+            return db_obj
+        return self._update_where(db, self.model.id == db_obj.id, data)
     
     def delete(self, db: Session, *, id: int) -> ModelType:
         """Удалить запись"""
@@ -67,3 +123,223 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.delete(obj)
         db.commit()
         return obj
+    
+    def exists(self, db: Session, *, id: Any) -> bool:
+        """Проверить, существует ли запись"""
+        return db.scalar(select(exists().where(self.model.id == id)))
+    
+    def get_version(
+        self, db: Session, *where: ColumnElement[bool]
+    ) -> Tuple[int, Optional[datetime]]:
+        """
+        Версия набора записей: (количество, последнее изменение).
+    
+        Для ETag списков - одна агрегатная строка вместо загрузки записей.
+        """
+        last_changed = func.max(func.coalesce(self.model.updated_at, self.model.created_at))
+        count, last = db.execute(select(func.count(), last_changed).where(*where)).one()
+        return count, last
+    
+    # Запросы с областью доступа: `scope` - условие вида "пользователь может
+    # изменять эту запись", проверка прав и чтение/запись - один запрос.
+    # None/False означает "не найдено или запрещено"; различить их можно через
+    # exists(), это нужно только на неуспешном пути.
+    
+    def get_scoped(self, db: Session, *, id: Any, scope: ColumnElement[bool]) -> Optional[ModelType]:
+        """Получить запись, если она попадает в scope"""
+        return db.scalars(select(self.model).where(self.model.id == id, scope)).first()
+    
+    def update_scoped(
+        self,
+        db: Session,
+        *,
+        id: Any,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+        scope: ColumnElement[bool]
+    ) -> Optional[ModelType]:
+        """Обновить запись, если она попадает в scope"""
+        data = column_data(self.columns, obj_in, exclude_unset=True)
+        if not data:
+            return self.get_scoped(db, id=id, scope=scope)
+        return self._update_where(db, and_(self.model.id == id, scope), data)
+    
+    def delete_scoped(self, db: Session, *, id: Any, scope: ColumnElement[bool]) -> bool:
+        """Удалить запись, если она попадает в scope"""
+        result = db.execute(
+            delete(self.model)
+            .where(self.model.id == id, scope)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount > 0
+    
+    def _insert(self, db: Session, data: Dict[str, Any]) -> ModelType:
+        """INSERT ... RETURNING одной записи, отсоединённой от сессии, без commit"""
+        db_obj = db.scalars(insert(self.model).values(**data).returning(self.model)).one()
+        db.expunge(db_obj)
+        return db_obj
+    
+    def _update_where(
+        self, db: Session, where: ColumnElement[bool], data: Dict[str, Any]
+    ) -> Optional[ModelType]:
+        """UPDATE ... WHERE ... RETURNING одной записи, отсоединённой от сессии"""
+        db_obj = self._update_returning(db, where, data)
+        db.commit()
+        return db_obj
+    
+    def _update_returning(
+        self, db: Session, where: ColumnElement[bool], data: Dict[str, Any]
+    ) -> Optional[ModelType]:
+        """То же, что _update_where, но без commit"""
+        stmt = (
+            update(self.model)
+            .where(where)
+            .values(**data)
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        )
+        db_obj = db.scalars(stmt).first()
+        if db_obj is not None:
+            db.expunge(db_obj)
+        return db_obj
+
+
+class AsyncCRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    """
+    Async версия CRUDBase для AsyncSession.
+    
+    Те же методы, но каждый запрос к БД выполняется через await.
+    """
+    
+    # Колонки keyset пагинации (последняя должна быть уникальной)
+    cursor_columns: Tuple[str, ...] = ("id",)
+    
+    def __init__(self, model: Type[ModelType]):
+        """Инициализация с SQLAlchemy моделью"""
+        self.model = model
+        self.columns = frozenset(inspect(model).columns.keys())
+    
+    async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        """Получить одну запись по ID"""
+        return await db.get(self.model, id)
+    
+    async def get_multi(
+        self, db: AsyncSession, *, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """Получить страницу записей и курсор следующей страницы"""
+        return await self.get_page(db, select(self.model), cursor=cursor, limit=limit)
+    
+    async def get_page(
+        self, db: AsyncSession, stmt: Select, *, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """Keyset пагинация произвольного запроса по cursor_columns"""
+        columns = [getattr(self.model, name) for name in self.cursor_columns]
+        rows = (await db.scalars(keyset(stmt, columns, cursor, limit))).all()
+        return split_page(rows, self.cursor_columns, limit)
+    
+    async def get_rows(
+        self,
+        db: AsyncSession,
+        names: Sequence[str],
+        *where: ColumnElement[bool],
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Tuple[List[Row], Optional[str]]:
+        """Страница строк (кортежей) выбранных колонок, без ORM объектов"""
+        stmt = select(*(getattr(self.model, name) for name in names)).where(*where)
+        columns = [getattr(self.model, name) for name in self.cursor_columns]
+        rows = (await db.execute(keyset(stmt, columns, cursor, limit))).all()
+        return split_page(rows, self.cursor_columns, limit)
+    
+    async def create(
+        self, db: AsyncSession, *, obj_in: Union[CreateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        """Создать новую запись одним INSERT ... RETURNING"""
+        data = column_data(self.columns, obj_in)
+        db_obj = (await db.scalars(insert(self.model).values(**data).returning(self.model))).one()
+        await db.commit()
+        return db_obj
+    
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: ModelType,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        """Обновить существующую запись одним UPDATE ... RETURNING"""
+        data = column_data(self.columns, obj_in, exclude_unset=True)
+        if not data:
+            return db_obj
+        return await self._update_where(db, self.model.id == db_obj.id, data)
+    
+    async def delete(self, db: AsyncSession, *, id: int) -> ModelType:
+        """Удалить запись"""
+        obj = await db.get(self.model, id)
+        await db.delete(obj)
+        await db.commit()
+        return obj
+    
+    async def exists(self, db: AsyncSession, *, id: Any) -> bool:
+        """Проверить, существует ли запись"""
+        return await db.scalar(select(exists().where(self.model.id == id)))
+    
+    async def get_version(
+        self, db: AsyncSession, *where: ColumnElement[bool]
+    ) -> Tuple[int, Optional[datetime]]:
+        """Версия набора записей: (количество, последнее изменение), как в CRUDBase"""
+        last_changed = func.max(func.coalesce(self.model.updated_at, self.model.created_at))
+        count, last = (await db.execute(select(func.count(), last_changed).where(*where))).one()
+        return count, last
+    
+    # Запросы с областью доступа, как в CRUDBase: None/False - "не найдено
+    # или запрещено", различить их можно через exists()
+    
+    async def get_scoped(self, db: AsyncSession, *, id: Any, scope: ColumnElement[bool]) -> Optional[ModelType]:
+        """Получить запись, если она попадает в scope"""
+        return (await db.scalars(select(self.model).where(self.model.id == id, scope))).first()
+    
+    async def update_scoped(
+        self,
+        db: AsyncSession,
+        *,
+        id: Any,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+        scope: ColumnElement[bool]
+    ) -> Optional[ModelType]:
+        """Обновить запись, если она попадает в scope"""
+        data = column_data(self.columns, obj_in, exclude_unset=True)
+        if not data:
+            return await self.get_scoped(db, id=id, scope=scope)
+        return await self._update_where(db, and_(self.model.id == id, scope), data)
+    
+    async def delete_scoped(self, db: AsyncSession, *, id: Any, scope: ColumnElement[bool]) -> bool:
+        """Удалить запись, если она попадает в scope"""
+        result = await db.execute(
+            delete(self.model)
+            .where(self.model.id == id, scope)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return result.rowcount > 0
+    
+    async def _update_where(
+        self, db: AsyncSession, where: ColumnElement[bool], data: Dict[str, Any]
+    ) -> Optional[ModelType]:
+        """UPDATE ... WHERE ... RETURNING одной записи"""
+        db_obj = await self._update_returning(db, where, data)
+        await db.commit()
+        return db_obj
+    
+    async def _update_returning(
+        self, db: AsyncSession, where: ColumnElement[bool], data: Dict[str, Any]
+    ) -> Optional[ModelType]:
+        """То же, что _update_where, но без commit"""
+        stmt = (
+            update(self.model)
+            .where(where)
+            .values(**data)
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        )
+        return (await db.scalars(stmt)).first()
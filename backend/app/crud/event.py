@@ -1,11 +1,479 @@
-from app.crud.base import CRUDBase
-from app.models.event import Event
+from sqlalchemy import Boolean, ColumnElement, DateTime, Double, Row, and_, bindparam, cast, delete, exists, func, insert, literal, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.visitors import InternalTraversal
+from collections import defaultdict, namedtuple
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app.core.recurrence import occurrences, utc
+from app.crud.base import CRUDBase, AsyncCRUDBase, column_data
+from app.crud.pagination import decode_cursor, keyset, split_page
+from app.crud.staging import StagingTable
+from app.crud.task import OPEN_STATUSES
+from app.models.event import SEARCH_CONFIG, Event, EventStatus
+from app.models.event_exception import EventException
+from app.models.task import Task
 from app.schemas.event import EventCreate, EventUpdate
 
+# Markers around matched words in search headlines (never HTML, see EventService)
+HEADLINE_START = "\x02"
+HEADLINE_STOP = "\x03"
+
+
+class TimeRangeOverlap(ColumnElement[bool]):
+    """
+    Event time range [start_time, end_time) overlaps [range_from, range_to).
+    
+    Either bound may be None (unbounded). On PostgreSQL this renders as
+    tstzrange(start_time, end_time) && tstzrange(...), the expression of
+    the ix_events_time_range GiST index; elsewhere as plain comparisons.
+    """
+    
+    type = Boolean()
+    inherit_cache = True
+    # Part of the statement cache key: which bounds are set changes the SQL
+    _traverse_internals = [
+        ("range_from", InternalTraversal.dp_clauseelement),
+        ("range_to", InternalTraversal.dp_clauseelement),
+        ("bounded", InternalTraversal.dp_plain_obj),
+    ]
+    
+    def __init__(self, range_from: Optional[datetime], range_to: Optional[datetime]):
+        if range_from is None and range_to is None:
+            raise ValueError("TimeRangeOverlap needs at least one bound")
+        self.range_from = bindparam("range_from", range_from, type_=DateTime(timezone=True), unique=True)
+        self.range_to = bindparam("range_to", range_to, type_=DateTime(timezone=True), unique=True)
+        self.bounded = (range_from is not None, range_to is not None)
+
+
+@compiles(TimeRangeOverlap)
+def _compile_overlap(element: TimeRangeOverlap, compiler, **kw) -> str:
+    has_from, has_to = element.bounded
+    conditions = []
+    if has_from:
+        conditions.append(Event.end_time > element.range_from)
+    if has_to:
+        conditions.append(Event.start_time < element.range_to)
+    return compiler.process(and_(*conditions), **kw)
+
+
+@compiles(TimeRangeOverlap, "postgresql")
+def _compile_overlap_postgresql(element: TimeRangeOverlap, compiler, **kw) -> str:
+    expression = func.tstzrange(Event.start_time, Event.end_time).bool_op("&&")(
+        func.tstzrange(element.range_from, element.range_to)
+    )
+    return compiler.process(expression, **kw)
+
+
+# Series columns an occurrence exception can override (besides its times)
+OVERRIDE_FIELDS = ("title", "description", "location", "status")
+
+# Columns occurrence expansion reads besides the requested ones
+SERIES_FIELDS = ("id", "start_time", "end_time", "recurrence_rule")
+
+
+def series_in(start: Optional[datetime], end: Optional[datetime]) -> ColumnElement[bool]:
+    """Recurring series that may have occurrences overlapping [start, end)"""
+    conditions = [Event.recurrence_rule.is_not(None)]
+    if end is not None:
+        conditions.append(Event.start_time < end)
+    if start is not None:
+        conditions.append(or_(Event.recurrence_end.is_(None), Event.recurrence_end > start))
+    return and_(*conditions)
+
+
+def overlapping(start: Optional[datetime], end: Optional[datetime]) -> ColumnElement[bool]:
+    """
+    One-off events overlapping [start, end), and series that may have
+    occurrences overlapping it (listed once, unexpanded). The two arms use
+    the ix_events_time_range and ix_events_series_start_time indexes.
+    """
+    return or_(
+        and_(Event.recurrence_rule.is_(None), TimeRangeOverlap(start, end)),
+        series_in(start, end)
+    )
+
+
+def one_off_stmt(
+    names: Sequence[str], where: Sequence[ColumnElement[bool]], start: datetime, end: datetime
+) -> Select:
+    """One-off events overlapping [start, end)"""
+    return select(*(getattr(Event, name) for name in names)).where(
+        *where, Event.recurrence_rule.is_(None), TimeRangeOverlap(start, end)
+    )
+
+
+def series_stmt(
+    names: Sequence[str], where: Sequence[ColumnElement[bool]], start: datetime, end: datetime
+) -> Select:
+    """Series that may have occurrences overlapping [start, end)"""
+    columns = [*names, *(name for name in SERIES_FIELDS if name not in names)]
+    return select(*(getattr(Event, name) for name in columns)).where(*where, series_in(start, end))
+
+
+def exceptions_stmt(series: Sequence[Row], start: datetime, end: datetime) -> Select:
+    """
+    Exceptions of the given series that can affect [start, end): those of
+    occurrences originally overlapping it, and those moved into it.
+    """
+    longest = max(utc(row.end_time) - utc(row.start_time) for row in series)
+    return select(EventException).where(
+        EventException.event_id.in_([row.id for row in series]),
+        or_(
+            and_(EventException.occurrence_start > start - longest, EventException.occurrence_start < end),
+            and_(EventException.start_time < end, EventException.end_time > start)
+        )
+    )
+
+
+def expand(
+    series: Sequence[Row],
+    exceptions: Iterable[EventException],
+    start: datetime,
+    end: datetime,
+    *,
+    after: Optional[Tuple[datetime, int]] = None,
+    limit: Optional[int] = None
+) -> Iterator[Tuple[Row, datetime, datetime, datetime, Optional[EventException]]]:
+    """
+    (series row, occurrence_start, start, end, exception) of the occurrences
+    of each series overlapping [start, end), after the (start, id) key
+    `after`. Cancelled occurrences are skipped; moved ones take their new
+    times. Occurrences are generated lazily, so at most limit + 1 are
+    computed per series (a page needs no more).
+    """
+    overrides: Dict[int, Dict[datetime, EventException]] = defaultdict(dict)
+    for exception in exceptions:
+        overrides[exception.event_id][utc(exception.occurrence_start)] = exception
+    
+    for row in series:
+        duration = utc(row.end_time) - utc(row.start_time)
+        own = overrides.get(row.id, {})
+        generated = 0
+        for occurrence_start in occurrences(row.recurrence_rule, row.start_time, row.end_time, start, end):
+            if after is not None and (occurrence_start, row.id) <= after:
+                continue
+            exception = own.get(occurrence_start)
+            # Cancelled, or moved (yielded below with its new times)
+            if exception is not None and (exception.cancelled or exception.start_time is not None):
+                continue
+            yield row, occurrence_start, occurrence_start, occurrence_start + duration, exception
+            generated += 1
+            if limit is not None and generated > limit:
+                break
+        for occurrence_start, exception in own.items():
+            if exception.cancelled or exception.start_time is None:
+                continue
+            moved_start, moved_end = utc(exception.start_time), utc(exception.end_time)
+            if moved_start < end and moved_end > start and (after is None or (moved_start, row.id) > after):
+                yield row, occurrence_start, moved_start, moved_end, exception
+
+
+@lru_cache(maxsize=None)
+def occurrence_row(names: Tuple[str, ...]) -> Any:
+    """Row type of an occurrence listing: the given columns, then occurrence_start"""
+    return namedtuple("OccurrenceRow", [*names, "occurrence_start"])
+
+
+def occurrence_page(
+    names: Sequence[str],
+    one_off: Sequence[Row],
+    series: Sequence[Row],
+    exceptions: Sequence[EventException],
+    start: datetime,
+    end: datetime,
+    cursor: Optional[str],
+    limit: int
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Merge a keyset page of one-off events with the occurrences of the series
+    into one page ordered by (start_time, id), like split_page.
+    """
+    row_type = occurrence_row(tuple(names))
+    after = None
+    if cursor:
+        after_start, after_id = decode_cursor(cursor, [Event.start_time, Event.id])
+        after = (utc(after_start), after_id)
+    
+    rows = [row_type(*row, None) for row in one_off]
+    for row, occurrence_start, starts, ends, exception in expand(
+        series, exceptions, start, end, after=after, limit=limit
+    ):
+        values = row._asdict()
+        values.update(start_time=starts, end_time=ends)
+        if exception is not None:
+            values.update(
+                (name, getattr(exception, name)) for name in OVERRIDE_FIELDS
+                if getattr(exception, name) is not None
+            )
+        rows.append(row_type(*(values[name] for name in names), occurrence_start))
+    
+    rows.sort(key=lambda row: (utc(row.start_time), row.id))
+    return split_page(rows[:limit + 1], ("start_time", "id"), limit)
+
+
+def search_stmt(names: Sequence[str], query: str, cursor: Optional[str], limit: int) -> Select:
+    """Statement of one page of CRUDEvent.search"""
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+    # float8, so the rank round-trips exactly through the cursor
+    rank = cast(func.ts_rank_cd(Event.search_vector, tsquery), Double).label("rank")
+    page = keyset(
+        select(Event.id, rank).where(Event.search_vector.bool_op("@@")(tsquery)),
+        [rank, Event.id], cursor, limit, descending=True
+    ).subquery()
+    
+    markers = f"StartSel={HEADLINE_START}, StopSel={HEADLINE_STOP}"
+    return (
+        select(
+            *(getattr(Event, name) for name in names),
+            page.c.rank,
+            func.ts_headline(SEARCH_CONFIG, Event.title, tsquery, f"HighlightAll=true, {markers}")
+            .label("title_headline"),
+            func.ts_headline(SEARCH_CONFIG, Event.description, tsquery, f"MaxFragments=2, {markers}")
+            .label("description_headline"),
+        )
+        .join(page, page.c.id == Event.id)
+        .order_by(page.c.rank.desc(), page.c.id.desc())
+    )
+
 
 class CRUDEvent(CRUDBase[Event, EventCreate, EventUpdate]):
     """CRUD operations for Event"""
-    pass
+    
+    cursor_columns = ("start_time", "id")
+    
+    def organized_by(self, user_id: int) -> ColumnElement[bool]:
+        """Scope: events this user organizes"""
+        return Event.organizer_id == user_id
+    
+    def involving(self, user_id: int) -> ColumnElement[bool]:
+        """Scope: events this user organizes or has tasks assigned in"""
+        return or_(
+            Event.organizer_id == user_id,
+            exists().where(Task.event_id == Event.id, Task.assigned_to_id == user_id)
+        )
+    
+    def get_organizer_ids(self, db: Session, *, ids: Iterable[int]) -> Dict[int, int]:
+        """Map event_id -> organizer_id for the given events in one query"""
+        rows = db.execute(select(Event.id, Event.organizer_id).where(Event.id.in_(list(ids))))
+        return {event_id: organizer_id for event_id, organizer_id in rows}
+    
+    def get_ids_organized_by(self, db: Session, *, user_id: int) -> List[int]:
+        """Ids of the events a user organizes"""
+        return list(db.scalars(select(Event.id).where(Event.organizer_id == user_id)))
+    
+    def filters(
+        self,
+        *,
+        organizer_id: Optional[int] = None,
+        status: Optional[EventStatus] = None,
+        start_from: Optional[datetime] = None,
+        start_to: Optional[datetime] = None,
+        overlap_from: Optional[datetime] = None,
+        overlap_to: Optional[datetime] = None
+    ) -> List[ColumnElement[bool]]:
+        """
+        Conditions for events matching the given (optional) filters.
+    
+        start_from/start_to select events starting in the window;
+        overlap_from/overlap_to select events overlapping it (calendar views).
+        """
+        conditions = []
+        if organizer_id is not None:
+            conditions.append(Event.organizer_id == organizer_id)
+        if status is not None:
+            conditions.append(Event.status == status)
+        if start_from is not None:
+            conditions.append(Event.start_time >= start_from)
+        if start_to is not None:
+            conditions.append(Event.start_time < start_to)
+        if overlap_from is not None or overlap_to is not None:
+            conditions.append(overlapping(overlap_from, overlap_to))
+        return conditions
+    
+    def get_occurrence_rows(
+        self,
+        db: Session,
+        names: Sequence[str],
+        *where: ColumnElement[bool],
+        start: datetime,
+        end: datetime,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Tuple[List[Any], Optional[str]]:
+        """
+        A page of the events overlapping [start, end), with every series
+        expanded into its occurrences there, ordered by (start_time, id).
+    
+        Rows hold the given columns (including cursor_columns), then
+        occurrence_start (None for one-off events). Three queries, each
+        bounded by the window: a keyset page of one-off events, the series
+        active in it, and their exceptions.
+        """
+        start, end = utc(start), utc(end)
+        columns = [getattr(Event, name) for name in self.cursor_columns]
+        one_off = db.execute(keyset(one_off_stmt(names, where, start, end), columns, cursor, limit)).all()
+        series = db.execute(series_stmt(names, where, start, end)).all()
+        exceptions = db.scalars(exceptions_stmt(series, start, end)).all() if series else []
+        return occurrence_page(names, one_off, series, exceptions, start, end, cursor, limit)
+    
+    def save_exception(
+        self, db: Session, *, event_id: int, occurrence_start: datetime, data: Dict[str, Any]
+    ) -> EventException:
+        """Create or replace the override of one occurrence (one upsert)"""
+        dialect_insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        stmt = dialect_insert(EventException).values(
+            event_id=event_id, occurrence_start=occurrence_start, **data
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[EventException.event_id, EventException.occurrence_start],
+            set_=data
+        ).returning(EventException)
+        exception = db.scalars(stmt).one()
+        db.expunge(exception)
+        # The series changes with its occurrences, so list and detail versions move
+        db.execute(update(Event).where(Event.id == event_id).values(updated_at=func.now()))
+        db.commit()
+        return exception
+    
+    def update_series(
+        self, db: Session, *, id: int, obj_in: Dict[str, Any], scope: ColumnElement[bool]
+    ) -> Optional[Event]:
+        """
+        Update an event in scope whose occurrences move and drop its
+        occurrence overrides, in one transaction
+        """
+        data = column_data(self.columns, obj_in)
+        event = self._update_returning(db, and_(Event.id == id, scope), data)
+        if event is not None:
+            db.execute(delete(EventException).where(EventException.event_id == id))
+        db.commit()
+        return event
+    
+    def get_busy_intervals(
+        self, db: Session, *, user_ids: Sequence[int], start: datetime, end: datetime
+    ) -> List[Tuple[datetime, datetime]]:
+        """
+        (start, end) of the events and occurrences overlapping [start, end)
+        that any of the users organizes or has open tasks in, ordered by
+        start (UTC). Cancelled events and occurrences don't count, nor tasks
+        that are done or cancelled.
+        One query for one-off events, one for series and their exceptions.
+        """
+        start, end = utc(start), utc(end)
+        where = [
+            Event.status != EventStatus.CANCELLED,
+            or_(
+                Event.organizer_id.in_(user_ids),
+                exists().where(
+                    Task.event_id == Event.id,
+                    Task.assigned_to_id.in_(user_ids),
+                    Task.status.in_(OPEN_STATUSES)
+                )
+            )
+        ]
+        intervals = [
+            (utc(row.start_time), utc(row.end_time))
+            for row in db.execute(one_off_stmt(("start_time", "end_time"), where, start, end))
+        ]
+        series = db.execute(series_stmt(SERIES_FIELDS, where, start, end)).all()
+        if series:
+            exceptions = db.scalars(exceptions_stmt(series, start, end)).all()
+            intervals.extend(
+                (starts, ends)
+                for _, _, starts, ends, exception in expand(series, exceptions, start, end)
+                if exception is None or exception.status != EventStatus.CANCELLED
+            )
+        intervals.sort()
+        return intervals
+    
+    def search(
+        self,
+        db: Session,
+        query: str,
+        *,
+        names: Sequence[str],
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Tuple[List[Row], Optional[str]]:
+        """
+        A page of events matching a web-search style query, best match first.
+    
+        Rows hold the given columns, then rank, title_headline and
+        description_headline (matches between HEADLINE_START/HEADLINE_STOP).
+        The GIN index finds the matches; pages are keyset by (rank, id)
+        descending, and headlines are only built for the rows of the page.
+        """
+        stmt = search_stmt(names, query, cursor, limit)
+        return split_page(db.execute(stmt).all(), ("rank", "id"), limit)
+    
+    def merge_staged(self, db: Session, *, staging: StagingTable, organizer_id: int) -> int:
+        """Insert all staged events, in row order, with one INSERT ... SELECT"""
+        rows = (
+            select(*staging.values(), literal(organizer_id))
+            .order_by(staging.c.row_number)
+        )
+        result = db.execute(insert(Event).from_select([*staging.names, "organizer_id"], rows))
+        return result.rowcount
+
+
+class AsyncCRUDEvent(AsyncCRUDBase[Event, EventCreate, EventUpdate]):
+    """Async CRUD operations for Event"""
+    
+    cursor_columns = ("start_time", "id")
+    
+    async def get_organizer_ids(self, db: AsyncSession, *, ids: Iterable[int]) -> Dict[int, int]:
+        """Map event_id -> organizer_id for the given events in one query"""
+        rows = await db.execute(select(Event.id, Event.organizer_id).where(Event.id.in_(list(ids))))
+        return {event_id: organizer_id for event_id, organizer_id in rows}
+    
+    async def get_occurrence_rows(
+        self,
+        db: AsyncSession,
+        names: Sequence[str],
+        *where: ColumnElement[bool],
+        start: datetime,
+        end: datetime,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Tuple[List[Any], Optional[str]]:
+        """CRUDEvent.get_occurrence_rows for the async stack"""
+        start, end = utc(start), utc(end)
+        columns = [getattr(Event, name) for name in self.cursor_columns]
+        one_off = (await db.execute(keyset(one_off_stmt(names, where, start, end), columns, cursor, limit))).all()
+        series = (await db.execute(series_stmt(names, where, start, end))).all()
+        exceptions = (await db.scalars(exceptions_stmt(series, start, end))).all() if series else []
+        return occurrence_page(names, one_off, series, exceptions, start, end, cursor, limit)
+    
+    async def search(
+        self,
+        db: AsyncSession,
+        query: str,
+        *,
+        names: Sequence[str],
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Tuple[List[Row], Optional[str]]:
+        """CRUDEvent.search for the async stack"""
+        stmt = search_stmt(names, query, cursor, limit)
+        return split_page((await db.execute(stmt)).all(), ("rank", "id"), limit)
+    
+    async def update_series(
+        self, db: AsyncSession, *, id: int, obj_in: Dict[str, Any], scope: ColumnElement[bool]
+    ) -> Optional[Event]:
+        """CRUDEvent.update_series for the async stack"""
+        data = column_data(self.columns, obj_in)
+        event = await self._update_returning(db, and_(Event.id == id, scope), data)
+        if event is not None:
+            await db.execute(delete(EventException).where(EventException.event_id == id))
+        await db.commit()
+        return event
 
 
 crud_event = CRUDEvent(Event)
+async_crud_event = AsyncCRUDEvent(Event)
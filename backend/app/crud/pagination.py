@@ -0,0 +1,60 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, tuple_
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode keyset values of the last row into an opaque cursor"""
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> List[Any]:
+    """Decode a cursor back into typed keyset values; raises ValueError"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise ValueError("Invalid cursor")
+    
+    decoded = []
+    for column, value in zip(columns, values):
+        python_type = column.type.python_type
+        try:
+            decoded.append(
+                datetime.fromisoformat(value) if python_type is datetime else python_type(value)
+            )
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor")
+    return decoded
+
+
+def keyset(
+    stmt: Select, columns: Sequence[Any], cursor: Optional[str], limit: int, *, descending: bool = False
+) -> Select:
+    """
+    Apply keyset pagination to a select statement.
+    
+    Rows are ordered by `columns` (the last one must be unique) and filtered
+    with a row-value comparison, so an index on the same columns serves any
+    page at the same cost. One extra row is fetched to detect the next page.
+    With descending=True every column is ordered DESC.
+    """
+    if cursor:
+        row, last = tuple_(*columns), tuple_(*decode_cursor(cursor, columns))
+        stmt = stmt.where(row < last if descending else row > last)
+    order = [column.desc() for column in columns] if descending else columns
+    return stmt.order_by(*order).limit(limit + 1)
+
+
+def split_page(rows: Sequence[Any], names: Sequence[str], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Split the limit + 1 rows fetched by keyset() into (items, next_cursor)"""
+    items = list(rows[:limit])
+    if len(rows) <= limit:
+        return items, None
+    last = items[-1]
+    return items, encode_cursor([getattr(last, name) for name in names])
@@ -0,0 +1,96 @@
+import csv
+import io
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Sequence, Tuple, Type
+
+from sqlalchemy import Column, ColumnElement, Enum as SQLEnum, Integer, MetaData, String, Table, cast, insert
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+
+
+def _staged_value(value: Any) -> Any:
+    """Value as stored in the staging table (enums as member names)"""
+    # SQLAlchemy Enum columns store member names
+    return value.name if isinstance(value, Enum) else value
+
+
+def _copy_value(value: Any) -> Any:
+    """Text form of a value for COPY ... (FORMAT csv)"""
+    value = _staged_value(value)
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+class StagingTable:
+    """
+    Временная таблица для массовой загрузки: row_number + часть колонок модели.
+    
+    В PostgreSQL заполняется через COPY, в других СУБД - пакетным INSERT.
+    Живёт внутри транзакции загрузки: create() ... drop() до commit.
+    Enum колонки хранятся строками (именами членов) и приводятся к типу
+    при слиянии, чтобы create/drop таблицы не трогали типы ENUM в PostgreSQL.
+    """
+    
+    def __init__(self, model: Type[Base], names: Sequence[str]):
+        self.names = list(names)
+        self.types = {name: model.__table__.c[name].type for name in self.names}
+        self.table = Table(
+            f"import_{model.__tablename__}",
+            MetaData(),
+            Column("row_number", Integer, primary_key=True, autoincrement=False),
+            *(
+                Column(name, String if isinstance(type_, SQLEnum) else type_)
+                for name, type_ in self.types.items()
+            ),
+            prefixes=["TEMPORARY"]
+        )
+    
+    @property
+    def c(self):
+        """Колонки временной таблицы"""
+        return self.table.c
+    
+    def values(self) -> List[ColumnElement]:
+        """Колонки для INSERT ... SELECT, приведённые к типам целевой таблицы"""
+        return [
+            cast(self.c[name], type_) if isinstance(type_, SQLEnum) else self.c[name]
+            for name, type_ in self.types.items()
+        ]
+    
+    def create(self, db: Session) -> None:
+        """Создать временную таблицу в транзакции сессии"""
+        connection = db.connection()
+        # Драйверы без транзакционного DDL (sqlite) могли оставить её после сбоя
+        self.table.drop(connection, checkfirst=True)
+        self.table.create(connection)
+    
+    def drop(self, db: Session) -> None:
+        """Удалить временную таблицу"""
+        self.table.drop(db.connection())
+    
+    def copy(self, db: Session, rows: Sequence[Tuple[int, Dict[str, Any]]]) -> None:
+        """Загрузить пакет строк (row_number, данные)"""
+        if not rows:
+            return
+        connection = db.connection()
+        if connection.dialect.name != "postgresql":
+            connection.execute(
+                insert(self.table),
+                [
+                    {"row_number": number, **{name: _staged_value(data.get(name)) for name in self.names}}
+                    for number, data in rows
+                ]
+            )
+            return
+        
+        # QUOTE_NOTNULL: None -> пустое поле без кавычек, т.е. NULL для COPY
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, quoting=csv.QUOTE_NOTNULL)
+        writer.writerows(
+            [number, *(_copy_value(data.get(name)) for name in self.names)] for number, data in rows
+        )
+        buffer.seek(0)
+        columns = ", ".join(["row_number", *self.names])
+        with connection.connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY {self.table.name} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
@@ -1,21 +1,474 @@
+from collections import Counter
+
+from sqlalchemy import ColumnElement, Integer, Row, and_, case, column, delete, exists, func, insert, or_, select, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.sql import Select, Update
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
-from app.crud.base import CRUDBase
-from app.models.task import Task
+from app.crud.base import CRUDBase, AsyncCRUDBase, column_data
+from app.crud.staging import StagingTable
+from app.crud.task_count import CountDelta, async_crud_task_count, crud_task_count
+from app.models.task import Task, TaskPriority, TaskStatus
+from app.models.event import Event
+from app.models.user import User
 from app.schemas.task import TaskCreate, TaskUpdate
 
+# Columns the per-event counters are keyed by
+COUNTED_COLUMNS = frozenset({"event_id", "status"})
+
+# Tasks still to be done, and how much each counts towards a user's workload
+OPEN_STATUSES = (TaskStatus.TODO, TaskStatus.IN_PROGRESS)
+PRIORITY_WEIGHTS = {
+    TaskPriority.LOW: 1,
+    TaskPriority.MEDIUM: 2,
+    TaskPriority.HIGH: 3,
+    TaskPriority.URGENT: 4,
+}
+
+
+def count_moves(previous: Dict[int, Tuple[int, TaskStatus]], updated: Sequence[Any]) -> List[CountDelta]:
+    """Counter deltas taking updated tasks from their previous (event_id, status)"""
+    deltas = []
+    for task in updated:
+        event_id, task_status = previous[task.id]
+        deltas.append((event_id, task_status, -1))
+        deltas.append((task.event_id, task.status, 1))
+    return deltas
+
+
+def workloads_stmt(user_ids: Sequence[int]) -> Select:
+    """Rows of (user id, weighted open workload) of CRUDTask.get_open_workloads"""
+    weight = case(
+        *((Task.priority == priority, value) for priority, value in PRIORITY_WEIGHTS.items()), else_=0
+    )
+    return (
+        select(User.id, func.coalesce(func.sum(weight), 0))
+        .outerjoin(Task, and_(Task.assigned_to_id == User.id, Task.status.in_(OPEN_STATUSES)))
+        .where(User.id.in_(user_ids))
+        .group_by(User.id)
+    )
+
+
+def unassigned_stmt(event_id: int) -> Select:
+    """Locking read of CRUDTask.lock_unassigned"""
+    return (
+        select(Task.id, Task.priority, Task.due_date)
+        .where(Task.event_id == event_id, Task.assigned_to_id.is_(None), Task.status.in_(OPEN_STATUSES))
+        .with_for_update()
+    )
+
+
+def assign_stmt(dialect: str, assignments: Dict[int, int]) -> Update:
+    """
+    UPDATE ... RETURNING (id, assigned_to_id) of CRUDTask.assign_multi.
+    
+    On PostgreSQL the pairs are joined in as a VALUES list (UPDATE ...
+    FROM), elsewhere they become one CASE. Only still unassigned tasks match.
+    """
+    if dialect == "postgresql":
+        pairs = values(
+            column("task_id", Integer), column("user_id", Integer), name="assignment"
+        ).data(list(assignments.items()))
+        where = [Task.id == pairs.c.task_id]
+        assignee = pairs.c.user_id
+    else:
+        where = [Task.id.in_(assignments)]
+        assignee = case(assignments, value=Task.id)
+    return (
+        update(Task)
+        .where(*where, Task.assigned_to_id.is_(None))
+        .values(assigned_to_id=assignee)
+        .returning(Task.id, Task.assigned_to_id)
+        .execution_options(synchronize_session=False)
+    )
+
 
 class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
-    """CRUD operations for Task"""
+    """
+    CRUD operations for Task.
+    
+    Every write also adjusts the per-event counters (crud_task_count) before
+    its commit; an event's counters are removed with it by ON DELETE CASCADE.
+    """
+    
+    cursor_columns = ("created_at", "id")
+    
+    def in_events_organized_by(self, user_id: int) -> ColumnElement[bool]:
+        """Scope: tasks of events this user organizes"""
+        return exists().where(Event.id == Task.event_id, Event.organizer_id == user_id)
+    
+    def modifiable_by(self, user_id: int) -> ColumnElement[bool]:
+        """Scope: tasks this user may modify (event organizer or assignee)"""
+        return or_(Task.assigned_to_id == user_id, self.in_events_organized_by(user_id))
+    
+    def filters(
+        self,
+        *,
+        organizer_id: Optional[int] = None,
+        event_id: Optional[int] = None,
+        assigned_to_id: Optional[int] = None,
+        status: Optional[TaskStatus] = None,
+        due_from: Optional[datetime] = None,
+        due_to: Optional[datetime] = None
+    ) -> List[ColumnElement[bool]]:
+        """Conditions for tasks matching the given (optional) filters"""
+        conditions = []
+        if organizer_id is not None:
+            conditions.append(self.in_events_organized_by(organizer_id))
+        if event_id is not None:
+            conditions.append(Task.event_id == event_id)
+        if assigned_to_id is not None:
+            conditions.append(Task.assigned_to_id == assigned_to_id)
+        if status is not None:
+            conditions.append(Task.status == status)
+        if due_from is not None:
+            conditions.append(Task.due_date >= due_from)
+        if due_to is not None:
+            conditions.append(Task.due_date < due_to)
+        return conditions
+    
+    def get_by_event(
+        self,
+        db: Session,
+        event_id: int,
+        *,
+        names: Sequence[str],
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Tuple[List[Row], Optional[str]]:
+        """Get a page of tasks for an event, as rows of the given columns"""
+        return self.get_rows(db, names, Task.event_id == event_id, cursor=cursor, limit=limit)
+    
+    def get_by_user(
+        self,
+        db: Session,
+        user_id: int,
+        *,
+        names: Sequence[str],
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> Tuple[List[Row], Optional[str]]:
+        """Get a page of tasks assigned to a user, as rows of the given columns"""
+        return self.get_rows(db, names, Task.assigned_to_id == user_id, cursor=cursor, limit=limit)
+    
+    def create(self, db: Session, *, obj_in: Union[TaskCreate, Dict[str, Any]]) -> Task:
+        """Create a task and count it in one transaction"""
+        task = self._insert(db, column_data(self.columns, obj_in))
+        crud_task_count.add(db, [(task.event_id, task.status, 1)])
+        db.commit()
+        return task
+    
+    def create_multi(self, db: Session, *, objs_in: List[TaskCreate]) -> List[Row]:
+        """
+        Insert many tasks with a multi-row INSERT ... RETURNING in one transaction.
+    
+        Returns plain rows rather than ORM objects, so nothing is expired
+        and reloaded one by one after the commit.
+        """
+        stmt = insert(Task).returning(*Task.__table__.columns, sort_by_parameter_order=True)
+        rows = db.execute(stmt, [obj_in.model_dump() for obj_in in objs_in]).all()
+        crud_task_count.add(db, [(row.event_id, row.status, 1) for row in rows])
+        db.commit()
+        return rows
+    
+    def update_multi_for_user(
+        self, db: Session, *, ids: List[int], values: Dict[str, Any], user_id: int
+    ) -> List[Row]:
+        """
+        Apply the same changes to every task in `ids` the user may modify.
+    
+        The organizer/assignee rule is part of the WHERE clause, so this is a
+        single UPDATE ... RETURNING; ids missing from the result were either
+        not found or forbidden.
+        """
+        where = and_(Task.id.in_(ids), self.modifiable_by(user_id))
+        previous = self._lock_counted(db, where, values)
+        if previous is not None:
+            where = and_(where, Task.id.in_(list(previous)))
+        stmt = (
+            update(Task)
+            .where(where)
+            .values(**values)
+            .returning(*Task.__table__.columns)
+            .execution_options(synchronize_session=False)
+        )
+        rows = db.execute(stmt).all()
+        if previous:
+            crud_task_count.add(db, count_moves(previous, rows))
+        db.commit()
+        return rows
+    
+    def get_open_workloads(self, db: Session, *, user_ids: Sequence[int]) -> Dict[int, int]:
+        """
+        Weighted open workload (PRIORITY_WEIGHTS summed over open tasks) of
+        each existing user in `user_ids`, in one aggregate query; users
+        missing from the result do not exist.
+        """
+        return {user_id: workload for user_id, workload in db.execute(workloads_stmt(user_ids))}
+    
+    def lock_unassigned(self, db: Session, *, event_id: int) -> List[Row]:
+        """Lock an event's open, unassigned tasks; rows of (id, priority, due_date)"""
+        return db.execute(unassigned_stmt(event_id)).all()
+    
+    def assign_multi(self, db: Session, *, assignments: Dict[int, int]) -> List[Row]:
+        """
+        Set assigned_to_id per task id in one UPDATE ... RETURNING (see
+        assign_stmt) and commit. Tasks assigned in the meantime are left
+        alone and missing from the result. Assignees are not counted, so the
+        per-event counters do not change.
+        """
+        if not assignments:
+            return []
+        rows = db.execute(assign_stmt(db.get_bind().dialect.name, assignments)).all()
+        db.commit()
+        return rows
+    
+    def get_ids_assigned_to(self, db: Session, *, user_id: int) -> List[int]:
+        """Ids of the tasks assigned to a user"""
+        return list(db.scalars(select(Task.id).where(Task.assigned_to_id == user_id)))
+    
+    def get_existing_ids(self, db: Session, *, ids: List[int]) -> List[int]:
+        """Return which of the given task ids exist"""
+        return list(db.scalars(select(Task.id).where(Task.id.in_(ids))))
+    
+    def _staged_checks(
+        self, staging: StagingTable, user_id: int
+    ) -> Tuple[ColumnElement[bool], ColumnElement[bool]]:
+        """Per staged row: (event is organized by user, assignee exists or is empty)"""
+        event_owned = exists().where(Event.id == staging.c.event_id, Event.organizer_id == user_id)
+        assignee_exists = or_(
+            staging.c.assigned_to_id.is_(None),
+            exists().where(User.id == staging.c.assigned_to_id)
+        )
+        return event_owned, assignee_exists
+    
+    def get_staged_rejections(
+        self, db: Session, *, staging: StagingTable, user_id: int
+    ) -> List[Tuple[int, bool, bool]]:
+        """Staged rows that cannot be merged: (row_number, event_owned, assignee_exists)"""
+        event_owned, assignee_exists = self._staged_checks(staging, user_id)
+        rows = db.execute(
+            select(staging.c.row_number, event_owned, assignee_exists)
+            .where(~and_(event_owned, assignee_exists))
+            .order_by(staging.c.row_number)
+        )
+        return [tuple(row) for row in rows]
+    
+    def merge_staged(self, db: Session, *, staging: StagingTable, user_id: int) -> int:
+        """Insert the mergeable staged tasks, in row order, with one INSERT ... SELECT"""
+        event_owned, assignee_exists = self._staged_checks(staging, user_id)
+        rows = (
+            select(*staging.values())
+            .where(event_owned, assignee_exists)
+            .order_by(staging.c.row_number)
+        )
+        result = db.execute(
+            insert(Task).from_select(staging.names, rows).returning(Task.event_id, Task.status)
+        )
+        counts = Counter((row.event_id, row.status) for row in result)
+        crud_task_count.add(db, [(event_id, task_status, count) for (event_id, task_status), count in counts.items()])
+        return sum(counts.values())
+    
+    def delete_by_event_in_chunks(self, db: Session, *, event_id: int, chunk_size: int) -> int:
+        """
+        Delete all tasks of an event, `chunk_size` rows per transaction.
+    
+        Keeps each lock short for events with very many tasks.
+        """
+        total = 0
+        while True:
+            chunk = select(Task.id).where(Task.event_id == event_id).limit(chunk_size)
+            rows = db.execute(
+                delete(Task)
+                .where(Task.id.in_(chunk.scalar_subquery()))
+                .returning(Task.event_id, Task.status)
+                .execution_options(synchronize_session=False)
+            ).all()
+            crud_task_count.add(db, [(row.event_id, row.status, -1) for row in rows])
+            db.commit()
+            total += len(rows)
+            if len(rows) < chunk_size:
+                return total
+    
+    def delete_scoped(self, db: Session, *, id: Any, scope: ColumnElement[bool]) -> bool:
+        """Delete the task if it is in scope, uncounting it in the same transaction"""
+        row = db.execute(
+            delete(Task)
+            .where(Task.id == id, scope)
+            .returning(Task.event_id, Task.status)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if row is not None:
+            crud_task_count.add(db, [(row.event_id, row.status, -1)])
+        db.commit()
+        return row is not None
+    
+    def delete(self, db: Session, *, id: int) -> Optional[Row]:
+        """Delete a task; returns its counted columns, or None if it did not exist"""
+        row = db.execute(
+            delete(Task).where(Task.id == id).returning(Task.event_id, Task.status)
+        ).first()
+        if row is not None:
+            crud_task_count.add(db, [(row.event_id, row.status, -1)])
+        db.commit()
+        return row
+    
+    def _update_where(
+        self, db: Session, where: ColumnElement[bool], data: Dict[str, Any]
+    ) -> Optional[Task]:
+        """UPDATE ... RETURNING one task, moving it between counters if its status changes"""
+        previous = self._lock_counted(db, where, data)
+        if previous is not None:
+            where = and_(where, Task.id.in_(list(previous)))
+        task = self._update_returning(db, where, data)
+        if task is not None and previous:
+            crud_task_count.add(db, count_moves(previous, [task]))
+        db.commit()
+        return task
+    
+    def _lock_counted(
+        self, db: Session, where: ColumnElement[bool], data: Dict[str, Any]
+    ) -> Optional[Dict[int, Tuple[int, TaskStatus]]]:
+        """
+        Lock the tasks about to change a counted column and return their
+        current (event_id, status); None if the update does not touch one.
+    
+        The caller restricts its UPDATE to the returned ids: a row that
+        starts matching `where` after this SELECT (READ COMMITTED) would be
+        updated with no previous counters to move it from.
+        """
+        if not data.keys() & COUNTED_COLUMNS:
+            return None
+        rows = db.execute(select(Task.id, Task.event_id, Task.status).where(where).with_for_update())
+        return {row.id: (row.event_id, row.status) for row in rows}
+
+
+class AsyncCRUDTask(AsyncCRUDBase[Task, TaskCreate, TaskUpdate]):
+    """Async CRUD operations for Task; writes keep the per-event counters current"""
+    
+    cursor_columns = ("created_at", "id")
+    
+    async def create(self, db: AsyncSession, *, obj_in: Union[TaskCreate, Dict[str, Any]]) -> Task:
+        """Create a task and count it in one transaction"""
+        data = column_data(self.columns, obj_in)
+        task = (await db.scalars(insert(Task).values(**data).returning(Task))).one()
+        await async_crud_task_count.add(db, [(task.event_id, task.status, 1)])
+        await db.commit()
+        return task
+    
+    async def create_multi(self, db: AsyncSession, *, objs_in: List[TaskCreate]) -> List[Row]:
+        """CRUDTask.create_multi for the async stack"""
+        stmt = insert(Task).returning(*Task.__table__.columns, sort_by_parameter_order=True)
+        rows = (await db.execute(stmt, [obj_in.model_dump() for obj_in in objs_in])).all()
+        await async_crud_task_count.add(db, [(row.event_id, row.status, 1) for row in rows])
+        await db.commit()
+        return rows
+    
+    async def update_multi_for_user(
+        self, db: AsyncSession, *, ids: List[int], values: Dict[str, Any], user_id: int
+    ) -> List[Row]:
+        """CRUDTask.update_multi_for_user for the async stack"""
+        where = and_(Task.id.in_(ids), crud_task.modifiable_by(user_id))
+        previous = await self._lock_counted(db, where, values)
+        if previous is not None:
+            where = and_(where, Task.id.in_(list(previous)))
+        stmt = (
+            update(Task)
+            .where(where)
+            .values(**values)
+            .returning(*Task.__table__.columns)
+            .execution_options(synchronize_session=False)
+        )
+        rows = (await db.execute(stmt)).all()
+        if previous:
+            await async_crud_task_count.add(db, count_moves(previous, rows))
+        await db.commit()
+        return rows
+    
+    async def delete_scoped(self, db: AsyncSession, *, id: Any, scope: ColumnElement[bool]) -> bool:
+        """Delete the task if it is in scope, uncounting it in the same transaction"""
+        row = (await db.execute(
+            delete(Task)
+            .where(Task.id == id, scope)
+            .returning(Task.event_id, Task.status)
+            .execution_options(synchronize_session=False)
+        )).first()
+        if row is not None:
+            await async_crud_task_count.add(db, [(row.event_id, row.status, -1)])
+        await db.commit()
+        return row is not None
+    
+    async def delete(self, db: AsyncSession, *, id: int) -> Optional[Row]:
+        """Delete a task; returns its counted columns, or None if it did not exist"""
+        row = (await db.execute(
+            delete(Task)
+            .where(Task.id == id)
+            .returning(Task.event_id, Task.status)
+            .execution_options(synchronize_session=False)
+        )).first()
+        if row is not None:
+            await async_crud_task_count.add(db, [(row.event_id, row.status, -1)])
+        await db.commit()
+        return row
+    
+    async def get_open_workloads(self, db: AsyncSession, *, user_ids: Sequence[int]) -> Dict[int, int]:
+        """CRUDTask.get_open_workloads for the async stack"""
+        return {user_id: workload for user_id, workload in await db.execute(workloads_stmt(user_ids))}
+    
+    async def lock_unassigned(self, db: AsyncSession, *, event_id: int) -> List[Row]:
+        """CRUDTask.lock_unassigned for the async stack"""
+        return (await db.execute(unassigned_stmt(event_id))).all()
+    
+    async def assign_multi(self, db: AsyncSession, *, assignments: Dict[int, int]) -> List[Row]:
+        """CRUDTask.assign_multi for the async stack"""
+        if not assignments:
+            return []
+        rows = (await db.execute(assign_stmt(db.get_bind().dialect.name, assignments))).all()
+        await db.commit()
+        return rows
+    
+    async def get_existing_ids(self, db: AsyncSession, *, ids: List[int]) -> List[int]:
+        """Return which of the given task ids exist"""
+        return list(await db.scalars(select(Task.id).where(Task.id.in_(ids))))
+    
+    async def get_by_event(
+        self, db: AsyncSession, event_id: int, *, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[Task], Optional[str]]:
+        """Get a page of tasks for an event"""
+        stmt = select(Task).where(Task.event_id == event_id)
+        return await self.get_page(db, stmt, cursor=cursor, limit=limit)
+    
+    async def get_by_user(
+        self, db: AsyncSession, user_id: int, *, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[Task], Optional[str]]:
+        """Get a page of tasks assigned to a user"""
+        stmt = select(Task).where(Task.assigned_to_id == user_id)
+        return await self.get_page(db, stmt, cursor=cursor, limit=limit)
     
-    def get_by_event(self, db: Session, event_id: int) -> List[Task]:
-        """Get all tasks for an event"""
-        return db.query(Task).filter(Task.event_id == event_id).all()
+    async def _update_where(
+        self, db: AsyncSession, where: ColumnElement[bool], data: Dict[str, Any]
+    ) -> Optional[Task]:
+        """UPDATE ... RETURNING one task, moving it between counters if its status changes"""
+        previous = await self._lock_counted(db, where, data)
+        if previous is not None:
+            where = and_(where, Task.id.in_(list(previous)))
+        task = await self._update_returning(db, where, data)
+        if task is not None and previous:
+            await async_crud_task_count.add(db, count_moves(previous, [task]))
+        await db.commit()
+        return task
     
-    def get_by_user(self, db: Session, user_id: int) -> List[Task]:
-        """Get all tasks assigned to a user"""
-        return db.query(Task).filter(Task.assigned_to_id == user_id).all()
+    async def _lock_counted(
+        self, db: AsyncSession, where: ColumnElement[bool], data: Dict[str, Any]
+    ) -> Optional[Dict[int, Tuple[int, TaskStatus]]]:
+        """CRUDTask._lock_counted for the async stack"""
+        if not data.keys() & COUNTED_COLUMNS:
+            return None
+        rows = await db.execute(select(Task.id, Task.event_id, Task.status).where(where).with_for_update())
+        return {row.id: (row.event_id, row.status) for row in rows}
 
 
 crud_task = CRUDTask(Task)
+async_crud_task = AsyncCRUDTask(Task)
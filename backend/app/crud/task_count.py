@@ -0,0 +1,116 @@
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Insert, Select, delete, func, insert, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.task import Task, TaskStatus
+from app.models.task_count import EventTaskCount
+
+# (event_id, status, change in the number of tasks)
+CountDelta = Tuple[int, TaskStatus, int]
+
+
+def upsert_counts(dialect: str, deltas: Iterable[CountDelta]) -> Optional[Insert]:
+    """
+    One INSERT ... ON CONFLICT DO UPDATE adding the summed deltas, or None.
+    
+    Rows are sorted by key, so concurrent writers lock counter rows in the
+    same order and cannot deadlock on each other.
+    """
+    totals: Counter = Counter()
+    for event_id, task_status, delta in deltas:
+        totals[event_id, task_status] += delta
+    rows = [
+        {"event_id": event_id, "status": task_status, "count": count}
+        for (event_id, task_status), count in sorted(totals.items())
+        if count
+    ]
+    if not rows:
+        return None
+    
+    dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    stmt = dialect_insert(EventTaskCount).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[EventTaskCount.event_id, EventTaskCount.status],
+        set_={"count": EventTaskCount.count + stmt.excluded.count}
+    )
+
+
+class CRUDEventTaskCount:
+    """
+    Per-event task counters by status.
+    
+    Callers apply deltas inside the transaction that writes the tasks, so
+    counters and tasks commit (or roll back) together.
+    """
+    
+    def add(self, db: Session, deltas: Iterable[CountDelta]) -> None:
+        """Apply count deltas; does not commit"""
+        stmt = upsert_counts(db.get_bind().dialect.name, deltas)
+        if stmt is not None:
+            db.execute(stmt)
+    
+    def get_by_events(self, db: Session, *, event_ids: Iterable[int]) -> Dict[int, Dict[str, int]]:
+        """Map event_id -> {status: task count} (all statuses) from the counters"""
+        event_ids = list(event_ids)
+        counts = {event_id: {task_status.value: 0 for task_status in TaskStatus} for event_id in event_ids}
+        if event_ids:
+            rows = db.execute(
+                select(EventTaskCount.event_id, EventTaskCount.status, EventTaskCount.count)
+                .where(EventTaskCount.event_id.in_(event_ids))
+            )
+            for event_id, task_status, count in rows:
+                counts[event_id][task_status.value] = count
+        return counts
+    
+    def find_drift(self, db: Session) -> List[Tuple[int, TaskStatus, int, int]]:
+        """Counters that disagree with the tasks table: (event_id, status, stored, actual)"""
+        stored = {
+            (event_id, task_status): count
+            for event_id, task_status, count in db.execute(
+                select(EventTaskCount.event_id, EventTaskCount.status, EventTaskCount.count)
+            )
+        }
+        actual = {
+            (event_id, task_status): count
+            for event_id, task_status, count in db.execute(self._actual_counts())
+        }
+        drift = []
+        for event_id, task_status in sorted(stored.keys() | actual.keys()):
+            key = (event_id, task_status)
+            if stored.get(key, 0) != actual.get(key, 0):
+                drift.append((event_id, task_status, stored.get(key, 0), actual.get(key, 0)))
+        return drift
+    
+    def rebuild(self, db: Session) -> int:
+        """Recompute every counter from the tasks table; returns the number of counter rows"""
+        if db.get_bind().dialect.name == "postgresql":
+            # Block task writes until commit so none is lost between the two statements
+            db.execute(text("LOCK TABLE tasks IN SHARE MODE"))
+        db.execute(delete(EventTaskCount))
+        result = db.execute(
+            insert(EventTaskCount).from_select(["event_id", "status", "count"], self._actual_counts())
+        )
+        db.commit()
+        return result.rowcount
+    
+    def _actual_counts(self) -> Select:
+        """(event_id, status, count) computed from the tasks table"""
+        return select(Task.event_id, Task.status, func.count()).group_by(Task.event_id, Task.status)
+
+
+class AsyncCRUDEventTaskCount:
+    """Async per-event task counters"""
+    
+    async def add(self, db: AsyncSession, deltas: Iterable[CountDelta]) -> None:
+        """Apply count deltas; does not commit"""
+        stmt = upsert_counts(db.get_bind().dialect.name, deltas)
+        if stmt is not None:
+            await db.execute(stmt)
+
+
+crud_task_count = CRUDEventTaskCount()
+async_crud_task_count = AsyncCRUDEventTaskCount()
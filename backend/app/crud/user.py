@@ -1,10 +1,14 @@
-from typing import Optional
+from typing import Any, Dict, Iterable, List, Optional, Union
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.crud.base import CRUDBase
+from app.crud.base import CRUDBase, AsyncCRUDBase
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import hash_password
+from app.core.security import needs_rehash
+from app.core.hashing import password_hasher
+from app.core.cache import user_cache
 
 
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
@@ -14,28 +18,101 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         """Get user by email"""
         return db.query(User).filter(User.email == email).first()
     
+    def get_existing_ids(self, db: Session, *, ids: Iterable[int]) -> List[int]:
+        """Return which of the given user ids exist"""
+        return list(db.scalars(select(User.id).where(User.id.in_(list(ids)))))
+    
     def create(self, db: Session, *, obj_in: UserCreate) -> User:
         """Create user with hashed password"""
-        db_obj = User(
-            email=obj_in.email,
-            full_name=obj_in.full_name,
-            hashed_password=hash_password(obj_in.password),
-        )
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+        return super().create(db, obj_in={
+            "email": obj_in.email,
+            "full_name": obj_in.full_name,
+            "hashed_password": password_hasher.hash(obj_in.password),
+        })
     
     def authenticate(self, db: Session, email: str, password: str) -> Optional[User]:
-        """Authenticate user"""
-        from app.core.security import verify_password
-        
+        """Authenticate user, rehashing the password if BCRYPT_ROUNDS changed"""
         user = self.get_by_email(db, email=email)
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        if not password_hasher.verify(password, user.hashed_password):
             return None
+        if needs_rehash(user.hashed_password):
+            user.hashed_password = password_hasher.hash(password)
+            db.add(user)
+            db.commit()
+        return user
+    
+    def update(
+        self, db: Session, *, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]]
+    ) -> Optional[User]:
+        """Update user and drop its cached auth state; None if the user no longer exists"""
+        user = super().update(db, db_obj=db_obj, obj_in=obj_in)
+        user_cache.invalidate(db_obj.id)
+        return user
+    
+    def deactivate(self, db: Session, *, db_obj: User) -> Optional[User]:
+        """Deactivate user; cached auth state is dropped by update()"""
+        return self.update(db, db_obj=db_obj, obj_in={"is_active": False})
+    
+    def delete(self, db: Session, *, id: int) -> User:
+        """Delete user and drop its cached auth state"""
+        user = super().delete(db, id=id)
+        user_cache.invalidate(id)
+        return user
+
+
+class AsyncCRUDUser(AsyncCRUDBase[User, UserCreate, UserUpdate]):
+    """Async CRUD operations for User"""
+    
+    async def get_by_email(self, db: AsyncSession, email: str) -> Optional[User]:
+        """Get user by email"""
+        result = await db.execute(select(User).where(User.email == email))
+        return result.scalars().first()
+    
+    async def get_existing_ids(self, db: AsyncSession, *, ids: Iterable[int]) -> List[int]:
+        """Return which of the given user ids exist"""
+        return list(await db.scalars(select(User.id).where(User.id.in_(list(ids)))))
+    
+    async def create(self, db: AsyncSession, *, obj_in: UserCreate) -> User:
+        """Create user with hashed password"""
+        return await super().create(db, obj_in={
+            "email": obj_in.email,
+            "full_name": obj_in.full_name,
+            "hashed_password": await password_hasher.hash_async(obj_in.password),
+        })
+    
+    async def authenticate(self, db: AsyncSession, email: str, password: str) -> Optional[User]:
+        """Authenticate user, rehashing the password if BCRYPT_ROUNDS changed"""
+        user = await self.get_by_email(db, email=email)
+        if not user:
+            return None
+        if not await password_hasher.verify_async(password, user.hashed_password):
+            return None
+        if needs_rehash(user.hashed_password):
+            user.hashed_password = await password_hasher.hash_async(password)
+            db.add(user)
+            await db.commit()
+        return user
+    
+    async def update(
+        self, db: AsyncSession, *, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]]
+    ) -> Optional[User]:
+        """Update user and drop its cached auth state; None if the user no longer exists"""
+        user = await super().update(db, db_obj=db_obj, obj_in=obj_in)
+        user_cache.invalidate(db_obj.id)
+        return user
+    
+    async def deactivate(self, db: AsyncSession, *, db_obj: User) -> Optional[User]:
+        """Deactivate user; cached auth state is dropped by update()"""
+        return await self.update(db, db_obj=db_obj, obj_in={"is_active": False})
+    
+    async def delete(self, db: AsyncSession, *, id: int) -> User:
+        """Delete user and drop its cached auth state"""
+        user = await super().delete(db, id=id)
+        user_cache.invalidate(id)
         return user
 
 
 crud_user = CRUDUser(User)
+async_crud_user = AsyncCRUDUser(User)
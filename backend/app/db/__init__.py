@@ -1,4 +1,19 @@
 from app.db.base import Base
-from app.db.session import SessionLocal, engine, get_db
+from app.db.session import (
+    SessionLocal,
+    engine,
+    get_db,
+    AsyncSessionLocal,
+    async_engine,
+    get_async_db,
+)
 
-__all__ = ["Base", "SessionLocal", "engine", "get_db"]
+__all__ = [
+    "Base",
+    "SessionLocal",
+    "engine",
+    "get_db",
+    "AsyncSessionLocal",
+    "async_engine",
+    "get_async_db",
+]
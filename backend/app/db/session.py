@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
@@ -15,6 +16,19 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# Async stack, used when settings.USE_ASYNC_DB is enabled
+async_engine = create_async_engine(
+    settings.async_database_url,
+    pool_pre_ping=True,
+    echo=settings.DEBUG
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    autoflush=False,
+    expire_on_commit=False,
+    bind=async_engine
+)
+
 
 def get_db():
     """Database session dependency for FastAPI endpoints"""
@@ -23,3 +37,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Async database session dependency for FastAPI endpoints"""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,15 +1,36 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import APIRouter, FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 
+from app.core.broker import change_broker
 from app.core.config import settings
-from app.api import auth, events, tasks
+from app.core.hashing import PasswordHasherBusy, password_hasher
+from app.core.cache import user_cache
+from app.core.metrics import MetricsMiddleware, metrics
+from app.core.response_cache import event_cache
+from app.core.security import token_cache
+from app.db.session import async_engine, engine
+from app.api import auth, availability, dashboard, events, stream, tasks
+from app.api import async_auth, async_events, async_tasks
+from app.api import metrics as metrics_api
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await change_broker.start()
+    yield
+    await change_broker.stop()
+    password_hasher.shutdown()
 
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     debug=settings.DEBUG,
+    lifespan=lifespan,
 )
 
 # CORS
@@ -21,10 +42,66 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Include routers
-app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
-app.include_router(events.router, prefix="/api/events", tags=["events"])
-app.include_router(tasks.router, prefix="/api/tasks", tags=["tasks"])
+# Prometheus metrics (METRICS_ENABLED); outermost, so CORS is timed too
+if metrics is not None:
+    metrics.instrument_engine(engine, "sync")
+    metrics.instrument_engine(async_engine.sync_engine, "async")
+    metrics.watch_cache(event_cache, "event")
+    metrics.watch_cache(user_cache, "user")
+    metrics.watch_cache(token_cache, "token")
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+
+
+@app.exception_handler(PasswordHasherBusy)
+def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    """Shed login/register load fast when the hashing pool is saturated"""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Too many authentication requests, try again shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
+def sync_only(sync_router: APIRouter, async_router: APIRouter) -> APIRouter:
+    """Routes of a sync router with no async counterpart (same path and method)"""
+    served = {
+        (route.path, method) for route in async_router.routes for method in getattr(route, "methods", ())
+    }
+    router = APIRouter()
+    router.routes.extend(
+        route for route in sync_router.routes
+        if not all((route.path, method) in served for method in getattr(route, "methods", ()))
+    )
+    return router
+
+
+# Include routers (USE_ASYNC_DB switches to the async engine/session stack).
+# In async mode, endpoints without an async version are still served, from
+# the sync router on the sync session; they go first, so that literal paths
+# ("/search") are not taken by the async routes' path parameters ("/{event_id}").
+if settings.USE_ASYNC_DB:
+    app.include_router(sync_only(events.router, async_events.router), prefix="/api/events", tags=["events"])
+    app.include_router(sync_only(tasks.router, async_tasks.router), prefix="/api/tasks", tags=["tasks"])
+    app.include_router(async_auth.router, prefix="/api/auth", tags=["auth"])
+    app.include_router(async_events.router, prefix="/api/events", tags=["events"])
+    app.include_router(async_tasks.router, prefix="/api/tasks", tags=["tasks"])
+else:
+    app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
+    app.include_router(events.router, prefix="/api/events", tags=["events"])
+    app.include_router(tasks.router, prefix="/api/tasks", tags=["tasks"])
+
+# Read-only aggregate on the sync session, served in both modes
+app.include_router(dashboard.router, prefix="/api/dashboard", tags=["dashboard"])
+
+# Free-slot search on the sync session, served in both modes
+app.include_router(availability.router, prefix="/api/availability", tags=["availability"])
+
+# Change notifications (server-sent events), served in both modes
+app.include_router(stream.router, prefix="/api/stream", tags=["stream"])
+
+# Scrape endpoint, before the static mount at "/" would shadow it
+if metrics is not None:
+    app.include_router(metrics_api.router, tags=["metrics"])
 
 # Mount frontend static files
 frontend_path = Path(__file__).parent.parent.parent / "frontend"
@@ -1,11 +1,41 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum
-from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Computed, Integer, String, Text, DateTime, ForeignKey, Enum, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import deferred, relationship
+from sqlalchemy.sql import func, text
+from sqlalchemy.types import TypeDecorator
 import enum
 
 from app.db.base import Base
 
 
+# Text search configuration of Event.search_vector and of search queries
+SEARCH_CONFIG = "english"
+
+
+class SearchVector(TypeDecorator):
+    """tsvector on PostgreSQL; plain TEXT on other dialects (SQLite), where search is unavailable"""
+    
+    impl = Text
+    cache_ok = True
+    
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(TSVECTOR())
+        return dialect.type_descriptor(Text())
+
+
+class PostgresComputed(Computed):
+    """Generated column on PostgreSQL; elsewhere (SQLite) the column is left empty"""
+    
+    inherit_cache = True
+
+
+@compiles(PostgresComputed, "sqlite")
+def _compile_postgres_computed_sqlite(element: PostgresComputed, compiler, **kw) -> str:
+    return ""
+
+
 class EventStatus(str, enum.Enum):
     """Event status enum"""
     PLANNING = "planning"
@@ -18,6 +48,20 @@ class EventStatus(str, enum.Enum):
 class Event(Base):
     """Event model"""
     __tablename__ = "events"
+    __table_args__ = (
+        # Keyset pagination order of the events listing
+        Index("ix_events_start_time_id", "start_time", "id"),
+        # Events of an organizer, in time order
+        Index("ix_events_organizer_id_start_time", "organizer_id", "start_time"),
+        # Full-text search
+        Index("ix_events_search_vector", "search_vector", postgresql_using="gin").ddl_if(dialect="postgresql"),
+        # Recurring series by first start (range queries over series)
+        Index(
+            "ix_events_series_start_time",
+            "start_time",
+            postgresql_where=text("recurrence_rule IS NOT NULL")
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
@@ -27,6 +71,12 @@ class Event(Base):
     end_time = Column(DateTime(timezone=True), nullable=False)
     status = Column(Enum(EventStatus), default=EventStatus.PLANNING, nullable=False)
     
+    # Recurring series: an RRULE (app.core.recurrence) repeating the
+    # start_time/end_time occurrence; occurrences are expanded at query time.
+    # recurrence_end is the end of the last occurrence, NULL if open-ended.
+    recurrence_rule = Column(String(500))
+    recurrence_end = Column(DateTime(timezone=True))
+    
     # Foreign key to user (organizer)
     organizer_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
@@ -34,6 +84,29 @@ class Event(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    # Search document (title > description > location), generated by PostgreSQL.
+    # Deferred: only search queries read it.
+    search_vector = deferred(Column(
+        SearchVector,
+        PostgresComputed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(location, '')), 'C')",
+            persisted=True
+        )
+    ))
+    
     # Relationships
     organizer = relationship("User", back_populates="organized_events")
-    tasks = relationship("Task", back_populates="event", cascade="all, delete-orphan")
+    # Tasks are removed by the ON DELETE CASCADE foreign key, not loaded by the ORM
+    tasks = relationship(
+        "Task", back_populates="event", cascade="all, delete-orphan", passive_deletes=True
+    )
+
+
+# Calendar range queries: tstzrange(start_time, end_time) && tstzrange(from, to)
+Index(
+    "ix_events_time_range",
+    func.tstzrange(Event.start_time, Event.end_time),
+    postgresql_using="gist"
+).ddl_if(dialect="postgresql")
@@ -0,0 +1,27 @@
+from sqlalchemy import Boolean, Column, DateTime, Enum, ForeignKey, Integer, String, Text
+
+from app.db.base import Base
+from app.models.event import EventStatus
+
+
+class EventException(Base):
+    """
+    Override of one occurrence of a recurring event.
+    
+    The occurrence is identified by its original start. It is either
+    cancelled or has some fields replaced; NULL fields keep the series
+    values. A moved occurrence has both start_time and end_time set. Rows
+    go away with the event through the ON DELETE CASCADE foreign key.
+    """
+    __tablename__ = "event_exceptions"
+    
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), primary_key=True)
+    occurrence_start = Column(DateTime(timezone=True), primary_key=True)
+    cancelled = Column(Boolean, default=False, nullable=False)
+    
+    title = Column(String(200))
+    description = Column(Text)
+    location = Column(String(300))
+    start_time = Column(DateTime(timezone=True))
+    end_time = Column(DateTime(timezone=True))
+    status = Column(Enum(EventStatus))
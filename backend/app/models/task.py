@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -25,6 +25,14 @@ class TaskPriority(str, enum.Enum):
 class Task(Base):
     """Task model"""
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Keyset pagination order of the per-event and per-user listings
+        Index("ix_tasks_event_id_created_at_id", "event_id", "created_at", "id"),
+        Index("ix_tasks_assigned_to_id_created_at_id", "assigned_to_id", "created_at", "id"),
+        # Per-event status breakdowns and per-user open work by due date
+        Index("ix_tasks_event_id_status", "event_id", "status"),
+        Index("ix_tasks_assigned_to_id_status_due_date", "assigned_to_id", "status", "due_date"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
@@ -34,7 +42,7 @@ class Task(Base):
     due_date = Column(DateTime(timezone=True))
     
     # Foreign keys
-    event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
     assigned_to_id = Column(Integer, ForeignKey("users.id"))
     
     # Timestamps
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, ForeignKey, Enum
+
+from app.db.base import Base
+from app.models.task import TaskStatus
+
+
+class EventTaskCount(Base):
+    """
+    Number of tasks of an event in one status.
+    
+    Denormalized from tasks: every task write adjusts it in the same
+    transaction (see crud_task_count), and the rows go away with the event
+    through the ON DELETE CASCADE foreign key.
+    """
+    __tablename__ = "event_task_counts"
+    
+    event_id = Column(Integer, ForeignKey("events.id", ondelete="CASCADE"), primary_key=True)
+    status = Column(Enum(TaskStatus), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
@@ -1,5 +1,5 @@
 # Schemas module
-from app.schemas.user import UserBase, UserCreate, UserUpdate, UserResponse
+from app.schemas.user import UserBase, UserCreate, UserUpdate, UserResponse, UserAuth
 from app.schemas.token import Token, TokenData
 
-__all__ = ["UserBase", "UserCreate", "UserUpdate", "UserResponse", "Token", "TokenData"]
+__all__ = ["UserBase", "UserCreate", "UserUpdate", "UserResponse", "UserAuth", "Token", "TokenData"]
@@ -0,0 +1,41 @@
+from pydantic import BaseModel, Field, field_validator
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from app.core.config import settings
+
+
+class AvailabilityRequest(BaseModel):
+    """Users who must all be free, the window to search and the slot length"""
+    user_ids: List[int] = Field(..., min_length=1, max_length=settings.AVAILABILITY_MAX_USERS)
+    start: datetime
+    end: datetime
+    min_duration_minutes: int = Field(30, ge=1, le=24 * 60)
+
+    @field_validator('start', 'end')
+    @classmethod
+    def to_utc(cls, v: datetime) -> datetime:
+        """Treat naive timestamps as UTC"""
+        return v if v.tzinfo else v.replace(tzinfo=timezone.utc)
+
+    @field_validator('end')
+    @classmethod
+    def validate_window(cls, v: datetime, info) -> datetime:
+        """Validate that end is after start and the window is not too long"""
+        if 'start' in info.data:
+            if v <= info.data['start']:
+                raise ValueError('End must be after start')
+            if v - info.data['start'] > timedelta(days=settings.AVAILABILITY_MAX_DAYS):
+                raise ValueError(f'Window must not exceed {settings.AVAILABILITY_MAX_DAYS} days')
+        return v
+
+
+class FreeSlot(BaseModel):
+    """Interval [start, end) in which all requested users are free"""
+    start: datetime
+    end: datetime
+
+
+class AvailabilityResponse(BaseModel):
+    """Free slots of the requested window, in order"""
+    slots: List[FreeSlot]
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import Dict, List
+
+from app.models.task import TaskStatus
+from app.schemas.event import EventResponse
+from app.schemas.task import TaskResponse
+from app.schemas.user import UserResponse
+
+
+class EventSummary(EventResponse):
+    """Event with its task counts by status"""
+    task_counts: Dict[TaskStatus, int]
+
+
+class DashboardResponse(BaseModel):
+    """Everything the dashboard page shows, in one response"""
+    user: UserResponse
+    events: List[EventSummary]
+    tasks: List[TaskResponse]
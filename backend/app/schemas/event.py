@@ -1,10 +1,17 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, computed_field, field_validator, model_validator
 from datetime import datetime
+from functools import cached_property
 from typing import Optional
 
+from app.core.recurrence import normalize_rule, series_end
 from app.models.event import EventStatus
 
 
+def _check_rule(v: Optional[str]) -> Optional[str]:
+    """Validate a recurrence rule and return its stored form"""
+    return normalize_rule(v) if v is not None else None
+
+
 class EventBase(BaseModel):
     """Base event schema"""
     title: str = Field(..., min_length=1, max_length=200)
@@ -13,6 +20,14 @@ class EventBase(BaseModel):
     start_time: datetime
     end_time: datetime
     status: EventStatus = EventStatus.PLANNING
+    # RRULE repeating start_time/end_time, e.g. "FREQ=WEEKLY;BYDAY=TU;COUNT=10"
+    recurrence_rule: Optional[str] = Field(None, max_length=500)
+
+    @field_validator('recurrence_rule')
+    @classmethod
+    def validate_recurrence_rule(cls, v: Optional[str]) -> Optional[str]:
+        """Validate the recurrence rule"""
+        return _check_rule(v)
 
     @field_validator('end_time')
     @classmethod
@@ -25,7 +40,20 @@ class EventBase(BaseModel):
 
 class EventCreate(EventBase):
     """Schema for creating event"""
-    pass
+
+    @computed_field
+    @cached_property
+    def recurrence_end(self) -> Optional[datetime]:
+        """End of the last occurrence of a series (None if one-off or open-ended)"""
+        if self.recurrence_rule is None:
+            return None
+        return series_end(self.recurrence_rule, self.start_time, self.end_time)
+
+    @model_validator(mode='after')
+    def validate_series(self) -> 'EventCreate':
+        """Validate that a bounded series has occurrences, and not too many"""
+        self.recurrence_end
+        return self
 
 
 class EventUpdate(BaseModel):
@@ -36,6 +64,14 @@ class EventUpdate(BaseModel):
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
     status: Optional[EventStatus] = None
+    # null turns a series into a one-off event
+    recurrence_rule: Optional[str] = Field(None, max_length=500)
+
+    @field_validator('recurrence_rule')
+    @classmethod
+    def validate_recurrence_rule(cls, v: Optional[str]) -> Optional[str]:
+        """Validate the recurrence rule"""
+        return _check_rule(v)
 
 
 class EventResponse(EventBase):
@@ -47,3 +83,38 @@ class EventResponse(EventBase):
     
     class Config:
         from_attributes = True
+
+
+class EventOccurrence(EventResponse):
+    """Event, or one occurrence of a recurring event, in a listing"""
+    # Original start of the occurrence (key of its exception); None for
+    # one-off events and for series listed without a from/to window
+    occurrence_start: Optional[datetime] = None
+
+
+class OccurrenceUpdate(BaseModel):
+    """Schema for overriding one occurrence of a recurring event"""
+    title: Optional[str] = Field(None, min_length=1, max_length=200)
+    description: Optional[str] = None
+    location: Optional[str] = Field(None, max_length=300)
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+    status: Optional[EventStatus] = None
+
+
+class EventExceptionResponse(OccurrenceUpdate):
+    """Schema for an occurrence override"""
+    event_id: int
+    occurrence_start: datetime
+    cancelled: bool
+    
+    class Config:
+        from_attributes = True
+
+
+class EventSearchHit(EventResponse):
+    """Event matching a search, with its rank and highlighted matches"""
+    rank: float
+    # HTML-escaped text with matches wrapped in <mark></mark>
+    title_headline: str
+    description_headline: Optional[str] = None
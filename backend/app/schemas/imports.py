@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class ImportRowError(BaseModel):
+    """Errors of one rejected input row (1-based)"""
+    row: int
+    errors: List[str]
+
+
+class ImportReport(BaseModel):
+    """Outcome of a bulk import"""
+    imported: int = 0
+    failed: int = 0
+    errors: List[ImportRowError] = []
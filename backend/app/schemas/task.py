@@ -1,7 +1,8 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 
+from app.core.config import settings
 from app.models.task import TaskStatus, TaskPriority
 
 
@@ -39,3 +40,33 @@ class TaskResponse(TaskBase):
     
     class Config:
         from_attributes = True
+
+
+class TaskBulkUpdate(BaseModel):
+    """Schema for applying one partial update to many tasks"""
+    ids: List[int] = Field(..., min_length=1, max_length=1000)
+    changes: TaskUpdate
+
+
+class TaskBulkUpdateResponse(BaseModel):
+    """Per-id outcome of a bulk task update"""
+    updated: List[TaskResponse]
+    forbidden: List[int]
+    not_found: List[int]
+
+
+class TaskAutoAssign(BaseModel):
+    """Candidate users to spread an event's unassigned tasks across"""
+    user_ids: List[int] = Field(..., min_length=1, max_length=settings.AUTO_ASSIGN_MAX_USERS)
+
+
+class TaskAssignment(BaseModel):
+    """One task given to a candidate"""
+    task_id: int
+    assigned_to_id: int
+
+
+class TaskAutoAssignResponse(BaseModel):
+    """Assignments made, and each candidate's weighted open workload afterwards"""
+    assignments: List[TaskAssignment]
+    workload: Dict[int, int]
@@ -14,6 +14,11 @@ class UserUpdate(BaseModel):
     full_name: Optional[str] = None
     password: Optional[str] = None
 
+class UserAuth(BaseModel):
+    id: int
+    is_active: bool
+    is_superuser: bool
+
 class UserResponse(UserBase):
     id: int
     created_at: datetime
@@ -1,7 +1,8 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
-from app.crud.user import crud_user
+from app.crud.user import crud_user, async_crud_user
 from app.schemas.user import UserCreate
 from app.schemas.token import Token
 from app.core.security import create_access_token, create_refresh_token
@@ -54,5 +55,45 @@ class AuthService:
         )
 
 
-# Singleton instance
+class AsyncAuthService:
+    """Authentication business logic (async stack)"""
+    
+    async def register_user(self, db: AsyncSession, user_data: UserCreate) -> User:
+        """Register a new user"""
+        # Check if user already exists
+        existing_user = await async_crud_user.get_by_email(db, email=user_data.email)
+        if existing_user:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already registered"
+            )
+        
+        return await async_crud_user.create(db, obj_in=user_data)
+    
+    async def login_user(self, db: AsyncSession, email: str, password: str) -> Token:
+        """Authenticate user and return tokens"""
+        user = await async_crud_user.authenticate(db, email=email, password=password)
+        
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Incorrect email or password",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        
+        if not user.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Inactive user"
+            )
+        
+        return Token(
+            access_token=create_access_token(user.id),
+            refresh_token=create_refresh_token(user.id),
+            token_type="bearer"
+        )
+
+
+# Singleton instances
 auth_service = AuthService()
+async_auth_service = AsyncAuthService()
@@ -0,0 +1,51 @@
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+from typing import Iterable, List, Tuple
+
+from app.crud.event import crud_event
+from app.schemas.availability import AvailabilityRequest, AvailabilityResponse, FreeSlot
+
+
+def free_slots(
+    busy: Iterable[Tuple[datetime, datetime]],
+    start: datetime,
+    end: datetime,
+    min_duration: timedelta
+) -> List[Tuple[datetime, datetime]]:
+    """
+    Gaps of at least min_duration in [start, end) not covered by any busy
+    interval. busy must be sorted by start; intervals may overlap or extend
+    past the window. A single sweep: `free_from` is the end of the busy time
+    merged so far, and every interval starting after it closes a gap.
+    """
+    slots = []
+    free_from = start
+    for busy_start, busy_end in busy:
+        if busy_start - free_from >= min_duration:
+            slots.append((free_from, busy_start))
+        free_from = max(free_from, busy_end)
+        if free_from >= end:
+            return slots
+    if end - free_from >= min_duration:
+        slots.append((free_from, end))
+    return slots
+
+
+class AvailabilityService:
+    """Free-slot search across users' events"""
+    
+    def find_free_slots(self, db: Session, request: AvailabilityRequest) -> AvailabilityResponse:
+        """Slots of the request window in which all requested users are free"""
+        busy = crud_event.get_busy_intervals(
+            db, user_ids=request.user_ids, start=request.start, end=request.end
+        )
+        slots = free_slots(
+            busy,
+            request.start,
+            request.end,
+            timedelta(minutes=request.min_duration_minutes)
+        )
+        return AvailabilityResponse(slots=[FreeSlot(start=start, end=end) for start, end in slots])
+
+
+availability_service = AvailabilityService()
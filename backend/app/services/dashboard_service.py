@@ -0,0 +1,38 @@
+from sqlalchemy.orm import Session
+
+from app.core.serialization import dump_json
+from app.crud.event import crud_event
+from app.crud.task import crud_task
+from app.crud.task_count import crud_task_count
+from app.models.user import User
+from app.schemas.user import UserResponse
+from app.services.event_service import EVENT_FIELDS
+from app.services.task_service import TASK_FIELDS
+
+
+class DashboardService:
+    """Dashboard aggregation"""
+    
+    def get_dashboard_json(self, db: Session, user: User, limit: int = 100) -> bytes:
+        """
+        The user, their events with task counts by status, and their assigned
+        tasks as DashboardResponse JSON.
+    
+        Counts are read from the per-event counters kept by the task writes,
+        one indexed lookup per listed event whatever its number of tasks.
+        """
+        events, _ = crud_event.get_rows(db, EVENT_FIELDS, crud_event.involving(user.id), limit=limit)
+        counts = crud_task_count.get_by_events(db, event_ids=[event.id for event in events])
+        tasks, _ = crud_task.get_by_user(db, user_id=user.id, names=TASK_FIELDS, limit=limit)
+    
+        return dump_json({
+            "user": UserResponse.model_validate(user).model_dump(),
+            "events": [
+                {**dict(zip(EVENT_FIELDS, event)), "task_counts": counts[event.id]}
+                for event in events
+            ],
+            "tasks": [dict(zip(TASK_FIELDS, task)) for task in tasks],
+        })
+
+
+dashboard_service = DashboardService()
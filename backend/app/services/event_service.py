@@ -1,10 +1,137 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
-from typing import List
+import html
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from app.crud.event import crud_event
-from app.schemas.event import EventCreate, EventUpdate
+from app.crud.event import HEADLINE_START, HEADLINE_STOP, crud_event, async_crud_event
+from app.crud.task import crud_task
+from app.core.broker import change_broker
+from app.core.config import settings
+from app.core.recurrence import is_occurrence, series_end, utc
+from app.core.response_cache import event_cache
+from app.core.serialization import ExportFormat, dump_csv, dump_page, dump_rows, response_fields
+from app.db.session import SessionLocal
+from app.schemas.event import (
+    EventCreate,
+    EventOccurrence,
+    EventResponse,
+    EventSearchHit,
+    EventUpdate,
+    OccurrenceUpdate,
+)
+from app.schemas.pagination import Page
 from app.models.event import Event
+from app.models.event_exception import EventException
+
+EventPage = Page[EventResponse]
+EVENT_FIELDS = response_fields(EventResponse)
+SEARCH_FIELDS = response_fields(EventSearchHit)
+OCCURRENCE_FIELDS = response_fields(EventOccurrence)
+
+# Update fields that change when a series' occurrences fall
+SERIES_UPDATE_FIELDS = frozenset({"start_time", "end_time", "recurrence_rule"})
+
+
+def check_time_window(start: Optional[datetime], end: Optional[datetime]) -> None:
+    """400 unless start is before end (naive values are taken as UTC)"""
+    if start is None or end is None:
+        return
+    if utc(end) <= utc(start):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="End time must be after start time"
+        )
+
+
+def update_data(event_data: EventUpdate, stored: Optional[Any]) -> Dict[str, Any]:
+    """
+    Column values of an event update.
+    
+    `stored` holds the current start_time, end_time and recurrence_rule
+    (None if the event was not loaded or does not exist): times given alone
+    are checked against them, and a changed series gets its recurrence_end
+    recomputed.
+    """
+    data = event_data.model_dump(exclude_unset=True)
+    if stored is None:
+        check_time_window(event_data.start_time, event_data.end_time)
+        return data
+    start_time = data.get("start_time") or stored.start_time
+    end_time = data.get("end_time") or stored.end_time
+    check_time_window(start_time, end_time)
+    if data.keys() & SERIES_UPDATE_FIELDS:
+        rule = data["recurrence_rule"] if "recurrence_rule" in data else stored.recurrence_rule
+        try:
+            data["recurrence_end"] = series_end(rule, start_time, end_time) if rule else None
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc)
+            )
+    return data
+
+
+def moves_occurrences(data: Dict[str, Any], stored: Optional[Any]) -> bool:
+    """Whether an update of a series invalidates its occurrence exceptions"""
+    return bool(stored is not None and stored.recurrence_rule and data.keys() & {"start_time", "recurrence_rule"})
+
+
+def highlight(headline: Optional[str]) -> Optional[str]:
+    """HTML-escape a search headline and turn its match markers into <mark> tags"""
+    if headline is None:
+        return None
+    return html.escape(headline).replace(HEADLINE_START, "<mark>").replace(HEADLINE_STOP, "</mark>")
+
+
+def search_page(rows: List[Any], next_cursor: Optional[str]) -> bytes:
+    """Page[EventSearchHit] JSON of crud_event.search rows, headlines highlighted"""
+    hits = [
+        (*row[:-2], highlight(row.title_headline), highlight(row.description_headline))
+        for row in rows
+    ]
+    return dump_page(SEARCH_FIELDS, hits, next_cursor)
+
+
+# event_cache keys, shared by the sync and async services so either one's
+# writes invalidate what the other cached
+
+def event_key(event_id: int) -> str:
+    """Key of one serialized EventResponse"""
+    return f"event:{event_id}"
+
+
+def events_page_key(cursor: Optional[str], limit: int, filters: Dict[str, Any]) -> str:
+    """Key of one listing page, under the current "events" generation"""
+    generation = event_cache.generation("events")
+    where = "&".join(f"{name}={value}" for name, value in sorted(filters.items()) if value is not None)
+    return f"events:{generation}:page:{cursor or ''}:{limit}:{where}"
+
+
+def events_version_key() -> str:
+    """Key of the (count, last change) of all events, under the current generation"""
+    return f"events:{event_cache.generation('events')}:version"
+
+
+def dump_version(count: int, last_changed: Optional[datetime]) -> bytes:
+    """Cached form of a (count, last change) version"""
+    return f"{count}|{last_changed.isoformat() if last_changed else ''}".encode()
+
+
+def load_version(value: bytes) -> Tuple[int, Optional[datetime]]:
+    """Inverse of dump_version"""
+    count, _, last_changed = value.decode().partition("|")
+    return int(count), datetime.fromisoformat(last_changed) if last_changed else None
+
+
+def invalidate_events(event_id: Optional[int] = None) -> None:
+    """Drop cached reads affected by a committed event write"""
+    if event_id is not None:
+        event_cache.invalidate(event_key(event_id))
+    # Any change can move an event across pages, so all listings go
+    event_cache.bump("events")
 
 
 class EventService:
@@ -23,58 +150,356 @@ class EventService:
         event_dict = event_data.model_dump()
         event_dict["organizer_id"] = organizer_id
         event = crud_event.create(db, obj_in=event_dict)
+        invalidate_events()
+        change_broker.publish("event", "created", id=event.id, event_id=event.id, user_id=organizer_id)
+        return event
+    
+    def get_event(self, db: Session, event_id: int) -> EventResponse:
+        """Get event by ID (read-through event_cache)"""
+        def load() -> bytes:
+            event = crud_event.get(db, id=event_id)
+            if not event:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Event not found"
+                )
+            return EventResponse.model_validate(event).model_dump_json().encode()
+        
+        return EventResponse.model_validate_json(event_cache.get_or_load(event_key(event_id), load))
+    
+    def get_all_events_json(
+        self, db: Session, cursor: Optional[str] = None, limit: int = 100, **filters: Any
+    ) -> bytes:
+        """
+        Get a page of events matching crud_event.filters(**filters) as
+        Page[EventOccurrence] JSON (read-through event_cache).
+        
+        With both overlap_from and overlap_to, recurring events are expanded
+        into their occurrences in that window; otherwise a series is one row.
+        """
+        window_from, window_to = filters.get("overlap_from"), filters.get("overlap_to")
+        check_time_window(window_from, window_to)
+        
+        def load() -> bytes:
+            try:
+                if window_from is not None and window_to is not None:
+                    where = crud_event.filters(**{**filters, "overlap_from": None, "overlap_to": None})
+                    rows, next_cursor = crud_event.get_occurrence_rows(
+                        db, EVENT_FIELDS, *where, start=window_from, end=window_to, cursor=cursor, limit=limit
+                    )
+                else:
+                    events, next_cursor = crud_event.get_rows(
+                        db, EVENT_FIELDS, *crud_event.filters(**filters), cursor=cursor, limit=limit
+                    )
+                    rows = [(*event, None) for event in events]
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor"
+                )
+            return dump_page(OCCURRENCE_FIELDS, rows, next_cursor)
+        
+        return event_cache.get_or_load(events_page_key(cursor, limit, filters), load)
+    
+    def search_events_json(
+        self, db: Session, query: str, cursor: Optional[str] = None, limit: int = 20
+    ) -> bytes:
+        """Full-text search over title, description and location as Page[EventSearchHit] JSON"""
+        try:
+            rows, next_cursor = crud_event.search(db, query, names=EVENT_FIELDS, cursor=cursor, limit=limit)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        return search_page(rows, next_cursor)
+    
+    def get_events_version(self, db: Session) -> Tuple[int, Optional[datetime]]:
+        """Count and latest change time of all events (read-through event_cache)"""
+        def load() -> bytes:
+            return dump_version(*crud_event.get_version(db))
+        
+        return load_version(event_cache.get_or_load(events_version_key(), load))
+    
+    def export_events(self, fmt: ExportFormat, **filters: Any) -> Iterator[bytes]:
+        """
+        Stream all events matching crud_event.filters(**filters) as NDJSON or CSV.
+        
+        Uses its own session, since the response outlives the request, and a
+        server-side cursor, so memory stays flat however many rows match.
+        """
+        db = SessionLocal()
+        try:
+            if fmt == "csv":
+                yield dump_csv(EVENT_FIELDS, [], header=True)
+            for rows in crud_event.stream_rows(
+                db, EVENT_FIELDS, *crud_event.filters(**filters), chunk_size=settings.EXPORT_CHUNK_SIZE
+            ):
+                yield dump_rows(fmt, EVENT_FIELDS, rows)
+        finally:
+            db.close()
+    
+    def update_event(self, db: Session, event_id: int, event_data: EventUpdate, user_id: int) -> Event:
+        """Update an event"""
+        # Times and rule are validated against the stored values they combine with
+        stored = None
+        if event_data.model_fields_set & SERIES_UPDATE_FIELDS:
+            stored = db.execute(
+                select(Event.start_time, Event.end_time, Event.recurrence_rule)
+                .where(Event.id == event_id, crud_event.organized_by(user_id))
+            ).first()
+            if stored is None:
+                raise self._not_found_or_forbidden(db, event_id, "Only organizer can update event")
+        data = update_data(event_data, stored)
+        
+        # Organizer check is part of the UPDATE itself; moved occurrences lose
+        # their overrides in the same transaction
+        moves = moves_occurrences(data, stored)
+        write = crud_event.update_series if moves else crud_event.update_scoped
+        event = write(db, id=event_id, obj_in=data, scope=crud_event.organized_by(user_id))
+        if not event:
+            raise self._not_found_or_forbidden(db, event_id, "Only organizer can update event")
+        invalidate_events(event_id)
+        change_broker.publish("event", "updated", id=event_id, event_id=event_id)
         return event
     
-    def get_event(self, db: Session, event_id: int) -> Event:
-        """Get event by ID"""
-        event = crud_event.get(db, id=event_id)
+    def override_occurrence(
+        self,
+        db: Session,
+        event_id: int,
+        occurrence_start: datetime,
+        occurrence_data: OccurrenceUpdate,
+        user_id: int
+    ) -> EventException:
+        """
+        Replace the fields of one occurrence of a recurring event (fields left
+        null keep the series values; all null restores the occurrence).
+        """
+        occurrence_start = utc(occurrence_start)
+        event = self._get_series(db, event_id, occurrence_start, user_id)
+        data = occurrence_data.model_dump()
+        # A moved occurrence keeps both times, so range queries find it
+        if data["start_time"] is not None or data["end_time"] is not None:
+            duration = event.end_time - event.start_time
+            data["start_time"] = data["start_time"] or occurrence_start
+            data["end_time"] = data["end_time"] or data["start_time"] + duration
+            check_time_window(data["start_time"], data["end_time"])
+        exception = crud_event.save_exception(
+            db, event_id=event_id, occurrence_start=occurrence_start, data={**data, "cancelled": False}
+        )
+        invalidate_events(event_id)
+        change_broker.publish("event", "updated", id=event_id, event_id=event_id)
+        return exception
+    
+    def cancel_occurrence(self, db: Session, event_id: int, occurrence_start: datetime, user_id: int) -> None:
+        """Cancel one occurrence of a recurring event"""
+        occurrence_start = utc(occurrence_start)
+        self._get_series(db, event_id, occurrence_start, user_id)
+        data = {name: None for name in OccurrenceUpdate.model_fields}
+        crud_event.save_exception(
+            db, event_id=event_id, occurrence_start=occurrence_start, data={**data, "cancelled": True}
+        )
+        invalidate_events(event_id)
+        change_broker.publish("event", "updated", id=event_id, event_id=event_id)
+    
+    def _get_series(self, db: Session, event_id: int, occurrence_start: datetime, user_id: int) -> Event:
+        """Get a recurring event organized by the user and check it has the occurrence"""
+        event = crud_event.get_scoped(db, id=event_id, scope=crud_event.organized_by(user_id))
         if not event:
+            raise self._not_found_or_forbidden(db, event_id, "Only organizer can change occurrences")
+        if not event.recurrence_rule:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Event is not recurring"
+            )
+        if not is_occurrence(event.recurrence_rule, event.start_time, occurrence_start):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail="Event not found"
+                detail="Occurrence not found"
             )
         return event
     
-    def get_all_events(self, db: Session, skip: int = 0, limit: int = 100) -> List[Event]:
-        """Get all events"""
-        return crud_event.get_multi(db, skip=skip, limit=limit)
+    def delete_event(self, db: Session, event_id: int, user_id: int) -> None:
+        """Delete an event"""
+        # One DELETE: organizer check in WHERE, ON DELETE CASCADE removes related tasks
+        if not crud_event.delete_scoped(db, id=event_id, scope=crud_event.organized_by(user_id)):
+            raise self._not_found_or_forbidden(db, event_id, "Only organizer can delete event")
+        invalidate_events(event_id)
+        change_broker.publish("event", "deleted", id=event_id, event_id=event_id)
     
-    def update_event(self, db: Session, event_id: int, event_data: EventUpdate, user_id: int) -> Event:
-        """Update an event"""
-        event = self.get_event(db, event_id)
+    def get_event_for_delete(self, db: Session, event_id: int, user_id: int) -> Event:
+        """Get event and ensure user is its organizer"""
+        event = crud_event.get_scoped(db, id=event_id, scope=crud_event.organized_by(user_id))
+        if not event:
+            raise self._not_found_or_forbidden(db, event_id, "Only organizer can delete event")
+        return event
+    
+    def _not_found_or_forbidden(self, db: Session, event_id: int, detail: str) -> HTTPException:
+        """Error for a scoped query that matched no event"""
+        if not crud_event.exists(db, id=event_id):
+            return HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Event not found"
+            )
+        return HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=detail
+        )
+    
+    def purge_event(self, event_id: int) -> None:
+        """
+        Delete an event and its tasks in chunks, for use as a background task.
         
-        # Check if user is organizer
-        if event.organizer_id != user_id:
+        Runs in its own session, after the request session is closed.
+        """
+        db = SessionLocal()
+        try:
+            crud_task.delete_by_event_in_chunks(
+                db, event_id=event_id, chunk_size=settings.EVENT_DELETE_CHUNK_SIZE
+            )
+            db.execute(delete(Event).where(Event.id == event_id))
+            db.commit()
+        finally:
+            db.close()
+        invalidate_events(event_id)
+        change_broker.publish("event", "deleted", id=event_id, event_id=event_id)
+
+
+class AsyncEventService:
+    """Event business logic (async stack)"""
+    
+    async def create_event(self, db: AsyncSession, event_data: EventCreate, organizer_id: int) -> Event:
+        """Create a new event"""
+        # Validate dates
+        if event_data.end_time <= event_data.start_time:
             raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only organizer can update event"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="End time must be after start time"
             )
         
-        # Validate dates if provided
-        if event_data.start_time and event_data.end_time:
-            if event_data.end_time <= event_data.start_time:
+        # Create event with organizer
+        event_dict = event_data.model_dump()
+        event_dict["organizer_id"] = organizer_id
+        event = await async_crud_event.create(db, obj_in=event_dict)
+        invalidate_events()
+        await change_broker.publish_async(
+            "event", "created", id=event.id, event_id=event.id, user_id=organizer_id
+        )
+        return event
+    
+    async def get_event(self, db: AsyncSession, event_id: int) -> EventResponse:
+        """Get event by ID (read-through event_cache)"""
+        async def load() -> bytes:
+            event = await async_crud_event.get(db, id=event_id)
+            if not event:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Event not found"
+                )
+            return EventResponse.model_validate(event).model_dump_json().encode()
+        
+        return EventResponse.model_validate_json(await event_cache.get_or_load_async(event_key(event_id), load))
+    
+    async def get_all_events_json(
+        self, db: AsyncSession, cursor: Optional[str] = None, limit: int = 100, **filters: Any
+    ) -> bytes:
+        """EventService.get_all_events_json for the async stack (same event_cache keys)"""
+        window_from, window_to = filters.get("overlap_from"), filters.get("overlap_to")
+        check_time_window(window_from, window_to)
+        
+        async def load() -> bytes:
+            try:
+                if window_from is not None and window_to is not None:
+                    where = crud_event.filters(**{**filters, "overlap_from": None, "overlap_to": None})
+                    rows, next_cursor = await async_crud_event.get_occurrence_rows(
+                        db, EVENT_FIELDS, *where, start=window_from, end=window_to, cursor=cursor, limit=limit
+                    )
+                else:
+                    events, next_cursor = await async_crud_event.get_rows(
+                        db, EVENT_FIELDS, *crud_event.filters(**filters), cursor=cursor, limit=limit
+                    )
+                    rows = [(*event, None) for event in events]
+            except ValueError:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="End time must be after start time"
+                    detail="Invalid cursor"
                 )
+            return dump_page(OCCURRENCE_FIELDS, rows, next_cursor)
         
-        event = crud_event.update(db, db_obj=event, obj_in=event_data)
-        return event
+        return await event_cache.get_or_load_async(events_page_key(cursor, limit, filters), load)
     
-    def delete_event(self, db: Session, event_id: int, user_id: int) -> None:
-        """Delete an event"""
-        event = self.get_event(db, event_id)
-        
-        # Check if user is organizer
-        if event.organizer_id != user_id:
+    async def search_events_json(
+        self, db: AsyncSession, query: str, cursor: Optional[str] = None, limit: int = 20
+    ) -> bytes:
+        """Full-text search over title, description and location as Page[EventSearchHit] JSON"""
+        try:
+            rows, next_cursor = await async_crud_event.search(
+                db, query, names=EVENT_FIELDS, cursor=cursor, limit=limit
+            )
+        except ValueError:
             raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only organizer can delete event"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
             )
+        return search_page(rows, next_cursor)
+    
+    async def get_events_version(self, db: AsyncSession) -> Tuple[int, Optional[datetime]]:
+        """Count and latest change time of all events (read-through event_cache)"""
+        async def load() -> bytes:
+            return dump_version(*await async_crud_event.get_version(db))
         
-        # Delete the event - cascade will delete related tasks
-        db.delete(event)
-        db.commit()
-
+        return load_version(await event_cache.get_or_load_async(events_version_key(), load))
+    
+    async def update_event(self, db: AsyncSession, event_id: int, event_data: EventUpdate, user_id: int) -> Event:
+        """Update an event"""
+        # Times and rule are validated against the stored values they combine with
+        stored = None
+        if event_data.model_fields_set & SERIES_UPDATE_FIELDS:
+            stored = (await db.execute(
+                select(Event.start_time, Event.end_time, Event.recurrence_rule)
+                .where(Event.id == event_id, crud_event.organized_by(user_id))
+            )).first()
+            if stored is None:
+                raise await self._not_found_or_forbidden(db, event_id, "Only organizer can update event")
+        data = update_data(event_data, stored)
+        
+        # Organizer check is part of the UPDATE itself; moved occurrences lose
+        # their overrides in the same transaction
+        moves = moves_occurrences(data, stored)
+        write = async_crud_event.update_series if moves else async_crud_event.update_scoped
+        event = await write(db, id=event_id, obj_in=data, scope=crud_event.organized_by(user_id))
+        if not event:
+            raise await self._not_found_or_forbidden(db, event_id, "Only organizer can update event")
+        invalidate_events(event_id)
+        await change_broker.publish_async("event", "updated", id=event_id, event_id=event_id)
+        return event
+    
+    async def delete_event(self, db: AsyncSession, event_id: int, user_id: int) -> None:
+        """Delete an event"""
+        # One DELETE: organizer check in WHERE, ON DELETE CASCADE removes related tasks
+        if not await async_crud_event.delete_scoped(db, id=event_id, scope=crud_event.organized_by(user_id)):
+            raise await self._not_found_or_forbidden(db, event_id, "Only organizer can delete event")
+        invalidate_events(event_id)
+        await change_broker.publish_async("event", "deleted", id=event_id, event_id=event_id)
+    
+    async def get_event_for_delete(self, db: AsyncSession, event_id: int, user_id: int) -> Event:
+        """Get event and ensure user is its organizer"""
+        event = await async_crud_event.get_scoped(db, id=event_id, scope=crud_event.organized_by(user_id))
+        if not event:
+            raise await self._not_found_or_forbidden(db, event_id, "Only organizer can delete event")
+        return event
+    
+    async def _not_found_or_forbidden(self, db: AsyncSession, event_id: int, detail: str) -> HTTPException:
+        """Error for a scoped query that matched no event"""
+        if not await async_crud_event.exists(db, id=event_id):
+            return HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Event not found"
+            )
+        return HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=detail
+        )
 
 event_service = EventService()
+async_event_service = AsyncEventService()
@@ -0,0 +1,139 @@
+import csv
+import io
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Type
+
+import orjson
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.orm import Session
+
+from app.core.broker import change_broker
+from app.core.config import settings
+from app.core.response_cache import event_cache
+from app.core.serialization import ExportFormat
+from app.crud.event import crud_event
+from app.crud.staging import StagingTable
+from app.crud.task import crud_task
+from app.models.event import Event
+from app.models.task import Task
+from app.schemas.event import EventCreate
+from app.schemas.imports import ImportReport, ImportRowError
+from app.schemas.task import TaskCreate
+
+
+class UnreadableInputError(ValueError):
+    """The import input cannot be decoded or parsed as a whole (not a per-row error)"""
+
+
+class ImportService:
+    """
+    Bulk import of events and tasks from CSV or NDJSON.
+    
+    Rows are parsed and validated one at a time with the create schemas,
+    loaded in IMPORT_BATCH_SIZE batches into a temporary staging table
+    (COPY on PostgreSQL) and merged with one INSERT ... SELECT. The whole
+    import is one transaction; rejected rows are reported, not fatal.
+    Input that cannot be read at all raises UnreadableInputError.
+    """
+    
+    def import_events(
+        self, db: Session, source: BinaryIO, fmt: ExportFormat, organizer_id: int
+    ) -> ImportReport:
+        """Import events organized by organizer_id"""
+        report = ImportReport()
+        # recurrence_end is computed by EventCreate from the series fields
+        staging = StagingTable(Event, [*EventCreate.model_fields, *EventCreate.model_computed_fields])
+        staging.create(db)
+        self._stage(db, staging, EventCreate, source, fmt, report)
+        report.imported = crud_event.merge_staged(db, staging=staging, organizer_id=organizer_id)
+        staging.drop(db)
+        db.commit()
+        event_cache.bump("events")
+        if report.imported:
+            change_broker.publish("event", "imported")
+        return report
+    
+    def import_tasks(
+        self, db: Session, source: BinaryIO, fmt: ExportFormat, user_id: int
+    ) -> ImportReport:
+        """Import tasks into events organized by user_id"""
+        report = ImportReport()
+        staging = StagingTable(Task, TaskCreate.model_fields)
+        staging.create(db)
+        self._stage(db, staging, TaskCreate, source, fmt, report)
+    
+        # Ownership and assignee checks run once, in SQL, over the staged rows
+        for row, event_owned, assignee_exists in crud_task.get_staged_rejections(
+            db, staging=staging, user_id=user_id
+        ):
+            errors = []
+            if not event_owned:
+                errors.append("event_id: Event not found or not organized by you")
+            if not assignee_exists:
+                errors.append("assigned_to_id: User not found")
+            self._reject(report, row, errors)
+    
+        report.imported = crud_task.merge_staged(db, staging=staging, user_id=user_id)
+        staging.drop(db)
+        db.commit()
+        report.errors.sort(key=lambda error: error.row)
+        if report.imported:
+            change_broker.publish("task", "imported")
+        return report
+    
+    def _stage(
+        self,
+        db: Session,
+        staging: StagingTable,
+        schema: Type[BaseModel],
+        source: BinaryIO,
+        fmt: ExportFormat,
+        report: ImportReport
+    ) -> None:
+        """Validate input rows and COPY the valid ones into the staging table"""
+        batch: List[Tuple[int, Dict[str, Any]]] = []
+        for row, data in self._records(source, fmt):
+            if data is None:
+                self._reject(report, row, ["Invalid JSON"])
+                continue
+            try:
+                batch.append((row, schema.model_validate(data).model_dump()))
+            except ValidationError as exc:
+                self._reject(report, row, [
+                    f"{'.'.join(map(str, error['loc']))}: {error['msg']}" if error["loc"] else error["msg"]
+                    for error in exc.errors()
+                ])
+                continue
+            if len(batch) >= settings.IMPORT_BATCH_SIZE:
+                staging.copy(db, batch)
+                batch = []
+        staging.copy(db, batch)
+    
+    def _records(self, source: BinaryIO, fmt: ExportFormat) -> Iterator[Tuple[int, Optional[Dict[str, Any]]]]:
+        """Yield (row number, raw fields) per input row; None for unparsable NDJSON"""
+        text = io.TextIOWrapper(source, encoding="utf-8", newline="")
+        try:
+            if fmt == "csv":
+                for row, record in enumerate(csv.DictReader(text), start=1):
+                    # Empty cells mean "not given", so schema defaults apply
+                    yield row, {key: value for key, value in record.items() if key and value != ""}
+            else:
+                for row, line in enumerate(text, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        yield row, orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        yield row, None
+        except (UnicodeDecodeError, csv.Error) as exc:
+            raise UnreadableInputError(f"Unreadable {fmt} input: {exc}") from exc
+        finally:
+            text.detach()
+    
+    def _reject(self, report: ImportReport, row: int, errors: List[str]) -> None:
+        """Count a rejected row, listing it while the report has room"""
+        report.failed += 1
+        if len(report.errors) < settings.IMPORT_MAX_REPORTED_ERRORS:
+            report.errors.append(ImportRowError(row=row, errors=errors))
+
+
+import_service = ImportService()
@@ -1,12 +1,90 @@
+import heapq
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
-from typing import List
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
-from app.crud.task import crud_task
-from app.crud.event import crud_event
-from app.schemas.task import TaskCreate, TaskUpdate
+from app.crud.task import PRIORITY_WEIGHTS, crud_task, async_crud_task
+from app.crud.event import crud_event, async_crud_event
+from app.crud.user import crud_user, async_crud_user
+from app.core.broker import change_broker
+from app.core.config import settings
+from app.core.serialization import ExportFormat, dump_csv, dump_page, dump_rows, response_fields
+from app.db.session import SessionLocal
+from app.schemas.task import TaskCreate, TaskUpdate, TaskBulkUpdate, TaskResponse, TaskAutoAssign
 from app.models.task import Task
 
+TASK_FIELDS = response_fields(TaskResponse)
+
+
+def unknown_assignees(tasks_data: List[TaskCreate], existing_ids: Sequence[int]) -> Optional[HTTPException]:
+    """400 listing the tasks (by position) assigned to users that do not exist, if any"""
+    existing = set(existing_ids)
+    errors = [
+        {"loc": ["body", index, "assigned_to_id"], "msg": "User not found", "type": "value_error"}
+        for index, task_data in enumerate(tasks_data)
+        if task_data.assigned_to_id is not None and task_data.assigned_to_id not in existing
+    ]
+    if errors:
+        return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=errors)
+    return None
+
+
+def unknown_bulk_assignee() -> HTTPException:
+    """400 for a bulk update assigning the tasks to a user that does not exist"""
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=[{"loc": ["body", "changes", "assigned_to_id"], "msg": "User not found", "type": "value_error"}]
+    )
+
+
+def balance(tasks: Sequence[Row], workload: Dict[int, int]) -> Tuple[Dict[int, int], Dict[int, int]]:
+    """
+    Spread tasks (rows with id, priority, due_date) over the users in
+    `workload` (user id -> weighted open work, in candidate order).
+    
+    Greedy: tasks are taken most urgent first (priority, then due date,
+    undated last) and each goes to the least-loaded user, kept at the top of
+    a min-heap, whose load then grows by the task's priority weight. Ties go
+    to the earlier candidate. O(T log T + T log U) for T tasks and U users.
+    Returns (task id -> user id, user id -> workload afterwards).
+    """
+    def urgency(task: Row) -> tuple:
+        return (-PRIORITY_WEIGHTS[task.priority], task.due_date is None, task.due_date, task.id)
+    
+    heap = [(load, position, user_id) for position, (user_id, load) in enumerate(workload.items())]
+    heapq.heapify(heap)
+    assignments = {}
+    for task in sorted(tasks, key=urgency):
+        load, position, user_id = heap[0]
+        assignments[task.id] = user_id
+        heapq.heapreplace(heap, (load + PRIORITY_WEIGHTS[task.priority], position, user_id))
+    return assignments, {user_id: load for load, _, user_id in sorted(heap, key=lambda entry: entry[1])}
+
+
+def assignment_result(
+    tasks: Sequence[Row], assignments: Dict[int, int], workload: Dict[int, int], rows: Sequence[Row]
+) -> dict:
+    """
+    Auto-assign response from the balanced plan and the rows the UPDATE
+    returned. Tasks assigned concurrently were skipped by the UPDATE, so
+    their weight is taken back off the planned loads.
+    """
+    if len(rows) < len(assignments):
+        assigned = {row.id for row in rows}
+        weights = {task.id: PRIORITY_WEIGHTS[task.priority] for task in tasks}
+        for task_id, candidate in assignments.items():
+            if task_id not in assigned:
+                workload[candidate] -= weights[task_id]
+    
+    return {
+        "assignments": [{"task_id": row.id, "assigned_to_id": row.assigned_to_id} for row in rows],
+        "workload": workload,
+    }
+
 
 class TaskService:
     """Task business logic"""
@@ -28,8 +106,39 @@ class TaskService:
             )
         
         task = crud_task.create(db, obj_in=task_data)
+        change_broker.publish(
+            "task", "created", id=task.id, event_id=task.event_id, user_id=task.assigned_to_id
+        )
         return task
     
+    def create_tasks(self, db: Session, tasks_data: List[TaskCreate], user_id: int) -> List[Row]:
+        """Create many tasks, checking ownership once per distinct event"""
+        event_ids = {task_data.event_id for task_data in tasks_data}
+        organizers = crud_event.get_organizer_ids(db, ids=event_ids)
+        
+        if len(organizers) != len(event_ids):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Event not found"
+            )
+        
+        if any(organizer_id != user_id for organizer_id in organizers.values()):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only event organizer can create tasks"
+            )
+        
+        # One lookup for all assignees, rather than an IntegrityError (500) on the insert
+        assignee_ids = {task_data.assigned_to_id for task_data in tasks_data} - {None}
+        if assignee_ids:
+            error = unknown_assignees(tasks_data, crud_user.get_existing_ids(db, ids=assignee_ids))
+            if error:
+                raise error
+        
+        rows = crud_task.create_multi(db, objs_in=tasks_data)
+        change_broker.publish("task", "created")
+        return rows
+    
     def get_task(self, db: Session, task_id: int) -> Task:
         """Get task by ID"""
         task = crud_task.get(db, id=task_id)
@@ -40,42 +149,345 @@ class TaskService:
             )
         return task
     
-    def get_event_tasks(self, db: Session, event_id: int) -> List[Task]:
-        """Get all tasks for an event"""
-        return crud_task.get_by_event(db, event_id=event_id)
+    def get_event_tasks_json(
+        self, db: Session, event_id: int, cursor: Optional[str] = None, limit: int = 100
+    ) -> bytes:
+        """Get a page of tasks for an event as Page[TaskResponse] JSON"""
+        try:
+            rows, next_cursor = crud_task.get_by_event(
+                db, event_id=event_id, names=TASK_FIELDS, cursor=cursor, limit=limit
+            )
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        return dump_page(TASK_FIELDS, rows, next_cursor)
+    
+    def get_user_tasks_json(
+        self, db: Session, user_id: int, cursor: Optional[str] = None, limit: int = 100
+    ) -> bytes:
+        """Get a page of tasks assigned to a user as Page[TaskResponse] JSON"""
+        try:
+            rows, next_cursor = crud_task.get_by_user(
+                db, user_id=user_id, names=TASK_FIELDS, cursor=cursor, limit=limit
+            )
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        return dump_page(TASK_FIELDS, rows, next_cursor)
+    
+    def get_event_tasks_version(self, db: Session, event_id: int) -> Tuple[int, Optional[datetime]]:
+        """Count and latest change time of an event's tasks"""
+        return crud_task.get_version(db, Task.event_id == event_id)
     
-    def get_user_tasks(self, db: Session, user_id: int) -> List[Task]:
-        """Get all tasks assigned to a user"""
-        return crud_task.get_by_user(db, user_id=user_id)
+    def get_user_tasks_version(self, db: Session, user_id: int) -> Tuple[int, Optional[datetime]]:
+        """Count and latest change time of a user's tasks"""
+        return crud_task.get_version(db, Task.assigned_to_id == user_id)
+    
+    def export_tasks(self, fmt: ExportFormat, **filters: Any) -> Iterator[bytes]:
+        """
+        Stream all tasks matching crud_task.filters(**filters) as NDJSON or CSV.
+        
+        Same as EventService.export_events: own session, server-side cursor.
+        """
+        db = SessionLocal()
+        try:
+            if fmt == "csv":
+                yield dump_csv(TASK_FIELDS, [], header=True)
+            for rows in crud_task.stream_rows(
+                db, TASK_FIELDS, *crud_task.filters(**filters), chunk_size=settings.EXPORT_CHUNK_SIZE
+            ):
+                yield dump_rows(fmt, TASK_FIELDS, rows)
+        finally:
+            db.close()
     
     def update_task(self, db: Session, task_id: int, task_data: TaskUpdate, user_id: int) -> Task:
         """Update a task"""
-        task = self.get_task(db, task_id)
-        event = crud_event.get(db, id=task.event_id)
+        # Organizer/assignee check is part of the UPDATE itself
+        task = crud_task.update_scoped(
+            db, id=task_id, obj_in=task_data, scope=crud_task.modifiable_by(user_id)
+        )
+        if not task:
+            raise self._not_found_or_forbidden(db, task_id, "Only organizer or assignee can update task")
+        change_broker.publish(
+            "task", "updated", id=task.id, event_id=task.event_id, user_id=task.assigned_to_id
+        )
+        return task
+    
+    def update_tasks(self, db: Session, bulk_data: TaskBulkUpdate, user_id: int) -> dict:
+        """Update many tasks in one statement and report the outcome per id"""
+        values = bulk_data.changes.model_dump(exclude_unset=True)
+        if not values:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No fields to update"
+            )
+        
+        assignee_id = values.get("assigned_to_id")
+        if assignee_id is not None and not crud_user.get_existing_ids(db, ids=[assignee_id]):
+            raise unknown_bulk_assignee()
+        
+        ids = list(dict.fromkeys(bulk_data.ids))
+        updated = crud_task.update_multi_for_user(db, ids=ids, values=values, user_id=user_id)
+        if updated:
+            change_broker.publish("task", "updated")
+        
+        # Only look up the rest if something was skipped
+        forbidden: List[int] = []
+        not_found: List[int] = []
+        if len(updated) < len(ids):
+            updated_ids = {row.id for row in updated}
+            skipped = [task_id for task_id in ids if task_id not in updated_ids]
+            existing = set(crud_task.get_existing_ids(db, ids=skipped))
+            forbidden = [task_id for task_id in skipped if task_id in existing]
+            not_found = [task_id for task_id in skipped if task_id not in existing]
+        
+        return {"updated": updated, "forbidden": forbidden, "not_found": not_found}
+    
+    def auto_assign_tasks(self, db: Session, event_id: int, data: TaskAutoAssign, user_id: int) -> dict:
+        """
+        Assign all open, unassigned tasks of an event across the candidates,
+        balancing their open workload (see balance). One aggregate query for
+        the workloads, one locking read of the tasks, one UPDATE.
+        """
+        event = crud_event.get(db, id=event_id)
+        if not event:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Event not found"
+            )
         
-        # Check if user is organizer or assigned to task
-        if event.organizer_id != user_id and task.assigned_to_id != user_id:
+        if event.organizer_id != user_id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only organizer or assignee can update task"
+                detail="Only event organizer can assign tasks"
             )
         
-        task = crud_task.update(db, db_obj=task, obj_in=task_data)
-        return task
+        user_ids = list(dict.fromkeys(data.user_ids))
+        workloads = crud_task.get_open_workloads(db, user_ids=user_ids)
+        unknown = [candidate for candidate in user_ids if candidate not in workloads]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Users not found: {', '.join(map(str, unknown))}"
+            )
+        
+        tasks = crud_task.lock_unassigned(db, event_id=event_id)
+        assignments, workload = balance(tasks, {candidate: workloads[candidate] for candidate in user_ids})
+        rows = crud_task.assign_multi(db, assignments=assignments)
+        for assignee in dict.fromkeys(row.assigned_to_id for row in rows):
+            change_broker.publish("task", "updated", event_id=event_id, user_id=assignee)
+        return assignment_result(tasks, assignments, workload, rows)
     
     def delete_task(self, db: Session, task_id: int, user_id: int) -> None:
         """Delete a task"""
-        task = self.get_task(db, task_id)
-        event = crud_event.get(db, id=task.event_id)
+        # Organizer check is part of the DELETE itself
+        if not crud_task.delete_scoped(db, id=task_id, scope=crud_task.in_events_organized_by(user_id)):
+            raise self._not_found_or_forbidden(db, task_id, "Only event organizer can delete tasks")
+        change_broker.publish("task", "deleted", id=task_id)
+    
+    def _not_found_or_forbidden(self, db: Session, task_id: int, detail: str) -> HTTPException:
+        """Error for a scoped query that matched no task"""
+        if not crud_task.exists(db, id=task_id):
+            return HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Task not found"
+            )
+        return HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=detail
+        )
+
+
+class AsyncTaskService:
+    """Task business logic (async stack)"""
+    
+    async def create_task(self, db: AsyncSession, task_data: TaskCreate, user_id: int) -> Task:
+        """Create a new task"""
+        # Verify event exists and user is organizer
+        event = await async_crud_event.get(db, id=task_data.event_id)
+        if not event:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Event not found"
+            )
         
-        # Check if user is organizer
         if event.organizer_id != user_id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only event organizer can delete tasks"
+                detail="Only event organizer can create tasks"
             )
         
-        crud_task.delete(db, id=task_id)
-
+        task = await async_crud_task.create(db, obj_in=task_data)
+        await change_broker.publish_async(
+            "task", "created", id=task.id, event_id=task.event_id, user_id=task.assigned_to_id
+        )
+        return task
+    
+    async def create_tasks(self, db: AsyncSession, tasks_data: List[TaskCreate], user_id: int) -> List[Row]:
+        """Create many tasks, checking ownership once per distinct event"""
+        event_ids = {task_data.event_id for task_data in tasks_data}
+        organizers = await async_crud_event.get_organizer_ids(db, ids=event_ids)
+        
+        if len(organizers) != len(event_ids):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Event not found"
+            )
+        
+        if any(organizer_id != user_id for organizer_id in organizers.values()):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only event organizer can create tasks"
+            )
+        
+        assignee_ids = {task_data.assigned_to_id for task_data in tasks_data} - {None}
+        if assignee_ids:
+            error = unknown_assignees(tasks_data, await async_crud_user.get_existing_ids(db, ids=assignee_ids))
+            if error:
+                raise error
+        
+        rows = await async_crud_task.create_multi(db, objs_in=tasks_data)
+        await change_broker.publish_async("task", "created")
+        return rows
+    
+    async def update_tasks(self, db: AsyncSession, bulk_data: TaskBulkUpdate, user_id: int) -> dict:
+        """Update many tasks in one statement and report the outcome per id"""
+        values = bulk_data.changes.model_dump(exclude_unset=True)
+        if not values:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No fields to update"
+            )
+        
+        assignee_id = values.get("assigned_to_id")
+        if assignee_id is not None and not await async_crud_user.get_existing_ids(db, ids=[assignee_id]):
+            raise unknown_bulk_assignee()
+        
+        ids = list(dict.fromkeys(bulk_data.ids))
+        updated = await async_crud_task.update_multi_for_user(db, ids=ids, values=values, user_id=user_id)
+        if updated:
+            await change_broker.publish_async("task", "updated")
+        
+        # Only look up the rest if something was skipped
+        forbidden: List[int] = []
+        not_found: List[int] = []
+        if len(updated) < len(ids):
+            updated_ids = {row.id for row in updated}
+            skipped = [task_id for task_id in ids if task_id not in updated_ids]
+            existing = set(await async_crud_task.get_existing_ids(db, ids=skipped))
+            forbidden = [task_id for task_id in skipped if task_id in existing]
+            not_found = [task_id for task_id in skipped if task_id not in existing]
+        
+        return {"updated": updated, "forbidden": forbidden, "not_found": not_found}
+    
+    async def get_task(self, db: AsyncSession, task_id: int) -> Task:
+        """Get task by ID"""
+        task = await async_crud_task.get(db, id=task_id)
+        if not task:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Task not found"
+            )
+        return task
+    
+    async def get_event_tasks(
+        self, db: AsyncSession, event_id: int, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[Task], Optional[str]]:
+        """Get a page of tasks for an event"""
+        try:
+            return await async_crud_task.get_by_event(db, event_id=event_id, cursor=cursor, limit=limit)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+    
+    async def get_user_tasks(
+        self, db: AsyncSession, user_id: int, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[Task], Optional[str]]:
+        """Get a page of tasks assigned to a user"""
+        try:
+            return await async_crud_task.get_by_user(db, user_id=user_id, cursor=cursor, limit=limit)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+    
+    async def get_event_tasks_version(self, db: AsyncSession, event_id: int) -> Tuple[int, Optional[datetime]]:
+        """Count and latest change time of an event's tasks"""
+        return await async_crud_task.get_version(db, Task.event_id == event_id)
+    
+    async def get_user_tasks_version(self, db: AsyncSession, user_id: int) -> Tuple[int, Optional[datetime]]:
+        """Count and latest change time of a user's tasks"""
+        return await async_crud_task.get_version(db, Task.assigned_to_id == user_id)
+    
+    async def update_task(self, db: AsyncSession, task_id: int, task_data: TaskUpdate, user_id: int) -> Task:
+        """Update a task"""
+        # Organizer/assignee check is part of the UPDATE itself
+        task = await async_crud_task.update_scoped(
+            db, id=task_id, obj_in=task_data, scope=crud_task.modifiable_by(user_id)
+        )
+        if not task:
+            raise await self._not_found_or_forbidden(db, task_id, "Only organizer or assignee can update task")
+        await change_broker.publish_async(
+            "task", "updated", id=task.id, event_id=task.event_id, user_id=task.assigned_to_id
+        )
+        return task
+    
+    async def auto_assign_tasks(self, db: AsyncSession, event_id: int, data: TaskAutoAssign, user_id: int) -> dict:
+        """TaskService.auto_assign_tasks for the async stack"""
+        event = await async_crud_event.get(db, id=event_id)
+        if not event:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Event not found"
+            )
+        
+        if event.organizer_id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only event organizer can assign tasks"
+            )
+        
+        user_ids = list(dict.fromkeys(data.user_ids))
+        workloads = await async_crud_task.get_open_workloads(db, user_ids=user_ids)
+        unknown = [candidate for candidate in user_ids if candidate not in workloads]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Users not found: {', '.join(map(str, unknown))}"
+            )
+        
+        tasks = await async_crud_task.lock_unassigned(db, event_id=event_id)
+        assignments, workload = balance(tasks, {candidate: workloads[candidate] for candidate in user_ids})
+        rows = await async_crud_task.assign_multi(db, assignments=assignments)
+        for assignee in dict.fromkeys(row.assigned_to_id for row in rows):
+            await change_broker.publish_async("task", "updated", event_id=event_id, user_id=assignee)
+        return assignment_result(tasks, assignments, workload, rows)
+    
+    async def delete_task(self, db: AsyncSession, task_id: int, user_id: int) -> None:
+        """Delete a task"""
+        # Organizer check is part of the DELETE itself
+        if not await async_crud_task.delete_scoped(db, id=task_id, scope=crud_task.in_events_organized_by(user_id)):
+            raise await self._not_found_or_forbidden(db, task_id, "Only event organizer can delete tasks")
+        await change_broker.publish_async("task", "deleted", id=task_id)
+    
+    async def _not_found_or_forbidden(self, db: AsyncSession, task_id: int, detail: str) -> HTTPException:
+        """Error for a scoped query that matched no task"""
+        if not await async_crud_task.exists(db, id=task_id):
+            return HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Task not found"
+            )
+        return HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=detail
+        )
 
 task_service = TaskService()
+async_task_service = AsyncTaskService()
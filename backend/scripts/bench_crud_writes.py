@@ -0,0 +1,148 @@
+"""
+Benchmark of CRUDBase create/update write paths.
+
+Compares, per write, the previous path (jsonable_encoder over the input,
+session add + flush on commit, then refresh: a SELECT reloading the row)
+with the current one (a single INSERT/UPDATE ... RETURNING, the object
+expunged before commit). Both run the plain CRUDBase methods on events and
+tasks, without the per-event task counters. Every write commits to a
+savepoint of a transaction that is rolled back, so the configured database
+is left unchanged.
+
+Usage (from backend/):
+    python -m scripts.bench_crud_writes [--writes 500]
+"""
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+from itertools import count
+from typing import Any, Callable, Dict, Type
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.crud.base import CRUDBase
+from app.db.session import engine
+from app.models.event import Event
+from app.models.task import Task, TaskStatus
+from app.models.user import User
+from app.schemas.event import EventCreate, EventUpdate
+from app.schemas.task import TaskCreate, TaskUpdate
+
+START = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+
+def seed(db: Session) -> tuple[int, int]:
+    """Insert one user and one event its tasks belong to"""
+    user_id = db.scalar(
+        insert(User)
+        .values(email=f"bench-{time.time_ns()}@example.com", hashed_password="x", full_name="Bench")
+        .returning(User.id)
+    )
+    event_id = db.scalar(
+        insert(Event)
+        .values(title="Bench", start_time=START, end_time=START + timedelta(hours=2), organizer_id=user_id)
+        .returning(Event.id)
+    )
+    db.flush()
+    return user_id, event_id
+
+
+def refresh_create(db: Session, model: Type[Any], obj_in: Dict[str, Any]) -> Any:
+    """Previous create: add, commit, refresh"""
+    db_obj = model(**jsonable_encoder(obj_in))
+    db.add(db_obj)
+    db.commit()
+    db.refresh(db_obj)
+    return db_obj
+
+
+def refresh_update(db: Session, db_obj: Any, obj_in: Dict[str, Any]) -> Any:
+    """Previous update: set attributes, commit, refresh"""
+    obj_data = jsonable_encoder(db_obj)
+    for field in obj_data:
+        if field in obj_in:
+            setattr(db_obj, field, obj_in[field])
+    db.add(db_obj)
+    db.commit()
+    db.refresh(db_obj)
+    return db_obj
+
+
+def measure(fn: Callable[[], Any], writes: int) -> float:
+    """Writes per second"""
+    fn()  # warm up
+    started = time.perf_counter()
+    for _ in range(writes):
+        fn()
+    return writes / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writes", type=int, default=500)
+    args = parser.parse_args()
+
+    crud = {Event: CRUDBase(Event), Task: CRUDBase(Task)}
+    numbers = count()
+
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        db = Session(bind=connection, join_transaction_mode="create_savepoint")
+        try:
+            user_id, event_id = seed(db)
+
+            def new_event() -> Dict[str, Any]:
+                i = next(numbers)
+                event_in = EventCreate(
+                    title=f"Event {i}",
+                    location="Main hall",
+                    start_time=START + timedelta(hours=i),
+                    end_time=START + timedelta(hours=i + 2),
+                )
+                return {**event_in.model_dump(), "organizer_id": user_id}
+
+            def new_task() -> Dict[str, Any]:
+                task_in = TaskCreate(title=f"Task {next(numbers)}", event_id=event_id, assigned_to_id=user_id)
+                return task_in.model_dump()
+
+            def event_changes() -> Dict[str, Any]:
+                return EventUpdate(title=f"Event {next(numbers)}").model_dump(exclude_unset=True)
+
+            def task_changes() -> Dict[str, Any]:
+                task_in = TaskUpdate(title=f"Task {next(numbers)}", status=TaskStatus.IN_PROGRESS)
+                return task_in.model_dump(exclude_unset=True)
+
+            def creates(model: Type[Any], make: Callable[[], Dict[str, Any]]):
+                slow = lambda: refresh_create(db, model, make())
+                fast = lambda: crud[model].create(db, obj_in=make())
+                return slow, fast
+
+            def updates(model: Type[Any], make_new, make_changes):
+                slow_obj = refresh_create(db, model, make_new())
+                fast_obj = crud[model].create(db, obj_in=make_new())
+                slow = lambda: refresh_update(db, slow_obj, make_changes())
+                fast = lambda: crud[model].update(db, db_obj=fast_obj, obj_in=make_changes())
+                return slow, fast
+
+            cases = [
+                ("create event", *creates(Event, new_event)),
+                ("update event", *updates(Event, new_event, event_changes)),
+                ("create task", *creates(Task, new_task)),
+                ("update task", *updates(Task, new_task, task_changes)),
+            ]
+
+            print(f"{args.writes} writes per path, {engine.url.get_backend_name()}")
+            print(f"{'write':<16}{'add+refresh/s':>15}{'RETURNING/s':>13}{'speedup':>9}")
+            for name, slow, fast in cases:
+                slow_rate = measure(slow, args.writes)
+                fast_rate = measure(fast, args.writes)
+                print(f"{name:<16}{slow_rate:>15.0f}{fast_rate:>13.0f}{fast_rate / slow_rate:>8.1f}x")
+        finally:
+            db.close()
+            transaction.rollback()
+
+
+if __name__ == "__main__":
+    main()
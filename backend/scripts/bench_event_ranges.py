@@ -0,0 +1,134 @@
+"""
+Benchmark of month-view queries on GET /api/events/?from=&to= (PostgreSQL).
+
+Seeds `--rows` events (default one million) server-side with
+generate_series over ten years, lasting one hour to a few days, then times,
+per month, the first page of events overlapping it: through the GiST index
+on tstzrange(start_time, end_time) against the plain two-column comparison
+(start_time < to AND end_time > from), which can only use the start_time
+btree. Also prints both plans. Seed rows are written inside a transaction
+that is rolled back, so the configured database is left unchanged.
+
+Usage (from backend/):
+    python -m scripts.bench_event_ranges [--rows 1000000] [--limit 500] [--repeat 20]
+"""
+import argparse
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, List, Tuple
+
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.crud.event import crud_event
+from app.db.session import engine
+from app.models.event import Event
+from app.models.user import User
+from app.services.event_service import EVENT_FIELDS
+
+# Month views timed
+MONTHS = [(2030, 1), (2033, 6), (2036, 11), (2039, 12)]
+
+
+def seed(db: Session, rows: int) -> None:
+    """Insert one user and `rows` events spread evenly over 2030-2039"""
+    user_id = db.scalar(
+        insert(User)
+        .values(email=f"bench-{time.time_ns()}@example.com", hashed_password="x", full_name="Bench")
+        .returning(User.id)
+    )
+    db.execute(
+        text("""
+            INSERT INTO events (title, start_time, end_time, status, organizer_id)
+            SELECT
+                'Event ' || i,
+                start_time,
+                start_time + (1 + (i * 7919) % 72) * interval '1 hour',
+                'PLANNING',
+                :user_id
+            FROM generate_series(1, :rows) AS i,
+                 LATERAL (
+                     SELECT timestamptz '2030-01-01' + (i * (3653.0 / :rows)) * interval '1 day' AS start_time
+                 ) AS slot
+        """),
+        {"user_id": user_id, "rows": rows},
+    )
+    db.execute(text("ANALYZE events"))
+
+
+def month_window(year: int, month: int) -> Tuple[datetime, datetime]:
+    """[first of the month, first of the next month)"""
+    start = datetime(year, month, 1, tzinfo=timezone.utc)
+    end = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=timezone.utc)
+    return start, end
+
+
+def measure(fn: Callable[[], object], repeat: int) -> float:
+    """Mean milliseconds per call"""
+    fn()  # warm up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) * 1000 / repeat
+
+
+def explain(db: Session, stmt: Select) -> List[str]:
+    """Plan lines of a statement"""
+    compiled = stmt.compile(dialect=engine.dialect)
+    return db.connection().exec_driver_sql(f"EXPLAIN {compiled}", compiled.params).scalars().all()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        print("tstzrange needs PostgreSQL", file=sys.stderr)
+        return 1
+
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        db = Session(bind=connection, join_transaction_mode="create_savepoint")
+        try:
+            started = time.perf_counter()
+            seed(db, args.rows)
+            print(f"Seeded {args.rows} events in {time.perf_counter() - started:.1f}s")
+
+            def ranged(start: datetime, end: datetime) -> Callable[[], object]:
+                where = crud_event.filters(overlap_from=start, overlap_to=end)
+                return lambda: crud_event.get_rows(db, EVENT_FIELDS, *where, limit=args.limit)
+
+            def plain(start: datetime, end: datetime) -> Callable[[], object]:
+                where = [Event.start_time < end, Event.end_time > start]
+                return lambda: crud_event.get_rows(db, EVENT_FIELDS, *where, limit=args.limit)
+
+            print(f"up to {args.limit} rows per page, {args.repeat} runs")
+            print(f"{'month':<9}{'matches':>9}{'tstzrange+GiST ms':>19}{'btree ms':>11}{'speedup':>9}")
+            for year, month in MONTHS:
+                start, end = month_window(year, month)
+                matches = db.scalar(
+                    select(func.count()).select_from(Event).where(
+                        *crud_event.filters(overlap_from=start, overlap_to=end)
+                    )
+                )
+                ranged_ms = measure(ranged(start, end), args.repeat)
+                plain_ms = measure(plain(start, end), args.repeat)
+                print(f"{year}-{month:02}  {matches:>9}{ranged_ms:>19.2f}{plain_ms:>11.2f}{plain_ms / ranged_ms:>8.1f}x")
+
+            start, end = month_window(*MONTHS[-1])
+            ids = select(Event.id)
+            print("\n" + "\n".join(explain(db, ids.where(*crud_event.filters(overlap_from=start, overlap_to=end)))))
+            print("\n" + "\n".join(explain(db, ids.where(Event.start_time < end, Event.end_time > start))))
+        finally:
+            db.close()
+            transaction.rollback()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
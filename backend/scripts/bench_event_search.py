@@ -0,0 +1,138 @@
+"""
+Benchmark of GET /api/events/search on a seeded events table (PostgreSQL).
+
+Seeds `--rows` events (default one million) server-side with
+generate_series, then times, per query, the first page of the indexed
+full-text search (tsvector + GIN, ranked, with headlines) against the
+unindexed alternative: ILIKE over title, description and location. Also
+prints the plan of the search query to show the GIN index in use. Seed rows
+are written inside a transaction that is rolled back, so the configured
+database is left unchanged.
+
+Usage (from backend/):
+    python -m scripts.bench_event_search [--rows 1000000] [--limit 20] [--repeat 20]
+"""
+import argparse
+import sys
+import time
+from typing import Callable
+
+from sqlalchemy import insert, or_, select, text
+from sqlalchemy.orm import Session
+
+from app.crud.event import crud_event
+from app.db.session import engine
+from app.models.event import Event
+from app.models.user import User
+from app.services.event_service import EVENT_FIELDS
+
+WORDS = [
+    "jazz", "rock", "classical", "workshop", "conference", "meetup", "launch", "product",
+    "design", "python", "database", "marketing", "charity", "gala", "dinner", "festival",
+    "training", "onboarding", "hackathon", "review", "planning", "retreat", "summit", "panel",
+    "webinar", "concert", "exhibition", "seminar", "networking", "breakfast", "board", "quarterly",
+]
+LOCATIONS = ["Main hall", "Room 101", "Rooftop terrace", "Downtown office", "City library", "Online"]
+
+# (search query, equivalent ILIKE terms: all must match)
+QUERIES = [
+    ("jazz", ["jazz"]),
+    ("jazz workshop", ["jazz", "workshop"]),
+    ('"product launch"', ["product launch"]),
+    ("keynote", ["keynote"]),
+]
+
+
+def seed(db: Session, rows: int) -> None:
+    """Insert one user and `rows` events; 'keynote' appears in one title in 5000"""
+    user_id = db.scalar(
+        insert(User)
+        .values(email=f"bench-{time.time_ns()}@example.com", hashed_password="x", full_name="Bench")
+        .returning(User.id)
+    )
+    words = len(WORDS)
+    db.execute(
+        text(f"""
+            INSERT INTO events (title, description, location, start_time, end_time, status, organizer_id)
+            SELECT
+                w[1 + (i * 7) % {words}] || ' ' || w[1 + (i * 13) % {words}]
+                    || CASE WHEN i % 5000 = 0 THEN ' keynote' ELSE '' END,
+                'Join us for a ' || w[1 + (i * 31) % {words}] || ' ' || w[1 + (i * 17) % {words}]
+                    || ' with ' || w[1 + (i * 11) % {words}] || ' and ' || w[1 + (i * 3) % {words}] || '.',
+                l[1 + i % cardinality(l)],
+                timestamptz '2030-01-01' + i * interval '10 minutes',
+                timestamptz '2030-01-01' + i * interval '10 minutes' + interval '2 hours',
+                'PLANNING',
+                :user_id
+            FROM generate_series(1, :rows) AS i,
+                 (SELECT CAST(:words AS text[]) AS w, CAST(:locations AS text[]) AS l) AS vocabulary
+        """),
+        {"user_id": user_id, "rows": rows, "words": WORDS, "locations": LOCATIONS},
+    )
+    # Move the fresh entries out of the GIN pending list and refresh statistics
+    db.execute(text("SELECT gin_clean_pending_list('ix_events_search_vector')"))
+    db.execute(text("ANALYZE events"))
+
+
+def measure(fn: Callable[[], object], repeat: int) -> float:
+    """Mean milliseconds per call"""
+    fn()  # warm up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) * 1000 / repeat
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        print("Full-text search needs PostgreSQL", file=sys.stderr)
+        return 1
+
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        db = Session(bind=connection, join_transaction_mode="create_savepoint")
+        try:
+            started = time.perf_counter()
+            seed(db, args.rows)
+            print(f"Seeded {args.rows} events in {time.perf_counter() - started:.1f}s")
+
+            def search(query: str) -> Callable[[], object]:
+                return lambda: crud_event.search(db, query, names=EVENT_FIELDS, limit=args.limit)
+
+            def ilike(terms: list) -> Callable[[], object]:
+                conditions = [
+                    or_(Event.title.ilike(f"%{term}%"), Event.description.ilike(f"%{term}%"),
+                        Event.location.ilike(f"%{term}%"))
+                    for term in terms
+                ]
+                stmt = select(*(getattr(Event, name) for name in EVENT_FIELDS)).where(*conditions)
+                return lambda: db.execute(stmt.order_by(Event.start_time, Event.id).limit(args.limit)).all()
+
+            print(f"{args.limit} rows per page, {args.repeat} runs")
+            print(f"{'query':<22}{'matches':>9}{'tsvector+GIN ms':>17}{'ILIKE ms':>11}{'speedup':>9}")
+            for query, terms in QUERIES:
+                matches = db.scalar(text(
+                    "SELECT count(*) FROM events WHERE search_vector @@ websearch_to_tsquery('english', :q)"
+                ), {"q": query})
+                search_ms = measure(search(query), args.repeat)
+                ilike_ms = measure(ilike(terms), args.repeat)
+                print(f"{query:<22}{matches:>9}{search_ms:>17.2f}{ilike_ms:>11.2f}{ilike_ms / search_ms:>8.1f}x")
+
+            plan = db.execute(text(
+                "EXPLAIN SELECT id FROM events WHERE search_vector @@ websearch_to_tsquery('english', 'keynote')"
+            )).scalars().all()
+            print("\n" + "\n".join(plan))
+        finally:
+            db.close()
+            transaction.rollback()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+Benchmark of the list endpoints' serialization paths.
+
+Compares, per 100-row page, the previous path (ORM objects validated into
+Page[...] with from_attributes, then encoded by the stdlib encoder, as
+FastAPI does for a response_model) with the fast path (column rows encoded
+by orjson). Seed rows are written inside a transaction that is rolled back,
+so the configured database is left unchanged.
+
+Usage (from backend/):
+    python -m scripts.bench_list_endpoints [--rows 1000] [--limit 100] [--repeat 200]
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.core.serialization import dump_page
+from app.crud.event import crud_event
+from app.crud.task import crud_task
+from app.db.session import engine
+from app.models.event import Event
+from app.models.task import Task
+from app.models.user import User
+from app.schemas.event import EventResponse
+from app.schemas.pagination import Page
+from app.schemas.task import TaskResponse
+from app.services.event_service import EVENT_FIELDS
+from app.services.task_service import TASK_FIELDS
+
+
+def seed(db: Session, rows: int) -> tuple[int, int]:
+    """Insert one user, `rows` events and `rows` tasks of the first event"""
+    user_id = db.scalar(
+        insert(User)
+        .values(email=f"bench-{time.time_ns()}@example.com", hashed_password="x", full_name="Bench")
+        .returning(User.id)
+    )
+    start = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    event_ids = db.scalars(
+        insert(Event).returning(Event.id, sort_by_parameter_order=True),
+        [
+            {
+                "title": f"Event {i}",
+                "description": "Benchmark event " * 8,
+                "location": "Main hall",
+                "start_time": start + timedelta(hours=i),
+                "end_time": start + timedelta(hours=i + 2),
+                "organizer_id": user_id,
+            }
+            for i in range(rows)
+        ],
+    ).all()
+    db.execute(
+        insert(Task),
+        [
+            {
+                "title": f"Task {i}",
+                "description": "Benchmark task " * 8,
+                "due_date": start + timedelta(days=i % 30),
+                "event_id": event_ids[0],
+                "assigned_to_id": user_id,
+            }
+            for i in range(rows)
+        ],
+    )
+    db.flush()
+    return user_id, event_ids[0]
+
+
+def orm_page_json(schema, items, next_cursor) -> bytes:
+    """Previous path: response_model validation + stdlib JSON encoding"""
+    page = Page[schema].model_validate({"items": items, "next_cursor": next_cursor}, from_attributes=True)
+    return json.dumps(jsonable_encoder(page), ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def measure(fn: Callable[[], bytes], repeat: int) -> float:
+    """Mean milliseconds per call"""
+    fn()  # warm up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) * 1000 / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        db = Session(bind=connection, join_transaction_mode="create_savepoint")
+        try:
+            user_id, event_id = seed(db, args.rows)
+
+            def events_orm() -> bytes:
+                items, next_cursor = crud_event.get_page(db, select(Event), limit=args.limit)
+                db.expunge_all()
+                return orm_page_json(EventResponse, items, next_cursor)
+
+            def events_fast() -> bytes:
+                rows, next_cursor = crud_event.get_rows(db, EVENT_FIELDS, limit=args.limit)
+                return dump_page(EVENT_FIELDS, rows, next_cursor)
+
+            def tasks_orm(column, value) -> Callable[[], bytes]:
+                def run() -> bytes:
+                    items, next_cursor = crud_task.get_page(
+                        db, select(Task).where(column == value), limit=args.limit
+                    )
+                    db.expunge_all()
+                    return orm_page_json(TaskResponse, items, next_cursor)
+                return run
+
+            def tasks_fast(column, value) -> Callable[[], bytes]:
+                def run() -> bytes:
+                    rows, next_cursor = crud_task.get_rows(db, TASK_FIELDS, column == value, limit=args.limit)
+                    return dump_page(TASK_FIELDS, rows, next_cursor)
+                return run
+
+            cases = [
+                ("GET /api/events/", events_orm, events_fast),
+                ("GET /api/tasks/event/{id}", tasks_orm(Task.event_id, event_id), tasks_fast(Task.event_id, event_id)),
+                ("GET /api/tasks/my-tasks", tasks_orm(Task.assigned_to_id, user_id), tasks_fast(Task.assigned_to_id, user_id)),
+            ]
+
+            print(f"{args.limit} rows per page, {args.repeat} runs, {engine.url.get_backend_name()}")
+            print(f"{'endpoint':<28}{'orm+pydantic ms':>17}{'rows+orjson ms':>16}{'speedup':>9}")
+            for name, slow, fast in cases:
+                assert json.loads(slow()) == json.loads(fast()), f"{name}: outputs differ"
+                slow_ms = measure(slow, args.repeat)
+                fast_ms = measure(fast, args.repeat)
+                print(f"{name:<28}{slow_ms:>17.3f}{fast_ms:>16.3f}{slow_ms / fast_ms:>8.1f}x")
+        finally:
+            db.close()
+            transaction.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Micro-benchmark of access token verification per request.
+
+Compares decode_token with an empty token cache (full python-jose
+jwt.decode: base64, JSON and HMAC on every request, as before the cache)
+against repeat requests served from the cache (a sha256 digest and a
+dictionary lookup). Requests cycle over `--tokens` distinct tokens, as
+many clients each presenting their own. No database is used.
+
+Usage (from backend/):
+    python -m scripts.bench_token_cache [--tokens 1000] [--requests 100000]
+"""
+import argparse
+import time
+from typing import Callable, List
+
+from app.core.security import create_access_token, decode_token, token_cache
+
+
+def measure(fn: Callable[[], object], requests: int) -> float:
+    """Mean microseconds per request"""
+    fn()  # warm up
+    started = time.perf_counter()
+    for _ in range(requests):
+        fn()
+    return (time.perf_counter() - started) * 1_000_000 / requests
+
+
+def cycle(tokens: List[str], before: Callable[[], None] = lambda: None) -> Callable[[], int]:
+    """A request verifying the next token in turn"""
+    position = 0
+
+    def request() -> int:
+        nonlocal position
+        position = (position + 1) % len(tokens)
+        before()
+        return decode_token(tokens[position])
+    return request
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=100_000)
+    args = parser.parse_args()
+
+    if args.tokens > token_cache.maxsize:
+        print(f"note: more tokens than TOKEN_CACHE_MAXSIZE ({token_cache.maxsize}), cached requests will miss")
+    tokens = [create_access_token(user_id) for user_id in range(1, args.tokens + 1)]
+    assert [decode_token(token) for token in tokens] == list(range(1, args.tokens + 1))
+
+    token_cache.clear()
+    uncached_us = measure(cycle(tokens, before=token_cache.clear), args.requests)
+    token_cache.clear()
+    cached_us = measure(cycle(tokens), args.requests)
+
+    print(f"{args.tokens} tokens, {args.requests} requests")
+    print(f"{'path':<32}{'us/request':>12}")
+    print(f"{'jwt.decode (cache empty)':<32}{uncached_us:>12.2f}")
+    print(f"{'cached verification':<32}{cached_us:>12.2f}")
+    print(f"speedup {uncached_us / cached_us:.1f}x; cache {token_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Bulk import of events or tasks from a CSV or NDJSON file.
+
+Same loader as POST /api/events/import and POST /api/tasks/import: rows are
+validated with EventCreate/TaskCreate, COPYed into a staging table and
+merged in one transaction. Prints the import report as JSON.
+
+Usage (from backend/):
+    python -m scripts.import_data events events.csv --user organizer@example.com
+    python -m scripts.import_data tasks tasks.ndjson --user organizer@example.com
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from app.crud.user import crud_user
+from app.db.session import SessionLocal
+from app.services.import_service import UnreadableInputError, import_service
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("kind", choices=["events", "tasks"])
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--user", required=True, help="email of the organizer the rows are imported as")
+    parser.add_argument("--format", choices=["ndjson", "csv"], help="defaults to the file extension")
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.path.suffix.lower() == ".csv" else "ndjson")
+    db = SessionLocal()
+    try:
+        user = crud_user.get_by_email(db, email=args.user)
+        if not user:
+            print(f"User not found: {args.user}", file=sys.stderr)
+            return 1
+        with args.path.open("rb") as source:
+            if args.kind == "events":
+                report = import_service.import_events(db, source, fmt, user.id)
+            else:
+                report = import_service.import_tasks(db, source, fmt, user.id)
+    except UnreadableInputError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+
+    print(report.model_dump_json(indent=2))
+    return 0 if not report.failed else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
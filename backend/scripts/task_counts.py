@@ -0,0 +1,43 @@
+"""
+Consistency check and rebuild of the per-event task counters.
+
+The counters (event_task_counts) are adjusted by every task write in the
+same transaction, so they should never drift; this compares them with a
+GROUP BY over tasks and, with --rebuild, recomputes them all. Exits 1 if
+drift was found (and not rebuilt).
+
+Usage (from backend/):
+    python -m scripts.task_counts            # check only
+    python -m scripts.task_counts --rebuild  # check, then recompute
+"""
+import argparse
+import sys
+
+from app.crud.task_count import crud_task_count
+from app.db.session import SessionLocal
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rebuild", action="store_true", help="recompute every counter from the tasks table")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        drift = crud_task_count.find_drift(db)
+        for event_id, task_status, stored, actual in drift:
+            print(f"event {event_id} {task_status.value}: stored {stored}, actual {actual}")
+        print(f"{len(drift)} counter(s) out of date")
+        if args.rebuild:
+            db.rollback()
+            rows = crud_task_count.rebuild(db)
+            print(f"Rebuilt {rows} counter(s)")
+            return 0
+    finally:
+        db.close()
+
+    return 1 if drift else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -69,11 +69,66 @@ const api = {
         return response.json();
     },
 
+    // Dashboard: user, their events with task counts, their tasks
+    async getDashboard() {
+        const token = storage.getToken();
+        const response = await fetch(`${API_URL}/dashboard`, {
+            headers: { 'Authorization': `Bearer ${token}` }
+        });
+        if (!response.ok) {
+            handleUnauthorized(response);
+            throw new Error('Failed to load dashboard');
+        }
+        return response.json();
+    },
+
+    // Change notifications (server-sent events). fetch() rather than
+    // EventSource so the token goes in the Authorization header.
+    // Calls onChange(change) per message and reconnects after errors;
+    // onReconnect() runs after each reconnect, when messages may have been missed.
+    streamChanges(onChange, onReconnect) {
+        const connect = async () => {
+            const token = storage.getToken();
+            const response = await fetch(`${API_URL}/stream`, {
+                headers: { 'Authorization': `Bearer ${token}` }
+            });
+            if (!response.ok) {
+                handleUnauthorized(response);
+                throw new Error('Failed to open change stream');
+            }
+            const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+            let buffer = '';
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) return;
+                buffer += value;
+                const messages = buffer.split('\n\n');
+                buffer = messages.pop();
+                for (const message of messages) {
+                    for (const line of message.split('\n')) {
+                        if (line.startsWith('data: ')) onChange(JSON.parse(line.slice(6)));
+                    }
+                }
+            }
+        };
+        const run = async (reconnecting) => {
+            try {
+                if (reconnecting) onReconnect();
+                await connect();
+            } catch (error) {
+                console.error('Change stream error:', error);
+            }
+            setTimeout(() => run(true), 3000);
+        };
+        run(false);
+    },
+
     // Events
     async getEvents() {
         const response = await fetch(`${API_URL}/events/`);
         if (!response.ok) throw new Error('Failed to fetch events');
-        return response.json();
+        const page = await response.json();
+        return page.items;
     },
 
     async createEvent(eventData) {
@@ -121,13 +176,15 @@ const api = {
             handleUnauthorized(response);
             throw new Error('Failed to fetch tasks');
         }
-        return response.json();
+        const page = await response.json();
+        return page.items;
     },
 
     async getEventTasks(eventId) {
         const response = await fetch(`${API_URL}/tasks/event/${eventId}`);
         if (!response.ok) throw new Error('Failed to fetch event tasks');
-        return response.json();
+        const page = await response.json();
+        return page.items;
     },
 
     async createTask(taskData) {
@@ -168,6 +225,24 @@ const api = {
             throw new Error(error.detail || 'Failed to update task');
         }
         return response.json();
+    },
+
+    async updateTasks(taskIds, changes) {
+        const token = storage.getToken();
+        const response = await fetch(`${API_URL}/tasks/bulk`, {
+            method: 'PATCH',
+            headers: {
+                'Content-Type': 'application/json',
+                'Authorization': `Bearer ${token}`
+            },
+            body: JSON.stringify({ ids: taskIds, changes })
+        });
+        if (!response.ok) {
+            handleUnauthorized(response);
+            const error = await response.json();
+            throw new Error(error.detail || 'Failed to update tasks');
+        }
+        return response.json();
     }
 };
 
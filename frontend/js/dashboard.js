@@ -3,25 +3,51 @@ if (!storage.getToken()) {
     window.location.href = 'index.html';
 }
 
-// Validate token and load user info
-async function initializeDashboard() {
+// Ids of what is on screen, to tell which change messages concern it
+let shownEventIds = new Set();
+let shownTaskIds = new Set();
+
+// Load user, events and tasks in one request (also validates the token)
+async function loadDashboard() {
     try {
-        // Check if token is still valid
-        const user = await api.getMe();
-        storage.setUser(user);
-        document.getElementById('userName').textContent = user.full_name;
+        const dashboard = await api.getDashboard();
+        storage.setUser(dashboard.user);
+        document.getElementById('userName').textContent = dashboard.user.full_name;
+        shownEventIds = new Set(dashboard.events.map(event => event.id));
+        shownTaskIds = new Set(dashboard.tasks.map(task => task.id));
         
-        // Load data
-        loadEvents();
-        loadTasks();
+        renderEvents(dashboard.events);
+        renderTasks(dashboard.tasks);
     } catch (error) {
-        console.error('Failed to initialize dashboard:', error);
-        // If getMe fails, user will be redirected by handleUnauthorized
+        console.error('Failed to load dashboard:', error);
+        // On 401 the user is redirected by handleUnauthorized
+        showMessage('Failed to load dashboard', 'error');
     }
 }
 
 // Initialize dashboard on load
-initializeDashboard();
+loadDashboard();
+
+// Whether a change message can affect the dashboard: a shown event or task,
+// or a new event/task of the current user. Bulk writes, imports and task
+// deletes don't name their event, so they always count.
+function concernsDashboard(change) {
+    if (change.event_id === null) return true;
+    if (shownEventIds.has(change.event_id)) return true;
+    if (change.entity === 'task' && shownTaskIds.has(change.id)) return true;
+    const currentUser = storage.getUser();
+    return Boolean(currentUser) && change.user_id === currentUser.id;
+}
+
+// Reload when shown events or tasks change, coalescing bursts into one request
+let reloadTimer = null;
+function scheduleReload() {
+    clearTimeout(reloadTimer);
+    reloadTimer = setTimeout(loadDashboard, 300);
+}
+api.streamChanges(change => {
+    if (concernsDashboard(change)) scheduleReload();
+}, scheduleReload);
 
 // Logout
 function logout() {
@@ -29,72 +55,68 @@ function logout() {
     window.location.href = 'index.html';
 }
 
-// Load events
-async function loadEvents() {
-    try {
-        const events = await api.getEvents();
-        const container = document.getElementById('eventsList');
-        const currentUser = storage.getUser();
-        
-        if (events.length === 0) {
-            container.innerHTML = '<div class="empty-state">No events yet. Create your first event!</div>';
-            return;
-        }
-        
-        container.innerHTML = events.map(event => `
-            <div class="event-card">
-                <h3>${event.title}</h3>
-                <p>${event.description || 'No description'}</p>
-                <p><strong>📍</strong> ${event.location || 'No location'}</p>
-                <p><strong>📅</strong> ${new Date(event.start_time).toLocaleDateString()}</p>
-                <span class="event-status">${event.status}</span>
-                <div class="event-actions">
-                    <button class="btn btn-secondary" onclick="showCreateTaskModal(${event.id})">+ Add Task</button>
-                    <button class="btn btn-secondary" onclick="viewEventTasks(${event.id})">View Tasks</button>
-                    ${currentUser && event.organizer_id === currentUser.id ? `
-                        <button class="btn btn-secondary" onclick="deleteEvent(${event.id})">Delete</button>
-                    ` : ''}
-                </div>
-            </div>
-        `).join('');
-    } catch (error) {
-        console.error('Error loading events:', error);
-        showMessage('Failed to load events', 'error');
-    }
+// Task progress of an event, e.g. "2/5 tasks done"
+function taskProgress(counts) {
+    const total = Object.values(counts).reduce((sum, count) => sum + count, 0);
+    return total === 0 ? 'No tasks' : `${counts.completed}/${total} tasks done`;
 }
 
-// Load tasks
-async function loadTasks() {
-    try {
-        const tasks = await api.getMyTasks();
-        const container = document.getElementById('tasksList');
-        
-        if (!tasks || tasks.length === 0) {
-            container.innerHTML = '<div class="empty-state">No tasks assigned to you yet.</div>';
-            return;
-        }
-        
-        container.innerHTML = tasks.map(task => `
-            <div class="task-item ${task.status === 'completed' ? 'task-completed' : ''}">
-                <h4>${task.title}</h4>
-                <p>${task.description || 'No description'}</p>
-                <div class="task-meta">
-                    <span class="task-badge priority-${task.priority}">${task.priority.toUpperCase()}</span>
-                    <span class="task-badge status-${task.status}">${task.status.replace('_', ' ').toUpperCase()}</span>
-                    ${task.due_date ? `<span>Due: ${new Date(task.due_date).toLocaleDateString()}</span>` : ''}
-                </div>
-                <div class="event-actions" style="margin-top: 10px;">
-                    ${task.status !== 'completed' ? `
-                        <button class="btn btn-primary" onclick="completeTask(${task.id})">Mark Complete</button>
-                    ` : `
-                        <span style="color: #38a169; font-weight: 600;">✓ Completed</span>
-                    `}
-                </div>
+// Render events (with task counts by status)
+function renderEvents(events) {
+    const container = document.getElementById('eventsList');
+    const currentUser = storage.getUser();
+    
+    if (events.length === 0) {
+        container.innerHTML = '<div class="empty-state">No events yet. Create your first event!</div>';
+        return;
+    }
+    
+    container.innerHTML = events.map(event => `
+        <div class="event-card">
+            <h3>${event.title}</h3>
+            <p>${event.description || 'No description'}</p>
+            <p><strong>📍</strong> ${event.location || 'No location'}</p>
+            <p><strong>📅</strong> ${new Date(event.start_time).toLocaleDateString()}</p>
+            <p><strong>✅</strong> ${taskProgress(event.task_counts)}</p>
+            <span class="event-status">${event.status}</span>
+            <div class="event-actions">
+                <button class="btn btn-secondary" onclick="showCreateTaskModal(${event.id})">+ Add Task</button>
+                <button class="btn btn-secondary" onclick="viewEventTasks(${event.id})">View Tasks</button>
+                ${currentUser && event.organizer_id === currentUser.id ? `
+                    <button class="btn btn-secondary" onclick="deleteEvent(${event.id})">Delete</button>
+                ` : ''}
             </div>
-        `).join('');
-    } catch (error) {
-        showMessage('Failed to load tasks', 'error');
+        </div>
+    `).join('');
+}
+
+// Render tasks assigned to the current user
+function renderTasks(tasks) {
+    const container = document.getElementById('tasksList');
+    
+    if (!tasks || tasks.length === 0) {
+        container.innerHTML = '<div class="empty-state">No tasks assigned to you yet.</div>';
+        return;
     }
+    
+    container.innerHTML = tasks.map(task => `
+        <div class="task-item ${task.status === 'completed' ? 'task-completed' : ''}">
+            <h4>${task.title}</h4>
+            <p>${task.description || 'No description'}</p>
+            <div class="task-meta">
+                <span class="task-badge priority-${task.priority}">${task.priority.toUpperCase()}</span>
+                <span class="task-badge status-${task.status}">${task.status.replace('_', ' ').toUpperCase()}</span>
+                ${task.due_date ? `<span>Due: ${new Date(task.due_date).toLocaleDateString()}</span>` : ''}
+            </div>
+            <div class="event-actions" style="margin-top: 10px;">
+                ${task.status !== 'completed' ? `
+                    <button class="btn btn-primary" onclick="completeTask(${task.id})">Mark Complete</button>
+                ` : `
+                    <span style="color: #38a169; font-weight: 600;">✓ Completed</span>
+                `}
+            </div>
+        </div>
+    `).join('');
 }
 
 // Create event modal
@@ -128,7 +150,7 @@ document.getElementById('createEventForm').addEventListener('submit', async (e)
         await api.createEvent(eventData);
         showMessage('Event created successfully!', 'success');
         closeEventModal();
-        loadEvents();
+        loadDashboard();
     } catch (error) {
         if (error.type === 'validation') {
             showValidationErrors('createEventForm', error.detail);
@@ -186,8 +208,7 @@ async function deleteEvent(eventId) {
     try {
         await api.deleteEvent(eventId);
         showMessage('Event deleted successfully!', 'success');
-        loadEvents();
-        loadTasks();  // Refresh tasks list after event deletion
+        loadDashboard();  // Refreshes events and tasks together
     } catch (error) {
         showMessage(error.message, 'error');
     }
@@ -232,7 +253,7 @@ document.getElementById('createTaskForm').addEventListener('submit', async (e) =
         await api.createTask(taskData);
         showMessage('Task created successfully!', 'success');
         closeTaskModal();
-        loadTasks();
+        loadDashboard();
     } catch (error) {
         if (error.type === 'validation') {
             showValidationErrors('createTaskForm', error.detail);
@@ -247,7 +268,7 @@ async function completeTask(taskId) {
     try {
         await api.updateTask(taskId, { status: 'completed' });
         showMessage('Task marked as complete!', 'success');
-        loadTasks();
+        loadDashboard();
     } catch (error) {
         showMessage(error.message, 'error');
     }
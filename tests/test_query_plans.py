@@ -0,0 +1,182 @@
+"""
+Query plan regression tests for the foreign key access indexes (PostgreSQL).
+
+Seeds users, events and tasks in a transaction that is rolled back, runs the
+CRUD queries that filter on tasks.event_id, tasks.assigned_to_id and
+events.organizer_id, and EXPLAINs every statement they send. Sequential
+scans are disabled for the transaction, so the planner only falls back to
+one when no index can serve the query; a full index scan (an index used
+only for its order, with no Index Cond) fails the test as well.
+
+Needs a database migrated to head:
+    DATABASE_URL=postgresql://... uv run pytest tests/test_query_plans.py
+"""
+import os
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+import pytest
+
+if not os.environ.get("DATABASE_URL", "").startswith("postgresql"):
+    pytest.skip("query plan tests need DATABASE_URL pointing at PostgreSQL", allow_module_level=True)
+
+from sqlalchemy import Connection, delete, event, insert, text
+from sqlalchemy.orm import Session
+
+from app.crud.event import crud_event
+from app.crud.task import crud_task
+from app.db.session import engine
+from app.models.task import Task, TaskStatus
+from app.models.user import User
+from app.services.event_service import EVENT_FIELDS
+from app.services.task_service import TASK_FIELDS
+
+USERS = 100
+EVENTS = 5_000
+TASKS = 50_000
+
+# Tables whose scans are checked
+CHECKED_TABLES = frozenset({"events", "tasks"})
+
+
+def seed(db: Session) -> SimpleNamespace:
+    """USERS users, EVENTS events spread over them, TASKS tasks spread over both"""
+    prefix = f"plans-{time.time_ns()}"
+    user_ids = db.scalars(
+        insert(User).returning(User.id, sort_by_parameter_order=True),
+        [
+            {"email": f"{prefix}-{i}@example.com", "hashed_password": "x", "full_name": f"User {i}"}
+            for i in range(USERS)
+        ],
+    ).all()
+    db.execute(
+        text("""
+            INSERT INTO events (title, start_time, end_time, status, organizer_id)
+            SELECT
+                'Event ' || i,
+                timestamptz '2030-01-01' + i * interval '1 hour',
+                timestamptz '2030-01-01' + (i + 2) * interval '1 hour',
+                'PLANNING',
+                (:user_ids)[1 + i % cardinality(:user_ids)]
+            FROM generate_series(1, :events) AS i
+        """),
+        {"user_ids": list(user_ids), "events": EVENTS},
+    )
+    event_ids = db.scalars(
+        text("SELECT id FROM events WHERE organizer_id = ANY(:user_ids) ORDER BY id"),
+        {"user_ids": list(user_ids)},
+    ).all()
+    db.execute(
+        text("""
+            INSERT INTO tasks (title, status, priority, due_date, event_id, assigned_to_id)
+            SELECT
+                'Task ' || i,
+                (ARRAY['TODO', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED'])[1 + i % 4]::taskstatus,
+                (ARRAY['LOW', 'MEDIUM', 'HIGH', 'URGENT'])[1 + i % 4]::taskpriority,
+                timestamptz '2030-01-01' + i * interval '10 minutes',
+                (:event_ids)[1 + i % cardinality(:event_ids)],
+                CASE WHEN i % 5 = 0 THEN NULL ELSE (:user_ids)[1 + i % cardinality(:user_ids)] END
+            FROM generate_series(1, :tasks) AS i
+        """),
+        {"event_ids": list(event_ids), "user_ids": list(user_ids), "tasks": TASKS},
+    )
+    db.execute(text("ANALYZE users, events, tasks"))
+    task_id = db.scalar(text("SELECT min(id) FROM tasks WHERE event_id = :event_id"), {"event_id": event_ids[0]})
+    return SimpleNamespace(user_id=user_ids[0], event_id=event_ids[0], task_id=task_id)
+
+
+@pytest.fixture(scope="module")
+def connection() -> Iterator[Connection]:
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            yield connection
+        finally:
+            transaction.rollback()
+
+
+@pytest.fixture(scope="module")
+def seeded(connection: Connection) -> SimpleNamespace:
+    db = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        ids = seed(db)
+        db.flush()
+    finally:
+        db.close()
+    connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    return ids
+
+
+@contextmanager
+def captured(connection: Connection) -> Iterator[List[Tuple[str, Any]]]:
+    """Statements (and parameters) sent on the connection inside the block"""
+    statements: List[Tuple[str, Any]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(connection, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(connection, "before_cursor_execute", record)
+
+
+def plan(connection: Connection, statement: str, parameters: Any) -> Dict[str, Any]:
+    """Root node of the JSON plan of a statement"""
+    return connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()[0]["Plan"]
+
+
+def full_scans(node: Dict[str, Any]) -> List[str]:
+    """Scans of CHECKED_TABLES in a plan that read the whole table or index"""
+    found = []
+    if node.get("Relation Name") in CHECKED_TABLES:
+        if node["Node Type"] == "Seq Scan":
+            found.append(f"Seq Scan on {node['Relation Name']}")
+        elif node["Node Type"] in ("Index Scan", "Index Only Scan") and "Index Cond" not in node:
+            found.append(f"full {node['Node Type']} using {node['Index Name']}")
+    for child in node.get("Plans", ()):
+        found.extend(full_scans(child))
+    return found
+
+
+# CRUD calls whose statements must use the foreign key access indexes
+QUERIES: Dict[str, Callable[[Session, SimpleNamespace], Any]] = {
+    "tasks of an event": lambda db, ids: crud_task.get_by_event(db, ids.event_id, names=TASK_FIELDS),
+    "tasks of an event by status": lambda db, ids: crud_task.get_rows(
+        db, TASK_FIELDS, *crud_task.filters(event_id=ids.event_id, status=TaskStatus.TODO)
+    ),
+    "tasks assigned to a user": lambda db, ids: crud_task.get_by_user(db, ids.user_id, names=TASK_FIELDS),
+    "open workload of users": lambda db, ids: crud_task.get_open_workloads(db, user_ids=[ids.user_id]),
+    "events of an organizer": lambda db, ids: crud_event.get_rows(
+        db, EVENT_FIELDS, *crud_event.filters(organizer_id=ids.user_id)
+    ),
+    "event organizer check": lambda db, ids: crud_event.get_scoped(
+        db, id=ids.event_id, scope=crud_event.organized_by(ids.user_id)
+    ),
+    "task organizer or assignee check": lambda db, ids: crud_task.get_scoped(
+        db, id=ids.task_id, scope=crud_task.modifiable_by(ids.user_id)
+    ),
+}
+
+
+@pytest.mark.parametrize("name", list(QUERIES))
+def test_crud_query_uses_index(name: str, connection: Connection, seeded: SimpleNamespace):
+    db = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        with captured(connection) as statements:
+            QUERIES[name](db, seeded)
+    finally:
+        db.close()
+
+    assert statements
+    for statement, parameters in statements:
+        assert full_scans(plan(connection, statement, parameters)) == [], statement
+
+
+def test_event_delete_cascade_uses_index(connection: Connection, seeded: SimpleNamespace):
+    # What ON DELETE CASCADE runs for each deleted event (EXPLAIN only, nothing is deleted)
+    compiled = delete(Task).where(Task.event_id == seeded.event_id).compile(dialect=engine.dialect)
+    assert full_scans(plan(connection, str(compiled), compiled.params)) == []
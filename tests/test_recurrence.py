@@ -0,0 +1,78 @@
+"""
+Recurrence expansion tests.
+
+occurrences() and is_occurrence() restart a series near the window instead
+of walking it from its first occurrence; these check the result matches a
+walk from the start, and that the walk to the window doesn't grow with the
+age of the series.
+"""
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "test")
+
+from app.core.recurrence import aligned_start, is_occurrence, occurrences, parse_rule, recurrence_since
+
+RULES = [
+    "FREQ=DAILY",
+    "FREQ=DAILY;INTERVAL=3;BYMONTH=2,3",
+    "FREQ=WEEKLY",
+    "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,WE",
+    "FREQ=WEEKLY;INTERVAL=3;WKST=SU;BYDAY=SU,SA",
+    "FREQ=MONTHLY",
+    "FREQ=MONTHLY;INTERVAL=5",
+    "FREQ=MONTHLY;BYDAY=2TU",
+    "FREQ=MONTHLY;BYDAY=MO,TU,WE,TH,FR;BYSETPOS=-1",
+    "FREQ=MONTHLY;INTERVAL=2;BYMONTHDAY=31",
+    "FREQ=YEARLY",
+    "FREQ=YEARLY;INTERVAL=3;BYMONTH=3",
+    "FREQ=YEARLY;BYWEEKNO=20;BYDAY=MO",
+    "FREQ=YEARLY;BYDAY=-1FR;BYMONTH=11",
+    "FREQ=DAILY;UNTIL=20401231T000000Z",
+    "FREQ=WEEKLY;COUNT=50",
+]
+# Month ends and a leap day, where moving the start by months clamps the day
+STARTS = [
+    datetime(2016, 2, 29, 9, 30, tzinfo=timezone.utc),
+    datetime(2019, 1, 31, 23, 0, tzinfo=timezone.utc),
+    datetime(2020, 12, 31, tzinfo=timezone.utc),
+]
+AGES = [timedelta(days=days) for days in (0, 45, 400, 3653, 7305)]
+
+
+@pytest.mark.parametrize("start", STARTS)
+@pytest.mark.parametrize("rule", RULES)
+def test_occurrences_match_expansion_from_start(rule, start):
+    duration = timedelta(hours=30)
+    walk = parse_rule(rule, start).between(start, start + timedelta(days=7400), inc=True)
+    for age in AGES:
+        window_from = start + age
+        window_to = window_from + timedelta(days=90)
+        expected = [o for o in walk if o + duration > window_from and o < window_to]
+        assert list(occurrences(rule, start, start + duration, window_from, window_to)) == expected
+        for occurrence in expected[:3]:
+            assert is_occurrence(rule, start, occurrence)
+            assert not is_occurrence(rule, start, occurrence + timedelta(hours=1))
+
+
+@pytest.mark.parametrize("rule", [rule for rule in RULES if "COUNT" not in rule and "UNTIL" not in rule])
+def test_walk_to_window_is_independent_of_series_age(rule):
+    start = STARTS[1]
+    for years in (1, 10, 100):
+        since = start.replace(year=start.year + years) + timedelta(days=100)
+        moved = aligned_start(rule, start, since)
+        # Within one FREQ x INTERVAL period (at most 3 years here) of the window
+        assert since - timedelta(days=3 * 366) < moved <= since
+        walked = recurrence_since(rule, start, since).between(moved, since, inc=True)
+        assert len(walked) <= 3 * 366
+
+
+def test_count_series_are_walked_from_start():
+    start = STARTS[0]
+    rule = "FREQ=DAILY;COUNT=5"
+    assert aligned_start(rule, start, start + timedelta(days=400)) == start
+    window = start + timedelta(days=3), start + timedelta(days=30)
+    assert list(occurrences(rule, start, start, *window)) == [start + timedelta(days=4)]